@@ -2,8 +2,9 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.html import format_html
 from .models import (
-    User, SeekerProfile, SeekerExperience, SeekerEducation, RecruiterProfile
+    User, SeekerProfile, SeekerExperience, SeekerEducation, RecruiterProfile, Skill, SkillAlias
 )
+from .skills import seekers_with_skill
 
 
 class SeekerExperienceInline(admin.TabularInline):
@@ -80,9 +81,16 @@ class SeekerProfileAdmin(admin.ModelAdmin):
         "updated_at"
     )
     
-    search_fields = ("user__email", "full_name", "skills", "headline")
+    search_fields = ("user__email", "full_name", "headline")
     list_filter = ("years_experience", "desired_level", "is_open_to_remote", "updated_at")
     inlines = [SeekerExperienceInline, SeekerEducationInline]
+
+    def get_search_results(self, request, queryset, search_term):
+        # מיומנות - join על המילון המנורמל (accounts/skills.py) במקום LIKE על הטקסט
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term.strip():
+            results |= seekers_with_skill(search_term, queryset)
+        return results, may_have_duplicates
     
     readonly_fields = ("updated_at",)
     
@@ -97,6 +105,19 @@ class SeekerProfileAdmin(admin.ModelAdmin):
     )
 
 
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 0
+    fields = ("alias",)
+
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "key")
+    search_fields = ("key", "aliases__key")
+    inlines = [SkillAliasInline]
+
+
 @admin.register(RecruiterProfile)
 class RecruiterProfileAdmin(admin.ModelAdmin):
     list_display = (
@@ -1,11 +1,17 @@
-from rest_framework import generics, permissions, viewsets
+from django.db.models import Prefetch
+from django.http import Http404
+from rest_framework import exceptions, generics, permissions, viewsets
 from rest_framework.parsers import MultiPartParser, FormParser  # ← לקבצים
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
 
+from config.conditional import conditional_get, make_etag
+
 from .models import (
-    Roles, SeekerProfile, SeekerExperience, SeekerEducation, RecruiterProfile
+    Roles, SeekerProfile, SeekerExperience, SeekerEducation, RecruiterProfile, SeekerSkill
 )
+from .profiles import get_profile
+from .tokens import tokens_for
 from .serializers import (
     SignupSerializer, RoleSelectSerializer,
     SeekerProfileSerializer, SeekerExperienceSerializer, SeekerEducationSerializer,
@@ -14,12 +20,48 @@ from .serializers import (
 
 User = get_user_model()
 
+
+class ProfileConditionalGetMixin:
+    """
+    הפרופיל של המשתמש המחובר (accounts/profiles.py - נטען פעם אחת לבקשה) + GET מותנה:
+    ה-validator הוא updated_at של הפרופיל (ניסיון/השכלה מעדכנים אותו - accounts/signals.py).
+    304 בלי serializer. GET בלי פרופיל - 404 (לא נוצר בקריאה); כתיבה יוצרת פרופיל חסר.
+    """
+    profile_model = None
+
+    def get_object(self):
+        create = self.request.method not in permissions.SAFE_METHODS
+        profile = get_profile(self.request.user, self.profile_model, create=create)
+        if profile is None:
+            raise Http404(f"No {self.profile_model.__name__} for this user.")
+        return profile
+
+    def _conditional(self, request, compute):
+        profile = self.get_object()
+        etag = make_etag(self.profile_model.__name__, profile.pk, profile.updated_at, request.accepted_renderer.format)
+        return conditional_get(request, compute, etag=etag, last_modified=profile.updated_at)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(request, lambda: super(ProfileConditionalGetMixin, self).retrieve(request, *args, **kwargs))
+
 # --- Auth ---
 class SignupAPIView(generics.CreateAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = SignupSerializer
 
 
+class LogoutEverywhereAPIView(generics.GenericAPIView):
+    """
+    POST /api/auth/logout-everywhere/ - מנתק את המשתמש מכל המכשירים: refresh tokens מדור
+    קודם נדחים, ו-access tokens קיימים מבוטלים מיד (accounts/tokens.py).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        request.user.logout_everywhere()
+        return Response(status=204)
+
+
 # --- Role selection ---
 class RoleSelectAPIView(generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]        # ← רק מחובר
@@ -29,24 +71,22 @@ class RoleSelectAPIView(generics.GenericAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.update(request.user, serializer.validated_data)
-        return Response({"role": user.role})
+        # ה-role נחתם ב-token וה-tokens הקודמים בוטלו (accounts/tokens.py) - מחזירים זוג חדש
+        return Response({"role": user.role, **tokens_for(user)})
 
 
 # --- Seeker ---
-class SeekerProfileViewSet(viewsets.ModelViewSet):
+class SeekerProfileViewSet(ProfileConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = SeekerProfileSerializer
+    profile_model = SeekerProfile
     permission_classes = [permissions.IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]            # ← תמיכה ב-upload (resume)
 
     def get_queryset(self):
         return SeekerProfile.objects.filter(user=self.request.user)
 
-    def get_object(self):
-        obj, _ = SeekerProfile.objects.get_or_create(user=self.request.user)
-        return obj
-
     def list(self, request, *args, **kwargs):
-        return Response(self.get_serializer(self.get_object()).data)
+        return self._conditional(request, lambda: Response(self.get_serializer(self.get_object()).data))
 
     def create(self, request, *args, **kwargs):
         # אין יצירה כפולה – משתמש אחד = פרופיל אחד
@@ -72,13 +112,11 @@ class SeekerExperienceViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        profile, _ = SeekerProfile.objects.get_or_create(user=self.request.user)
-        return SeekerExperience.objects.filter(seeker=profile)
+        # דרך ה-JOIN - בלי לטעון את הפרופיל (ובלי ליצור אותו)
+        return SeekerExperience.objects.filter(seeker__user=self.request.user)
 
     def perform_create(self, serializer):
-        profile, _ = SeekerProfile.objects.get_or_create(user=self.request.user
-        )
-        serializer.save(seeker=profile)
+        serializer.save(seeker=get_profile(self.request.user, SeekerProfile, create=True))
 
 
 class SeekerEducationViewSet(viewsets.ModelViewSet):
@@ -86,29 +124,24 @@ class SeekerEducationViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        profile, _ = SeekerProfile.objects.get_or_create(user=self.request.user)
-        return SeekerEducation.objects.filter(seeker=profile)
+        return SeekerEducation.objects.filter(seeker__user=self.request.user)
 
     def perform_create(self, serializer):
-        profile, _ = SeekerProfile.objects.get_or_create(user=self.request.user)
-        serializer.save(seeker=profile)
+        serializer.save(seeker=get_profile(self.request.user, SeekerProfile, create=True))
 
 
 # --- Recruiter ---
-class RecruiterProfileViewSet(viewsets.ModelViewSet):
+class RecruiterProfileViewSet(ProfileConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = RecruiterProfileSerializer
+    profile_model = RecruiterProfile
     permission_classes = [permissions.IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]            # ← תמיכה ב-upload (company_logo)
 
     def get_queryset(self):
         return RecruiterProfile.objects.filter(user=self.request.user)
 
-    def get_object(self):
-        obj, _ = RecruiterProfile.objects.get_or_create(user=self.request.user)
-        return obj
-
     def list(self, request, *args, **kwargs):
-        return Response(self.get_serializer(self.get_object()).data)
+        return self._conditional(request, lambda: Response(self.get_serializer(self.get_object()).data))
 
     def create(self, request, *args, **kwargs):
         return self.partial_update(request, *args, **kwargs)
@@ -132,10 +165,45 @@ class MeAPIView(generics.RetrieveAPIView):
     """
     מחזיר את המשתמש המחובר + הפרופיל שלו
     GET /api/auth/me/
+
+    הגוף נשמר ב-cache לכל משתמש עם מספר גרסה (accounts/cache.py) שחוזר כ-version וב-ETag:
+    לקוח עם If-None-Match של הגרסה הנוכחית מקבל 304 בלי DB. בלי Redis - validator מה-DB כמו קודם.
     """
     permission_classes = [permissions.IsAuthenticated]
-    
+
     def get(self, request):
+        from .cache import me_payload, me_version
+        user = request.user
+        fmt = request.accepted_renderer.format
+        version = me_version(user.pk)
+        if version is None:
+            # validators: שדות המשתמש (כבר טעון) + updated_at של שני הפרופילים - שאילתה קטנה אחת
+            profiles = User.objects.filter(pk=user.pk).values_list(
+                "seeker_profile__updated_at", "recruiter_profile__updated_at"
+            ).first()
+            etag = make_etag("me", user.pk, user.email, user.role, profiles, fmt)
+            return conditional_get(request, lambda: Response({**self._render(user.pk), "version": None}), etag=etag)
+
+        def compute():
+            data = me_payload(user.pk, version, lambda: self._render(user.pk))
+            return Response({**data, "version": version})
+
+        return conditional_get(request, compute, etag=make_etag("me", user.pk, version, fmt))
+
+    @staticmethod
+    def _render(user_id):
+        """משתמש + שני הפרופילים ב-JOIN אחד, ניסיון, השכלה ומיומנויות ב-prefetch (רק למחפש עם פרופיל)"""
         from .serializers import UserSerializer
-        serializer = UserSerializer(request.user)
-        return Response(serializer.data)
+        user = (
+            User.objects.select_related("seeker_profile", "recruiter_profile")
+            .prefetch_related(
+                "seeker_profile__experiences", "seeker_profile__education",
+                Prefetch("seeker_profile__skill_links", queryset=SeekerSkill.objects.select_related("skill")),
+            )
+            .filter(pk=user_id)
+            .first()
+        )
+        if user is None:
+            # token (מה-claims) של משתמש שנמחק בינתיים
+            raise exceptions.AuthenticationFailed("User not found", code="user_not_found")
+        return dict(UserSerializer(user).data)
@@ -0,0 +1,61 @@
+# accounts/authentication.py
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import (
+    ROLE_CLAIM, STAFF_CLAIM, SUPERUSER_CLAIM, UNAVAILABLE, VERSION_CLAIM, current_version, remember_version,
+)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT בלי שאילתה לבקשות קריאה: request.user נבנה מה-claims (accounts/tokens.py) כ-User עם
+    השדות שב-token בלבד; שאר השדות נדחים ונטענים (יחד) רק אם ניגשים אליהם. pk, role, is_staff
+    מספיקים להרשאות ולפילטרים (filter(posted_by=request.user)).
+
+    טעינה רגילה מה-DB (ובדיקת ver ו-is_active מולו) כאשר:
+    - הבקשה כותבת (לא GET/HEAD/OPTIONS);
+    - הגרסה ב-Redis לא ידועה (מפתח חסר / ישן מה-token) או ש-Redis לא זמין;
+    - token בלי claims (הונפק לפני כן / AccessToken.for_user).
+    כך ביטול (השבתה, שינוי תפקיד) לא "נבלע" כשהמפתח פונה או כשהפרסום שלו התעכב.
+    """
+
+    def authenticate(self, request):
+        self.db_checked = request.method not in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        if VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidToken("Token contained no recognizable user identification")
+        version = validated_token[VERSION_CLAIM]
+        current = None if getattr(self, "db_checked", False) else current_version(user_id)
+        if current is UNAVAILABLE or current is None or version > current:
+            return self._user_from_db(validated_token, version, cached=current)
+        if version < current:
+            raise InvalidToken("Token is no longer valid for this user", code="token_revoked")
+        # token עם ver נוכחי לא הונפק למשתמש לא פעיל - השבתה מעלה את הגרסה
+        claims = {
+            "id": user_id, "role": validated_token[ROLE_CLAIM], "is_staff": validated_token[STAFF_CLAIM],
+            "is_superuser": validated_token[SUPERUSER_CLAIM], "is_active": True, "token_version": version,
+        }
+        model = get_user_model()
+        # from_db מצפה לערכים לפי סדר השדות במודל
+        names = [f.attname for f in model._meta.concrete_fields if f.attname in claims]
+        return model.from_db(DEFAULT_DB_ALIAS, names, [claims[name] for name in names])
+
+    def _user_from_db(self, validated_token, version, cached):
+        user = super().get_user(validated_token)  # משתמש לא פעיל - AuthenticationFailed
+        if user.token_version != version:
+            raise InvalidToken("Token is no longer valid for this user", code="token_revoked")
+        if cached is not UNAVAILABLE and cached != user.token_version:
+            # מפתח חסר או ישן (פרסום שהתעכב) - הגרסה מה-DB מחליפה אותו
+            remember_version(user.pk, user.token_version, replace=cached is not None)
+        return user
@@ -0,0 +1,75 @@
+# accounts/cache.py
+"""
+Cache ל-/api/auth/me/ - הייצוג המרונדר (UserSerializer) לכל משתמש.
+
+- גרסה לכל משתמש (me:v:<id>); כל שינוי במשתמש / בפרופילים / בניסיון / בהשכלה מעלה אותה
+  (accounts/signals.py, אחרי commit). הגרסה חוזרת ללקוח (version + ETag), כך שלקוח שכבר
+  מחזיק אותה מקבל 304 בלי שאילתה ובלי serializer.
+- הגוף נשמר תחת me:<id>:<version> - ערך ישן לא יוגש לעולם תחת גרסה חדשה.
+- אם Redis לא זמין - version=None והבקשה עוברת ל-DB, בלי שגיאה.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+_UNAVAILABLE = object()
+
+
+def _version_key(user_id):
+    return f"me:v:{user_id}"
+
+
+def _safe(fn, *args, default=None, **kwargs):
+    try:
+        return fn(*args, **kwargs)
+    except Exception as exc:  # redis.ConnectionError, TimeoutError וכו'
+        logger.warning("me cache unavailable: %s", exc)
+        return default
+
+
+def _incr(key):
+    if not cache.add(key, time.time_ns() // 1000, timeout=None):
+        cache.incr(key)
+
+
+def invalidate_me(user_ids):
+    """מעלה את גרסת ה-/me של המשתמשים, אחרי ה-commit (כמו invalidate_jobs)"""
+    keys = [_version_key(user_id) for user_id in set(user_ids) - {None}]
+
+    def bump():
+        for key in keys:
+            _safe(_incr, key)
+
+    if keys:
+        transaction.on_commit(bump)
+
+
+def me_version(user_id):
+    """
+    הגרסה הנוכחית, או None אם Redis לא זמין. גרסה חסרה מאותחלת לפי הזמן (לא ל-1),
+    כך שאחרי eviction לא חוזרים לגרסה שכבר נמסרה ללקוח.
+    """
+    version = _safe(cache.get, _version_key(user_id), default=_UNAVAILABLE)
+    if version is _UNAVAILABLE:
+        return None
+    if version is None:
+        initial = time.time_ns() // 1000
+        if _safe(cache.add, _version_key(user_id), initial, timeout=None):
+            return initial
+        version = _safe(cache.get, _version_key(user_id))
+    return version
+
+
+def me_payload(user_id, version, compute):
+    """הגוף של /me בגרסה הנתונה - מה-cache, או compute() ושמירה"""
+    key = f"me:{user_id}:{version}"
+    data = _safe(cache.get, key)
+    if data is None:
+        data = compute()
+        _safe(cache.set, key, data, timeout=getattr(settings, "ME_CACHE_TTL", 3600))
+    return data
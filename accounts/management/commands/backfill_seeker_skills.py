@@ -0,0 +1,28 @@
+# accounts/management/commands/backfill_seeker_skills.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import SeekerProfile
+from accounts.skills import sync_seeker_skills
+
+
+class Command(BaseCommand):
+    help = "ממלא את SeekerSkill מ-SeekerProfile.skills לפרופילים קיימים (בטוח להרצה חוזרת)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, batch_size, **options):
+        synced_total = 0
+        last_id = 0
+        while True:
+            profiles = list(
+                SeekerProfile.objects.filter(pk__gt=last_id).order_by("pk").only("pk", "skills")[:batch_size]
+            )
+            if not profiles:
+                break
+            last_id = profiles[-1].pk
+            with transaction.atomic():
+                synced_total += sum(sync_seeker_skills(profile) for profile in profiles)
+
+        self.stdout.write(self.style.SUCCESS(f"synced skills for {synced_total} seeker profile(s)"))
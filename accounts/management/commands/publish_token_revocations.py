@@ -0,0 +1,29 @@
+# accounts/management/commands/publish_token_revocations.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.tokens import publish_pending_revocations
+
+
+class Command(BaseCommand):
+    help = "Worker: מפרסם ל-Redis ביטולי tokens שנשארו ב-PendingTokenRevocation (Redis לא היה זמין בזמן ה-commit)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--loop", action="store_true", help="לרוץ ברציפות (אחרת - עד שאין מה לפרסם)")
+        parser.add_argument("--interval", type=float, default=5.0, help="שניות המתנה בין סבבים (עם --loop)")
+
+    def handle(self, *args, batch_size, loop, interval, **options):
+        total = 0
+        try:
+            while True:
+                published = publish_pending_revocations(batch_size)
+                total += published
+                if published < batch_size:
+                    if not loop:
+                        break
+                    time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"published {total} token revocation(s)"))
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.2 on 2026-10-18 17:03
+
+from django.db import migrations
+
+
+def create_missing_profiles(apps, schema_editor):
+    # פרופילים נוצרים בבחירת התפקיד; משתמשים שבחרו תפקיד לפני כן - נוצרים כאן, לא בקריאה
+    User = apps.get_model('accounts', 'User')
+    for role, model_name in (('SEEKER', 'SeekerProfile'), ('RECRUITER', 'RecruiterProfile')):
+        model = apps.get_model('accounts', model_name)
+        missing = User.objects.filter(role=role).exclude(
+            pk__in=model.objects.values('user_id')
+        ).values_list('pk', flat=True)
+        model.objects.bulk_create((model(user_id=pk) for pk in missing.iterator()), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_alter_user_managers'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_missing_profiles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-18 17:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='session_generation',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.2 on 2026-10-18 17:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_user_session_generation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=80, verbose_name='שם')),
+                ('key', models.CharField(editable=False, max_length=80, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=80, verbose_name='כינוי')),
+                ('key', models.CharField(editable=False, max_length=80, unique=True)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='accounts.skill')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SeekerSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('seeker', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='accounts.seekerprofile')),
+                ('skill', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='seeker_links', to='accounts.skill')),
+            ],
+            options={
+                'ordering': ['position'],
+                'indexes': [models.Index(fields=['skill', 'seeker'], name='accounts_seekerskill_skill_idx')],
+                'constraints': [models.UniqueConstraint(fields=('seeker', 'skill'), name='accounts_seekerskill_unique')],
+            },
+        ),
+    ]
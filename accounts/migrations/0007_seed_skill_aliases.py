@@ -0,0 +1,41 @@
+# Generated by Django 5.1.2 on 2026-10-18 17:14
+
+from django.db import migrations
+
+# מיומנות קנונית -> כינויים נפוצים; שאר המילון נבנה משמירות הפרופילים (accounts/skills.py)
+ALIASES = {
+    'JavaScript': ['js', 'javascript es6', 'es6'],
+    'TypeScript': ['ts'],
+    'Python': ['python3', 'py'],
+    'React': ['react.js', 'reactjs'],
+    'Node.js': ['node', 'nodejs'],
+    'Vue.js': ['vue', 'vuejs'],
+    'PostgreSQL': ['postgres', 'psql'],
+    'Kubernetes': ['k8s'],
+    'Go': ['golang'],
+    'C#': ['csharp', 'c sharp'],
+    'C++': ['cpp'],
+    'Machine Learning': ['ml'],
+}
+
+
+def seed_aliases(apps, schema_editor):
+    Skill = apps.get_model('accounts', 'Skill')
+    SkillAlias = apps.get_model('accounts', 'SkillAlias')
+    for name, aliases in ALIASES.items():
+        skill, _ = Skill.objects.get_or_create(key=name.casefold(), defaults={'name': name})
+        SkillAlias.objects.bulk_create(
+            [SkillAlias(skill=skill, alias=alias, key=alias.casefold()) for alias in aliases],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_skills'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_aliases, migrations.RunPython.noop),
+    ]
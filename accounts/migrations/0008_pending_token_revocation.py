@@ -0,0 +1,22 @@
+# Generated by Django 5.1.2 on 2026-10-18 17:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_seed_skill_aliases'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingTokenRevocation',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
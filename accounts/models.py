@@ -1,9 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser, UserManager as DjangoUserManager
 from django.core.validators import MinValueValidator, RegexValidator, URLValidator
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 
+from config.tracking import FieldTrackerMixin
+
 phone_validator = RegexValidator(
     regex=r"^[0-9+\-() ]{7,20}$",
     message=_("מספר טלפון לא תקין")
@@ -43,9 +45,16 @@ class CustomUserManager(DjangoUserManager):
             raise ValueError("Superuser must have is_superuser=True.")
         return self._create_user(email, password, **extra_fields)
 
-class User(AbstractUser):
+class User(FieldTrackerMixin, AbstractUser):
     email = models.EmailField(_("אימייל"), unique=True)
     role = models.CharField(_("תפקיד"), max_length=16, choices=Roles.choices, default=Roles.NONE)
+    # גרסת ה-claims ב-JWT (accounts/tokens.py): עולה בכל שינוי בשדות שנחתמים ב-token או בסיסמה,
+    # ו-access tokens עם גרסה ישנה נדחים
+    token_version = models.PositiveIntegerField(default=0, editable=False)
+    # "התנתקות מכל המכשירים" מעלה אותו; refresh tokens מדור קודם נדחים
+    session_generation = models.PositiveIntegerField(default=0, editable=False)
+
+    tracked_fields = ("role", "is_active", "is_staff", "is_superuser", "session_generation")
 
     USERNAME_FIELD = "email"   # התחברות עם אימייל
     REQUIRED_FIELDS = []       # לא נבקש username בעת יצירה
@@ -57,13 +66,58 @@ class User(AbstractUser):
     def save(self, *args, **kwargs):
         if not self.username and self.email:
             self.username = self.email[:150]
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        changed = self.changed_fields if update_fields is None else self.changed_fields & set(update_fields)
+        revoke = not self._state.adding and (changed or self._password is not None)
+        if not revoke:
+            return super().save(*args, **kwargs)
+        from .tokens import revoke_tokens
+
+        # העלאת הגרסה ושורת ה-outbox באותה טרנזקציה - אין מצב שהגרסה עלתה והביטול לא יפורסם;
+        # F() - שני save מקבילים לא מאבדים העלאה
+        previous = self.token_version
+        self.token_version = models.F("token_version") + 1
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "token_version"}
+        try:
+            with transaction.atomic(using=kwargs.get("using")):
+                super().save(*args, **kwargs)
+                self.refresh_from_db(fields=["token_version"])
+                revoke_tokens(self.pk)
+        except BaseException:
+            self.token_version = previous
+            raise
+
+    def logout_everywhere(self):
+        """מבטל את כל ה-refresh tokens (דור חדש) ואת כל ה-access tokens (token_version - ב-save)"""
+        self.session_generation += 1
+        self.save(update_fields=["session_generation"])
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # משתמש מ-claims (accounts/authentication.py) טוען רק מה שב-token; גישה לשדה נדחה
+        # טוענת את כל השאר בבת אחת - לא שאילתה לכל שדה
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = deferred
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
 
     def __str__(self):
         return self.email or self.username
 
+class PendingTokenRevocation(models.Model):
+    """
+    outbox לביטול tokens (accounts/tokens.py): נכתב באותה טרנזקציה שמעלה את token_version,
+    ונמחק רק אחרי שהגרסה החדשה נרשמה ב-Redis. פרסום שנכשל (Redis לא זמין / תהליך שקרס)
+    נשאר כאן עד שה-worker מפרסם אותו (python manage.py publish_token_revocations).
+    """
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"pending revocation → {self.user_id}"
+
 # -------- מחפש עבודה --------
-class SeekerProfile(models.Model):
+class SeekerProfile(FieldTrackerMixin, models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="seeker_profile")
     full_name = models.CharField(_("שם מלא"), max_length=120, blank=True)
     phone = models.CharField(_("טלפון"), max_length=30, validators=[phone_validator], blank=True)
@@ -83,6 +137,9 @@ class SeekerProfile(models.Model):
     desired_salary_nis = models.PositiveIntegerField(_("שכר מבוקש (₪)"), null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # skills נכתב כטקסט ומנורמל לטבלת SeekerSkill בכל שמירה שמשנה אותו (accounts/skills.py)
+    tracked_fields = ("skills",)
+
     def __str__(self):
         return f"SeekerProfile<{self.user.email}>"
 
@@ -118,6 +175,54 @@ class SeekerEducation(models.Model):
     def __str__(self):
         return f"{self.degree} - {self.school}"
 
+# -------- מילון מיומנויות --------
+class Skill(models.Model):
+    name = models.CharField(_("שם"), max_length=80)
+    # השם המנורמל (accounts/skills.normalize) - "Python", " python " ו-"PYTHON" הם אותה מיומנות
+    key = models.CharField(max_length=80, unique=True, editable=False)
+
+    class Meta:
+        ordering = ["name"]
+
+    def save(self, *args, **kwargs):
+        from .skills import normalize
+        self.key = normalize(self.name)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
+
+class SkillAlias(models.Model):
+    """כינוי נוסף למיומנות: js -> JavaScript, k8s -> Kubernetes"""
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="aliases")
+    alias = models.CharField(_("כינוי"), max_length=80)
+    key = models.CharField(max_length=80, unique=True, editable=False)
+
+    def save(self, *args, **kwargs):
+        from .skills import normalize
+        self.key = normalize(self.alias)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.alias} -> {self.skill}"
+
+class SeekerSkill(models.Model):
+    # האינדקסים המורכבים למטה מכסים את שני ה-FK - בלי אינדקס נפרד לכל אחד
+    seeker = models.ForeignKey(SeekerProfile, on_delete=models.CASCADE, related_name="skill_links", db_index=False)
+    skill = models.ForeignKey(Skill, on_delete=models.PROTECT, related_name="seeker_links", db_index=False)
+    position = models.PositiveSmallIntegerField(default=0)  # הסדר שבו המחפש כתב אותן
+
+    class Meta:
+        ordering = ["position"]
+        constraints = [
+            models.UniqueConstraint(fields=["seeker", "skill"], name="accounts_seekerskill_unique"),
+        ]
+        # "מחפשים עם Python" - join לפי skill_id
+        indexes = [models.Index(fields=["skill", "seeker"], name="accounts_seekerskill_skill_idx")]
+
+    def __str__(self):
+        return f"{self.seeker_id}: {self.skill_id}"
+
 # -------- מגייס/ת --------
 class RecruiterProfile(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="recruiter_profile")
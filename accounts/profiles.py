@@ -0,0 +1,25 @@
+# accounts/profiles.py
+"""
+הפרופיל של המשתמש המחובר - פעם אחת לבקשה.
+
+request.user נוצר מחדש בכל בקשה, וה-accessor ההפוך (user.seeker_profile / user.recruiter_profile)
+שומר עליו את התוצאה - גם "אין פרופיל" - כך שכל קריאה נוספת באותה בקשה לא פונה ל-DB.
+פרופילים נוצרים בבחירת התפקיד (RoleSelectSerializer); מסלולי קריאה לא כותבים לעולם -
+רק מסלול כתיבה יוצר פרופיל חסר (משתמשים ישנים).
+"""
+
+
+def _accessor(model):
+    return model._meta.get_field("user").remote_field.get_accessor_name()
+
+
+def get_profile(user, model, create=False):
+    """הפרופיל מסוג model של user, או None; create=True - יוצר אם חסר (רק במסלולי כתיבה)"""
+    try:
+        return getattr(user, _accessor(model))
+    except model.DoesNotExist:
+        if not create:
+            return None
+    profile, _ = model.objects.get_or_create(user=user)
+    setattr(user, _accessor(model), profile)
+    return profile
@@ -4,6 +4,7 @@ from django.contrib.auth.password_validation import validate_password
 from .models import (
     Roles, SeekerProfile, SeekerExperience, SeekerEducation, RecruiterProfile
 )
+from .skills import split
 
 User = get_user_model()
 
@@ -61,7 +62,29 @@ class SeekerEducationSerializer(serializers.ModelSerializer):
         read_only_fields = ["seeker"]
 
 
+class SkillListField(serializers.ListField):
+    """
+    מיומנויות כרשימה. קריאה - השמות הקנוניים מטבלת SeekerSkill (לפי הסדר שנכתבו);
+    כתיבה - רשימה, או מחרוזת מופרדת בפסיקים (לקוחות ישנים), שנשמרת ל-SeekerProfile.skills
+    ומנורמלת ב-signal.
+    """
+    child = serializers.CharField(max_length=80, allow_blank=True)
+
+    def get_attribute(self, instance):
+        links = instance.skill_links.all()
+        if "skill_links" not in getattr(instance, "_prefetched_objects_cache", {}):
+            links = links.select_related("skill")
+        return [link.skill.name for link in links]
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [data]
+        names = [name for item in super().to_internal_value(data) for name in split(item)]
+        return ", ".join(names)
+
+
 class SeekerProfileSerializer(serializers.ModelSerializer):
+    skills = SkillListField(required=False, allow_empty=True)
     experiences = SeekerExperienceSerializer(many=True, read_only=True)
     education = SeekerEducationSerializer(many=True, read_only=True)
 
@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from .cache import invalidate_me
+from .skills import sync_seeker_skills
+from .tokens import revoke_deleted_user
+from .models import SeekerProfile, SeekerExperience, SeekerEducation, RecruiterProfile, Skill, SkillAlias
+
+
+# ניסיון/השכלה הם חלק מהייצוג של הפרופיל - מעדכנים את updated_at שלו
+# (ה-validator של GET מותנה ב-/me ובפרופיל) ואת הגרסה של /me
+@receiver(post_save, sender=SeekerExperience)
+@receiver(post_delete, sender=SeekerExperience)
+@receiver(post_save, sender=SeekerEducation)
+@receiver(post_delete, sender=SeekerEducation)
+def touch_seeker_profile(sender, instance, **kwargs):
+    SeekerProfile.objects.filter(pk=instance.seeker_id).update(updated_at=timezone.now())
+    if sender.seeker.is_cached(instance):
+        user_id = instance.seeker.user_id
+    else:
+        user_id = SeekerProfile.objects.filter(pk=instance.seeker_id).values_list("user_id", flat=True).first()
+    invalidate_me([user_id])
+
+
+# /me (accounts/cache.py) - כל שינוי במשתמש או בפרופילים שלו
+@receiver(post_save, sender=SeekerProfile)
+@receiver(post_delete, sender=SeekerProfile)
+@receiver(post_save, sender=RecruiterProfile)
+@receiver(post_delete, sender=RecruiterProfile)
+def invalidate_me_on_profile_change(sender, instance, **kwargs):
+    invalidate_me([instance.user_id])
+
+
+# מילון המיומנויות (accounts/skills.py) - באותה טרנזקציה כמו השמירה
+@receiver(post_save, sender=SeekerProfile)
+def sync_skills_on_profile_save(sender, instance, created, raw=False, **kwargs):
+    if raw or not (created and instance.skills or "skills" in instance.changed_fields):
+        return
+    sync_seeker_skills(instance)
+
+
+# /me והפרופיל מציגים את Skill.name - שינוי שם (או כינוי שהועבר) במילון מעדכן את
+# updated_at ואת גרסת ה-/me של המחפשים שמקושרים למיומנות
+@receiver(post_save, sender=Skill)
+@receiver(post_save, sender=SkillAlias)
+def touch_profiles_on_skill_change(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    skill_id = instance.pk if sender is Skill else instance.skill_id
+    user_ids = list(SeekerProfile.objects.filter(skill_links__skill_id=skill_id).values_list("user_id", flat=True))
+    if user_ids:
+        SeekerProfile.objects.filter(user_id__in=user_ids).update(updated_at=timezone.now())
+        invalidate_me(user_ids)
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_me_on_user_change(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return  # התחברות - last_login לא חלק מהייצוג
+    invalidate_me([instance.pk])
+
+
+# access tokens של משתמש שנמחק עוברים באימות בלי DB (accounts/authentication.py) כל עוד
+# הגרסה שלהם ב-Redis - מבטלים אותם
+@receiver(post_delete, sender=get_user_model())
+def revoke_tokens_on_user_delete(sender, instance, **kwargs):
+    revoke_deleted_user(instance.pk, instance.token_version)
@@ -0,0 +1,68 @@
+# accounts/skills.py
+"""
+מילון מיומנויות מנורמל - במקום חיפוש LIKE '%python%' על SeekerProfile.skills.
+
+- normalize: case folding ורווחים - "Python", " python " ו-"PYTHON" הם אותו key.
+- כינויים (SkillAlias): js -> JavaScript. key של כינוי ממופה למיומנות הקנונית.
+- SeekerProfile.skills נשאר הטקסט שהמחפש כתב; כל שמירה שמשנה אותו מסנכרנת את
+  SeekerSkill (accounts/signals.py). משתמשים קיימים - backfill_seeker_skills.
+- חיפוש: seekers_with_skill - join על אינדקס (skill_id, seeker_id) במקום סריקת טקסט.
+"""
+from .models import SeekerProfile, SeekerSkill, Skill, SkillAlias
+
+
+def normalize(name):
+    return " ".join(name.split()).casefold()
+
+
+def split(text):
+    """"Python, Django ,react" -> ["Python", "Django", "react"]"""
+    return [" ".join(part.split()) for part in (text or "").split(",") if part.strip()]
+
+
+def resolve(names, create=True):
+    """
+    ids של המיומנויות לפי סדר names, בלי כפילויות (גם דרך כינויים).
+    create=True - שם שלא קיים נוסף למילון כפי שנכתב; אחרת מדולג.
+    """
+    keys = {}
+    for name in names:
+        keys.setdefault(normalize(name), name)
+    found = dict(SkillAlias.objects.filter(key__in=keys).values_list("key", "skill_id"))
+    found.update(Skill.objects.filter(key__in=keys.keys() - found.keys()).values_list("key", "pk"))
+    missing = keys.keys() - found.keys()
+    if missing and create:
+        # ignore_conflicts - שמירה מקבילה שכבר יצרה את אותה מיומנות
+        Skill.objects.bulk_create([Skill(name=keys[key], key=key) for key in missing], ignore_conflicts=True)
+        found.update(Skill.objects.filter(key__in=missing).values_list("key", "pk"))
+
+    ids = []
+    for key in keys:
+        if key in found and found[key] not in ids:
+            ids.append(found[key])
+    return ids
+
+
+def sync_seeker_skills(profile):
+    """מיישר את SeekerSkill של הפרופיל לטקסט ב-profile.skills; לא כותב אם לא השתנה דבר"""
+    wanted = resolve(split(profile.skills))
+    current = list(
+        SeekerSkill.objects.filter(seeker=profile).order_by("position").values_list("skill_id", flat=True)
+    )
+    if current == wanted:
+        return False
+    SeekerSkill.objects.filter(seeker=profile).delete()
+    SeekerSkill.objects.bulk_create(
+        [SeekerSkill(seeker=profile, skill_id=skill_id, position=i) for i, skill_id in enumerate(wanted)]
+    )
+    getattr(profile, "_prefetched_objects_cache", {}).pop("skill_links", None)
+    return True
+
+
+def seekers_with_skill(name, queryset=None):
+    """פרופילי המחפשים עם המיומנות (כולל כינויים); מיומנות לא מוכרת - queryset ריק"""
+    queryset = SeekerProfile.objects.all() if queryset is None else queryset
+    ids = resolve([name], create=False)
+    if not ids:
+        return queryset.none()
+    return queryset.filter(skill_links__skill_id=ids[0])
@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from django.urls import reverse
 from rest_framework.test import APITestCase
@@ -32,3 +32,390 @@ class SignupTests(APITestCase):
         r = self.client.post(url, data, format="json")
         self.assertEqual(r.status_code, status.HTTP_400_BAD_REQUEST)
 
+
+
+class ConditionalProfileTests(APITestCase):
+    """ETag/Last-Modified ב-/api/auth/me/ ובפרופיל המחפש"""
+
+    def setUp(self):
+        from accounts.models import Roles, SeekerProfile
+        from django.contrib.auth import get_user_model
+
+        self.user = get_user_model().objects.create_user(email="js@example.com", password="x", role=Roles.SEEKER)
+        self.profile = SeekerProfile.objects.create(user=self.user, full_name="Dana")
+        self.client.force_authenticate(self.user)
+
+    def _revalidate(self, url):
+        etag = self.client.get(url)["ETag"]
+        return etag, self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_me_and_profile_return_304_when_unchanged(self):
+        for url in ("/api/auth/me/", "/api/seeker/profile/"):
+            _, r = self._revalidate(url)
+            self.assertEqual(r.status_code, 304, url)
+
+    def test_experience_change_invalidates_profile_etag(self):
+        from datetime import date
+
+        etag, _ = self._revalidate("/api/auth/me/")
+        with self.captureOnCommitCallbacks(execute=True):  # הגרסה של /me עולה אחרי commit
+            self.profile.experiences.create(company="Acme", title="Intern", start_date=date(2024, 1, 1))
+        r = self.client.get("/api/auth/me/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(len(r.data["seeker_profile"]["experiences"]), 1)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class MeCacheTests(APITestCase):
+    """/api/auth/me/ - גוף ב-cache לפי גרסה, 304 בלי DB, וגרסה חדשה בכל שינוי"""
+
+    def setUp(self):
+        from datetime import date
+        from django.core.cache import cache
+        from accounts.models import Roles, SeekerProfile
+        from django.contrib.auth import get_user_model
+
+        cache.clear()
+        self.user = get_user_model().objects.create_user(email="js@example.com", password="x", role=Roles.SEEKER)
+        self.profile = SeekerProfile.objects.create(user=self.user, full_name="Dana")
+        self.profile.experiences.create(company="Acme", title="Intern", start_date=date(2024, 1, 1))
+        self.profile.education.create(school="TAU", degree="BSc", start_year=2020)
+        self.client.force_authenticate(self.user)
+
+    def test_payload_is_cached_by_version(self):
+        with self.assertNumQueries(4):  # משתמש + פרופילים, ניסיון, השכלה, מיומנויות
+            r = self.client.get("/api/auth/me/")
+        self.assertEqual(r.data["seeker_profile"]["full_name"], "Dana")
+        self.assertEqual(len(r.data["seeker_profile"]["education"]), 1)
+        version = r.data["version"]
+        self.assertIsNotNone(version)
+
+        with self.assertNumQueries(0):
+            r = self.client.get("/api/auth/me/")
+        self.assertEqual(r.data["version"], version)
+        with self.assertNumQueries(0):
+            r = self.client.get("/api/auth/me/", HTTP_IF_NONE_MATCH=r["ETag"])
+        self.assertEqual(r.status_code, 304)
+
+    def test_changes_bump_version(self):
+        from django.utils import timezone
+        from accounts.models import RecruiterProfile, SeekerProfile
+
+        version = self.client.get("/api/auth/me/").data["version"]
+        changes = [
+            lambda: SeekerProfile.objects.filter(pk=self.profile.pk).get().save(),
+            lambda: self.profile.experiences.get().delete(),
+            lambda: self.profile.education.create(school="BGU", degree="MSc", start_year=2023),
+            lambda: RecruiterProfile.objects.create(user=self.user),
+            lambda: self.user.save(),
+        ]
+        for change in changes:
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            r = self.client.get("/api/auth/me/")
+            self.assertNotEqual(r.data["version"], version)
+            version = r.data["version"]
+        self.assertEqual(len(r.data["seeker_profile"]["education"]), 2)
+        self.assertIsNotNone(r.data["recruiter_profile"])
+
+        self.user.last_login = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save(update_fields=["last_login"])
+        self.assertEqual(self.client.get("/api/auth/me/").data["version"], version)
+
+    def test_deleted_user_is_401_not_500(self):
+        self.client.get("/api/auth/me/")
+        with self.captureOnCommitCallbacks(execute=True):
+            type(self.user).objects.filter(pk=self.user.pk).delete()
+        # force_authenticate עוקף את ביטול ה-token - _render עצמו לא קורס על שורה חסרה
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 401)
+
+class ProfileResolverTests(APITestCase):
+    """הפרופיל נטען פעם אחת לבקשה, ומסלולי קריאה לא יוצרים אותו"""
+
+    def setUp(self):
+        from accounts.models import Roles
+        from django.contrib.auth import get_user_model
+
+        self.user = get_user_model().objects.create_user(email="js@example.com", password="x", role=Roles.SEEKER)
+        self.client.force_authenticate(self.user)
+
+    def test_reads_never_create_a_profile(self):
+        from accounts.models import SeekerProfile
+
+        self.assertEqual(self.client.get("/api/seeker/profile/").status_code, 404)
+        r = self.client.get("/api/seeker/experiences/")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["count"], 0)
+        self.assertFalse(SeekerProfile.objects.filter(user=self.user).exists())
+
+        # כתיבה יוצרת פרופיל חסר (משתמש ישן)
+        r = self.client.post("/api/seeker/experiences/", {"company": "Acme", "title": "Intern", "start_date": "2024-01-01"})
+        self.assertEqual(r.status_code, 201)
+        self.assertEqual(SeekerProfile.objects.filter(user=self.user).count(), 1)
+
+    def _fresh_user(self):
+        # כמו JWT: אובייקט משתמש חדש בכל בקשה
+        self.client.force_authenticate(type(self.user).objects.get(pk=self.user.pk))
+
+    def test_profile_is_loaded_once_per_request(self):
+        from datetime import date
+        from accounts.models import SeekerProfile
+
+        profile = SeekerProfile.objects.create(user=self.user, full_name="Dana")
+        profile.experiences.create(company="Acme", title="Intern", start_date=date(2024, 1, 1))
+        self._fresh_user()
+        with self.assertNumQueries(4):  # פרופיל (validator + גוף), ניסיון, השכלה, מיומנויות
+            r = self.client.get("/api/seeker/profile/")
+        self.assertEqual(r.data["full_name"], "Dana")
+        self._fresh_user()
+        with self.assertNumQueries(1):
+            r = self.client.get("/api/seeker/profile/", HTTP_IF_NONE_MATCH=r["ETag"])
+        self.assertEqual(r.status_code, 304)
+        self._fresh_user()
+        with self.assertNumQueries(2):  # count + עמוד, ב-JOIN דרך הפרופיל
+            self.client.get("/api/seeker/experiences/")
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class ClaimsAuthTests(APITestCase):
+    """JWT עם claims: אימות בלי DB, וביטול לפי גרסת משתמש"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from django.contrib.auth import get_user_model
+
+        cache.clear()
+        self.user = get_user_model().objects.create_user(email="u@example.com", password="Pass12345!")
+        r = self.client.post("/api/auth/token/", {"email": "u@example.com", "password": "Pass12345!"})
+        self.tokens = r.data
+
+    def _get(self, url, access):
+        return self.client.get(url, HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    def test_authenticates_without_db(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        claims = AccessToken(self.tokens["access"])
+        self.assertEqual((claims["role"], claims["is_staff"], claims["ver"]), ("NONE", False, 0))
+        self._get("/api/auth/me/", self.tokens["access"])
+        with self.assertNumQueries(0):  # /me מה-cache + משתמש מה-token
+            r = self._get("/api/auth/me/", self.tokens["access"])
+        self.assertEqual(r.data["email"], "u@example.com")
+
+        # token בלי claims (הונפק לפני השינוי) - עדיין תקף, דרך ה-DB
+        with self.assertNumQueries(1):
+            r = self._get("/api/auth/me/", AccessToken.for_user(self.user))
+        self.assertEqual(r.status_code, 200)
+
+    def test_role_change_revokes_old_tokens(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            r = self.client.post(
+                "/api/accounts/select-role/", {"role": "RECRUITER"},
+                HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}",
+            )
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(self._get("/api/auth/me/", self.tokens["access"]).status_code, 401)
+        self.assertEqual(self._get("/api/stats/recruiter/overview/", r.data["access"]).status_code, 200)
+
+        # refresh ישן חותם מחדש את ה-claims מה-DB
+        refreshed = self.client.post("/api/auth/token/refresh/", {"refresh": self.tokens["refresh"]})
+        self.assertEqual(refreshed.status_code, 200)
+        self.assertEqual(self._get("/api/stats/recruiter/overview/", refreshed.data["access"]).status_code, 200)
+
+    def test_deactivation_revokes_tokens(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self._get("/api/auth/me/", self.tokens["access"]).status_code, 401)
+        r = self.client.post("/api/auth/token/refresh/", {"refresh": self.tokens["refresh"]})
+        self.assertEqual(r.status_code, 401)
+
+    def test_evicted_version_falls_back_to_db(self):
+        from django.core.cache import cache
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        cache.delete(f"auth:ver:{self.user.pk}")  # eviction - לא "אין ביטול"
+        self.assertEqual(self._get("/api/auth/me/", self.tokens["access"]).status_code, 401)
+
+    def test_failed_publish_is_left_for_the_worker(self):
+        from io import StringIO
+        from unittest import mock
+        from django.core.management import call_command
+        from accounts.models import PendingTokenRevocation
+
+        with mock.patch("accounts.tokens.cache.set", side_effect=ConnectionError("redis down")):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.role = "RECRUITER"
+                self.user.save()
+        self.assertTrue(PendingTokenRevocation.objects.filter(user=self.user).exists())
+
+        # כתיבה נבדקת תמיד מול ה-DB - גם כשהגרסה ב-Redis עוד ישנה
+        r = self.client.post("/api/auth/logout-everywhere/", HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}")
+        self.assertEqual(r.status_code, 401)
+
+        call_command("publish_token_revocations", stdout=StringIO())
+        self.assertFalse(PendingTokenRevocation.objects.exists())
+        self.assertEqual(self._get("/api/auth/me/", self.tokens["access"]).status_code, 401)
+
+    def test_version_bump_and_outbox_commit_together(self):
+        from unittest import mock
+        from django.contrib.auth import get_user_model
+        from accounts.models import PendingTokenRevocation
+
+        with mock.patch.object(PendingTokenRevocation.objects, "bulk_create", side_effect=RuntimeError("crash")):
+            with self.assertRaises(RuntimeError):
+                self.user.role = "RECRUITER"
+                self.user.save()
+        row = get_user_model().objects.values_list("role", "token_version").get(pk=self.user.pk)
+        self.assertEqual(row, ("NONE", 0))
+        self.assertEqual(self._get("/api/auth/me/", self.tokens["access"]).status_code, 200)
+
+    def test_concurrent_saves_do_not_lose_a_version_bump(self):
+        from django.contrib.auth import get_user_model
+
+        other = get_user_model().objects.get(pk=self.user.pk)
+        self.user.role = "RECRUITER"
+        self.user.save()
+        other.is_active = False
+        other.save()
+        self.assertEqual((self.user.token_version, other.token_version), (1, 2))
+
+    def test_deleted_user_tokens_are_rejected(self):
+        self.assertEqual(self._get("/api/jobs/", self.tokens["access"]).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        for url in ("/api/jobs/", "/api/notifications/", "/api/auth/me/"):
+            self.assertEqual(self._get(url, self.tokens["access"]).status_code, 401, url)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class RefreshRevocationTests(APITestCase):
+    """rotation עם ביטול jti ב-cache (בלי כתיבות ל-DB), והתנתקות מכל המכשירים"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from django.contrib.auth import get_user_model
+
+        cache.clear()
+        self.user = get_user_model().objects.create_user(email="u@example.com", password="Pass12345!")
+        self.tokens = self.client.post("/api/auth/token/", {"email": "u@example.com", "password": "Pass12345!"}).data
+
+    def _refresh(self, token):
+        return self.client.post("/api/auth/token/refresh/", {"refresh": token})
+
+    def test_rotated_token_cannot_be_reused(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            r = self._refresh(self.tokens["refresh"])
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([q["sql"].split()[0] for q in ctx.captured_queries], ["SELECT"])
+
+        self.assertEqual(self._refresh(self.tokens["refresh"]).status_code, 401)
+        self.assertEqual(self._refresh(r.data["refresh"]).status_code, 200)
+
+    def test_revocation_store_unavailable_fails_closed(self):
+        from unittest import mock
+
+        with mock.patch("accounts.tokens.cache.add", side_effect=ConnectionError("redis down")):
+            r = self._refresh(self.tokens["refresh"])
+        self.assertEqual(r.status_code, 503)
+
+    def test_logout_everywhere(self):
+        other_device = self.client.post("/api/auth/token/", {"email": "u@example.com", "password": "Pass12345!"}).data
+        with self.captureOnCommitCallbacks(execute=True):
+            r = self.client.post(
+                "/api/auth/logout-everywhere/", HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}"
+            )
+        self.assertEqual(r.status_code, 204)
+        for tokens in (self.tokens, other_device):
+            self.assertEqual(self._refresh(tokens["refresh"]).status_code, 401)
+            r = self.client.get("/api/auth/me/", HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+            self.assertEqual(r.status_code, 401)
+
+        fresh = self.client.post("/api/auth/token/", {"email": "u@example.com", "password": "Pass12345!"}).data
+        self.assertEqual(self._refresh(fresh["refresh"]).status_code, 200)
+
+
+class SkillDictionaryTests(APITestCase):
+    """מיומנויות מנורמלות: case folding, כינויים, סנכרון בשמירה וחיפוש ב-join"""
+
+    def setUp(self):
+        from accounts.models import Roles, SeekerProfile
+        from django.contrib.auth import get_user_model
+
+        self.user = get_user_model().objects.create_user(email="js@example.com", password="x", role=Roles.SEEKER)
+        self.profile = SeekerProfile.objects.create(user=self.user, skills="python, JS ,  Django ,python3")
+        self.client.force_authenticate(self.user)
+
+    def test_profile_save_normalizes_skills(self):
+        from accounts.models import Skill
+
+        names = [link.skill.name for link in self.profile.skill_links.select_related("skill")]
+        self.assertEqual(names, ["Python", "JavaScript", "Django"])  # כינויים, כפילויות, רווחים
+        self.assertEqual(Skill.objects.filter(key="python").count(), 1)
+
+    def test_serializer_reads_and_writes_a_list(self):
+        r = self.client.get("/api/seeker/profile/")
+        self.assertEqual(r.data["skills"], ["Python", "JavaScript", "Django"])
+
+        r = self.client.post("/api/seeker/profile/", {"skills": ["k8s", "DJANGO"]}, format="multipart")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["skills"], ["Kubernetes", "Django"])
+
+        # לקוחות ישנים - מחרוזת מופרדת בפסיקים
+        r = self.client.post("/api/seeker/profile/", {"skills": "Go, rust"})
+        self.assertEqual(r.data["skills"], ["Go", "rust"])
+
+    def test_skill_rename_refreshes_me_and_profile(self):
+        from django.core.cache import cache
+        from accounts.models import Skill, SkillAlias
+
+        cache.clear()
+        r = self.client.get("/api/auth/me/")
+        version, etag = r.data["version"], self.client.get("/api/seeker/profile/")["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            skill = Skill.objects.get(key="python")
+            skill.name = "Python 3"
+            skill.save()
+        r = self.client.get("/api/auth/me/")
+        self.assertNotEqual(r.data["version"], version)
+        self.assertEqual(r.data["seeker_profile"]["skills"], ["Python 3", "JavaScript", "Django"])
+        self.assertEqual(self.client.get("/api/seeker/profile/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        version = r.data["version"]
+        with self.captureOnCommitCallbacks(execute=True):
+            alias = SkillAlias.objects.get(key="js")
+            alias.skill = skill
+            alias.save()
+        self.assertNotEqual(self.client.get("/api/auth/me/").data["version"], version)
+
+    def test_lookup_is_a_join_not_a_text_scan(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from accounts.skills import seekers_with_skill
+
+        with CaptureQueriesContext(connection) as ctx:
+            found = list(seekers_with_skill("PY"))
+        self.assertEqual(found, [self.profile])
+        self.assertFalse(any("LIKE" in q["sql"] for q in ctx.captured_queries))
+        self.assertFalse(seekers_with_skill("COBOL").exists())
+
+    def test_backfill_command(self):
+        from io import StringIO
+        from django.core.management import call_command
+        from accounts.models import SeekerProfile, SeekerSkill
+
+        SeekerProfile.objects.filter(pk=self.profile.pk).update(skills="React, node")  # בלי signal
+        SeekerSkill.objects.all().delete()
+        call_command("backfill_seeker_skills", stdout=StringIO())
+        names = list(self.profile.skill_links.values_list("skill__name", flat=True))
+        self.assertEqual(names, ["React", "Node.js"])
+
+        out = StringIO()
+        call_command("backfill_seeker_skills", stdout=out)  # הרצה חוזרת - אין מה לעדכן
+        self.assertIn("synced skills for 0", out.getvalue())
@@ -0,0 +1,190 @@
+# accounts/tokens.py
+"""
+JWT עם claims של המשתמש - כדי שבקשת קריאה מאומתת לא תטען את שורת המשתמש (accounts/authentication.py).
+
+- ב-access וב-refresh: role, is_staff, is_superuser, ver (User.token_version), gen (User.session_generation).
+- ביטול: כל שינוי באחד מהם / ב-is_active / בסיסמה מעלה את token_version (User.save), והגרסה
+  הנוכחית נרשמת ב-Redis (auth:ver:<id>). token עם ver ישן נדחה.
+- הפרסום עמיד: PendingTokenRevocation נכתב באותה טרנזקציה ונמחק אחרי שה-Redis עודכן; כישלון
+  נשאר ל-worker (publish_token_revocations). מפתח חסר (eviction / TTL) אינו "אין ביטול" -
+  האימות עובר ל-DB וממלא אותו מחדש.
+- refresh קורא את המשתמש מה-DB (נדיר) וחותם מחדש את ה-claims העדכניים; משתמש לא פעיל,
+  או refresh מדור קודם (התנתקות מכל המכשירים) - נדחים.
+- rotation: ה-jti של ה-refresh שנוצל נרשם ב-Redis (auth:jti:<jti>) עם TTL של שארית חייו -
+  cache.add אחד, אטומי: שימוש חוזר (או שתי בקשות במקביל עם אותו token) נדחה. בלי כתיבה ל-DB.
+  Redis לא זמין - refresh נכשל (503) ולא עוקף את הבדיקה; access tokens ממשיכים לעבוד.
+"""
+import logging
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import exceptions, serializers, status
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+logger = logging.getLogger(__name__)
+
+ROLE_CLAIM = "role"
+STAFF_CLAIM = "is_staff"
+SUPERUSER_CLAIM = "is_superuser"
+VERSION_CLAIM = "ver"
+GENERATION_CLAIM = "gen"
+
+UNAVAILABLE = object()
+
+
+class RevocationUnavailable(exceptions.APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Token refresh is temporarily unavailable; retry shortly."
+    default_code = "revocation_unavailable"
+
+
+def _version_key(user_id):
+    return f"auth:ver:{user_id}"
+
+
+def _jti_key(jti):
+    return f"auth:jti:{jti}"
+
+
+def _version_ttl():
+    # ארוך מחיי כל token; מפתח שפג או פונה ממולא מחדש מה-DB (remember_version)
+    return int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+
+
+def stamp(token, user):
+    remember_version(user.pk, user.token_version)
+    token[ROLE_CLAIM] = user.role
+    token[STAFF_CLAIM] = user.is_staff
+    token[SUPERUSER_CLAIM] = user.is_superuser
+    token[VERSION_CLAIM] = user.token_version
+    token[GENERATION_CLAIM] = user.session_generation
+    return token
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """RefreshToken שה-access שלו נושא את ה-claims (access_token מעתיק את כל ה-claims)"""
+
+    @classmethod
+    def for_user(cls, user):
+        return stamp(super().for_user(user), user)
+
+
+def tokens_for(user):
+    refresh = ClaimsRefreshToken.for_user(user)
+    return {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsTokenRefreshSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
+    access = serializers.CharField(read_only=True)
+
+    def validate(self, attrs):
+        refresh = ClaimsRefreshToken(attrs["refresh"])
+        user = get_user_model().objects.filter(pk=refresh[api_settings.USER_ID_CLAIM]).first()
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise exceptions.AuthenticationFailed("No active account found for this token.", "no_active_account")
+        if refresh.get(GENERATION_CLAIM, 0) != user.session_generation:
+            raise exceptions.AuthenticationFailed("Token has been revoked.", "token_revoked")
+        if api_settings.ROTATE_REFRESH_TOKENS and not revoke_jti(refresh):
+            raise exceptions.AuthenticationFailed("Token has already been used.", "token_revoked")
+        stamp(refresh, user)
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
+        return data
+
+
+def revoke_jti(token):
+    """
+    מסמן את ה-refresh token כמנוצל עד תום תוקפו. True - סומן עכשיו; False - כבר היה מסומן
+    (שימוש חוזר). Redis לא זמין - RevocationUnavailable.
+    """
+    timeout = max(int(token["exp"] - time.time()), 1)
+    try:
+        return cache.add(_jti_key(token[api_settings.JTI_CLAIM]), 1, timeout=timeout)
+    except Exception as exc:  # redis.ConnectionError, TimeoutError וכו'
+        logger.warning("refresh token revocation store unavailable: %s", exc)
+        raise RevocationUnavailable()
+
+
+def _publish(user_ids):
+    """כותב את token_version הנוכחי ל-Redis ומוחק את ה-outbox של מי שפורסם. מחזיר כמה פורסמו"""
+    from .models import PendingTokenRevocation
+
+    published = []
+    versions = get_user_model().objects.filter(pk__in=user_ids).values_list("pk", "token_version")
+    for user_id, version in versions:
+        try:
+            cache.set(_version_key(user_id), version, timeout=_version_ttl())
+        except Exception as exc:  # redis.ConnectionError, TimeoutError וכו'
+            logger.warning("token revocation not published for user %s (left for the worker): %s", user_id, exc)
+            break
+        published.append(user_id)
+    PendingTokenRevocation.objects.filter(user_id__in=published).delete()
+    return len(published)
+
+
+def revoke_tokens(user_id):
+    """
+    access tokens של המשתמש עם ver ישן נדחים מרגע ה-commit. נקרא בתוך הטרנזקציה של User.save:
+    שורת outbox נכתבת בה, והפרסום ל-Redis רץ אחרי ה-commit.
+    """
+    from .models import PendingTokenRevocation
+
+    PendingTokenRevocation.objects.bulk_create([PendingTokenRevocation(user_id=user_id)], ignore_conflicts=True)
+    transaction.on_commit(lambda: _publish([user_id]))
+
+
+def revoke_deleted_user(user_id, version):
+    """
+    משתמש שנמחק: מעלה את הגרסה ב-Redis מעבר לכל גרסה שהונפקה, אחרי ה-commit. מחיקת המפתח
+    לא מספיקה - בקשה מקבילה שקראה את השורה לפני ה-commit הייתה ממלאת אותו מחדש בגרסה
+    הישנה. ה-outbox לא רלוונטי כאן (השורה נמחקת יחד עם המשתמש) - כשל נרשם ב-log.
+    """
+    def publish():
+        try:
+            cache.set(_version_key(user_id), version + 1, timeout=_version_ttl())
+        except Exception as exc:  # redis.ConnectionError, TimeoutError וכו'
+            logger.warning("token revocation not published for deleted user %s: %s", user_id, exc)
+
+    transaction.on_commit(publish)
+
+
+def publish_pending_revocations(batch_size=500):
+    """worker: מפרסם batch אחד של ביטולים שלא פורסמו. מחזיר כמה פורסמו"""
+    from .models import PendingTokenRevocation
+
+    user_ids = list(PendingTokenRevocation.objects.order_by("created_at").values_list("user_id", flat=True)[:batch_size])
+    return _publish(user_ids) if user_ids else 0
+
+
+def remember_version(user_id, version, replace=False):
+    """רושם את הגרסה הנוכחית (מה-DB) ב-Redis; replace=False - רק אם חסרה"""
+    write = cache.set if replace else cache.add
+    try:
+        write(_version_key(user_id), version, timeout=_version_ttl())
+    except Exception as exc:
+        logger.warning("token version not cached for user %s: %s", user_id, exc)
+
+
+def current_version(user_id):
+    """
+    הגרסה הנוכחית מ-Redis; None - לא ידועה (מפתח חסר), UNAVAILABLE - Redis לא זמין.
+    בשני המקרים האימות בודק מול ה-DB.
+    """
+    try:
+        return cache.get(_version_key(user_id))
+    except Exception as exc:
+        logger.warning("token revocation list unavailable: %s", exc)
+        return UNAVAILABLE
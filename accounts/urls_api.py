@@ -5,7 +5,7 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from .api import (
     SignupAPIView, RoleSelectAPIView,
     SeekerProfileViewSet, SeekerExperienceViewSet, SeekerEducationViewSet,
-    RecruiterProfileViewSet
+    RecruiterProfileViewSet, MeAPIView, LogoutEverywhereAPIView
 )
 
 router = DefaultRouter()
@@ -18,6 +18,8 @@ urlpatterns = [
     path("auth/signup/", SignupAPIView.as_view(), name="api-signup"),
     path("auth/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("auth/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("auth/me/", MeAPIView.as_view(), name="api-me"),
+    path("auth/logout-everywhere/", LogoutEverywhereAPIView.as_view(), name="api-logout-everywhere"),
     path("accounts/select-role/", RoleSelectAPIView.as_view(), name="api-select-role"),
     path("", include(router.urls)),
 ]
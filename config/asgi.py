@@ -10,7 +10,34 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 import os
 
 from django.core.asgi import get_asgi_application
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# חיבורים ארוכים (SSE / long-poll ב-notifications/stream.py)
+LONG_LIVED_PATHS = ("/api/notifications/stream/", "/api/notifications/poll/")
+
+
+class LongLivedASGIHandler(ASGIHandler):
+    """
+    ASGIHandler רגיל פותח ThreadSensitiveContext לכל בקשה, כלומר thread ייעודי
+    לקוד הסינכרוני שלה (signals, middleware, ORM) שחי עד סוף הבקשה - ב-stream
+    פתוח זה thread לכל לקוח. כאן הקוד הסינכרוני הקצר (אימות, השלמה מה-DB)
+    רץ ב-thread משותף אחד, והחיבור עצמו הוא רק task ב-event loop.
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            raise ValueError("Django can only handle ASGI/HTTP connections, not %s." % scope["type"])
+        await self.handle(scope, receive, send)
+
+
+long_lived_application = LongLivedASGIHandler()
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "http" and scope["path"] in LONG_LIVED_PATHS:
+        return await long_lived_application(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -0,0 +1,27 @@
+# config/conditional.py
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    """ETag מתוך validators זולים (גרסאות, max(updated_at), ספירות) - בלי לרנדר את הגוף"""
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def conditional_get(request, compute, etag=None, last_modified=None):
+    """
+    GET מותנה (If-None-Match / If-Modified-Since) ל-views של DRF.
+    אם הלקוח כבר מחזיק את הגרסה - 304 בלי לקרוא ל-compute (בלי serializer ובלי גוף).
+    אחרת - compute() ומוסיף ETag/Last-Modified לתשובה.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    response = not_modified if not_modified is not None else compute()
+    if response.status_code in (200, 304):
+        if etag:
+            response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+    return response
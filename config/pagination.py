@@ -0,0 +1,114 @@
+# config/pagination.py
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination, _reverse_ordering
+
+POSITION_SEPARATOR = "|"
+
+
+class KeysetPagination(CursorPagination):
+    """
+    עימוד keyset (cursor) - בלי COUNT(*) ובלי OFFSET עמוק, כך שעמוד 1 ועמוד 10,000
+    עולים אותו דבר. ה-cursor אטום (base64) ונבנה מכל שדות ה-ordering של השורה האחרונה
+    (created_at|id): העמוד הבא הוא (created_at, id) < (c, i) - גם שורות עם אותו
+    created_at מעומדות לפי id ולא לפי OFFSET. ה-CursorPagination של DRF מקודד רק את
+    השדה הראשון ומשלים שוויונות ב-OFFSET.
+
+    מצב עמודים רגיל עדיין זמין: ?page=N מחזיר תשובת PageNumberPagination המוכרת.
+    """
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    page_number_class = PageNumberPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self._page_number_paginator = None
+        if request.query_params.get(self.page_number_class.page_query_param) is not None:
+            self._page_number_paginator = self.page_number_class()
+            return self._page_number_paginator.paginate_queryset(queryset, request, view)
+        return self._paginate_keyset(queryset, request, view)
+
+    def _paginate_keyset(self, queryset, request, view):
+        """
+        כמו CursorPagination.paginate_queryset, אבל הסינון לפי כל שדות ה-ordering.
+        המיקום ייחודי (id בסוף), כך שה-links של DRF תמיד יוצאים עם offset 0.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        offset, reverse, current_position = self.cursor if self.cursor is not None else (0, False, None)
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if current_position is not None:
+            queryset = queryset.filter(self._after(queryset.model, ordering, current_position))
+
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following = len(results) > len(self.page)
+        following = self._get_position_from_instance(results[-1], self.ordering) if has_following else None
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = has_following
+            self.next_position, self.previous_position = current_position, following
+        else:
+            self.has_next = has_following
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position, self.previous_position = following, current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def _after(self, model, ordering, position):
+        """
+        השורות שאחרי position בסדר ordering - השוואה לקסיקוגרפית:
+        (a < x) OR (a = x AND b < y) ...
+        """
+        values = position.split(POSITION_SEPARATOR)
+        if len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        condition, equal = Q(), Q()
+        for order, raw in zip(ordering, values):
+            name = order.lstrip("-")
+            try:
+                value = model._meta.get_field(name).to_python(raw)
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+            lookup = "lt" if order.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def _get_position_from_instance(self, instance, ordering):
+        return self.encode_position(
+            instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            for name in (order.lstrip("-") for order in ordering)
+        )
+
+    @staticmethod
+    def encode_position(values):
+        return POSITION_SEPARATOR.join(str(value) for value in values)
+
+    def get_paginated_response(self, data):
+        if self._page_number_paginator is not None:
+            return self._page_number_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self._page_number_paginator is not None:
+            return self._page_number_paginator.to_html()
+        return super().to_html()
+
+
+class IdKeysetPagination(KeysetPagination):
+    """keyset לפי id בלבד (להתראות - ה-PK כבר ממוין ומאונדקס)"""
+    ordering = "-id"
@@ -62,6 +62,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"  # נדרש ל-/api/notifications/stream/
 
 if os.getenv("DB_HOST"):
     DATABASES = {
@@ -104,14 +105,53 @@ CACHES = {
         "LOCATION": os.getenv("REDIS_URL", "redis://redis:6379/0"),
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            # Redis שלא עונה לא יתקע בקשות - נופלים מהר ל-DB
+            "SOCKET_CONNECT_TIMEOUT": 0.25,
+            "SOCKET_TIMEOUT": 0.25,
         }
     }
 }
 
+# Cache ל-/api/auth/me/ (accounts/cache.py). המפתחות בגרסאות, כך שה-TTL רק מגביל זיכרון.
+ME_CACHE_TTL = int(os.getenv("ME_CACHE_TTL", "3600"))
+
+# Cache תשובות /api/jobs/ לאנונימיים (שניות). המפתחות בגרסאות, כך שה-TTL רק מגביל זיכרון.
+JOBS_RESPONSE_CACHE_TTL = int(os.getenv("JOBS_RESPONSE_CACHE_TTL", "300"))
+# גרסת משרה בודדת (jobs:v:job:<id>); מפתח שפג נוצר מחדש בצפייה הבאה
+JOBS_VERSION_TTL = int(os.getenv("JOBS_VERSION_TTL", str(24 * 3600)))
+
+# התראות בזמן אמת (notifications/stream.py): "redis" ב-production, "memory" ל-node יחיד/בדיקות
+NOTIFICATIONS_BROKER = os.getenv("NOTIFICATIONS_BROKER", "redis")
+NOTIFICATIONS_REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+NOTIFICATIONS_STREAM_HEARTBEAT = 15  # שניות בין heartbeats ב-SSE
+NOTIFICATIONS_POLL_TIMEOUT = 25  # המתנה מקסימלית ב-long-poll (שניות)
+# איחוד "התקבלה מועמדות" לאותה משרה לשורה אחת כל עוד לא נקראה, בחלון הזה (שניות; 0 = כבוי)
+NOTIFICATIONS_COALESCE_WINDOW = int(os.getenv("NOTIFICATIONS_COALESCE_WINDOW", str(30 * 60)))
+# True - הגשות נאספות לסיכום תקופתי (deliver_notifications --digest מ-cron) במקום התראה מיידית
+NOTIFICATIONS_DIGEST = os.getenv("NOTIFICATIONS_DIGEST", "False").lower() == "true"
+# שמירה (python manage.py prune_notifications, מ-cron) - ראו notifications/retention.py
+NOTIFICATIONS_RETENTION = [
+    {"name": "read", "days": int(os.getenv("NOTIFICATIONS_READ_RETENTION_DAYS", "30")), "read_only": True, "action": "delete"},
+    {"name": "all", "days": int(os.getenv("NOTIFICATIONS_ARCHIVE_AFTER_DAYS", "180")), "action": "archive"},
+]
+NOTIFICATIONS_ARCHIVE = os.getenv("NOTIFICATIONS_ARCHIVE", "table")  # "table" / "jsonl"
+NOTIFICATIONS_ARCHIVE_DIR = os.getenv("NOTIFICATIONS_ARCHIVE_DIR", str(BASE_DIR / "archive" / "notifications"))
+
+# סנכרון אינקרמנטלי (config/sync.py): מודלים עם sync_seq (triggers), ותוקף ה-tombstones (וה-tokens)
+SYNC_MODELS = [
+    "jobs.Application", "jobs.ApplicationTombstone", "notifications.Notification", "notifications.NotificationTombstone",
+]
+SYNC_TOMBSTONE_DAYS = int(os.getenv("SYNC_TOMBSTONE_DAYS", "30"))
+SYNC_TOMBSTONE_MODELS = ["jobs.ApplicationTombstone", "notifications.NotificationTombstone"]
+
+# דשבורדים (statsapi/series.py): TTL ל-cache של כל (משתמש, חלון, bucket), לפי bucket (שניות)
+STATS_CACHE_TTLS = {"hour": 30, "day": 120, "week": 600}
+
 # REST Framework Settings
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # JWT בלי שאילתה למשתמש (claims ב-token) - accounts/authentication.py
+        "accounts.authentication.ClaimsJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
@@ -126,6 +166,9 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=1),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True,
+    # role / is_staff / גרסת משתמש בתוך ה-tokens (accounts/tokens.py)
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.tokens.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.tokens.ClaimsTokenRefreshSerializer",
 }
 
 # CORS Settings
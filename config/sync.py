@@ -0,0 +1,231 @@
+# config/sync.py
+"""
+סנכרון אינקרמנטלי (deltas) ללקוחות מובייל: GET .../sync/?since=<token>&limit=
+
+- results - שורות שנוצרו/השתנו אחרי ה-token (לפי sync_seq, id).
+- deleted - ids שנמחקו מאז (tombstones).
+- next    - token לסנכרון הבא; has_more=True - לקרוא שוב מיד עם next.
+- בלי since - סנכרון ראשוני (כל השורות, בעמודים).
+- token ישן מ-SYNC_TOMBSTONE_DAYS - 410: ה-tombstones כבר נוקו, צריך סנכרון מלא.
+
+הסדר הוא לפי sync_seq - עמודה שה-DB מחתים ב-trigger בכל INSERT/UPDATE (לא השעון של
+האפליקציה), ותשובה כוללת רק שורות מתחת ל-watermark שכל מה שמתחתיו כבר committed:
+- PostgreSQL: sync_seq = txid של הטרנזקציה הכותבת (pg_current_xact_id); ה-watermark הוא
+  ה-txid הפעיל הוותיק ביותר ב-snapshot - כל טרנזקציה עם txid קטן ממנו כבר הסתיימה.
+  טרנזקציה ארוכה מעכבת את הסנכרון (ולא "מדולגת" כשה-cursor עובר אותה).
+- SQLite (dev): כותב אחד בכל רגע - מונה (sync_seq_counter) שמתקדם בתוך הטרנזקציה הכותבת
+  ונחשף רק ב-commit שלה.
+העלות של כל סנכרון - סריקת טווח על האינדקס (owner, sync_seq, id) מה-cursor והלאה,
+כלומר פרופורציונלית לכמות השינויים ולא לגודל ההיסטוריה.
+"""
+import base64
+import binascii
+import json
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+SYNC_PAGE_SIZE = 100
+SYNC_MAX_PAGE_SIZE = 500
+
+
+class SyncTokenExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "Sync token expired; a full resync is required."
+    default_code = "sync_token_expired"
+
+
+SYNC_COUNTER_TABLE = "sync_seq_counter"
+
+_PG_INSTALL = [
+    """
+    CREATE OR REPLACE FUNCTION sync_seq_stamp() RETURNS trigger AS $$
+    BEGIN
+        NEW.sync_seq := pg_current_xact_id()::text::bigint;
+        RETURN NEW;
+    END $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS {table}_sync_seq_trg ON {table}",
+    """
+    CREATE TRIGGER {table}_sync_seq_trg
+        BEFORE INSERT OR UPDATE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION sync_seq_stamp()
+    """,
+]
+
+_PG_UNINSTALL = ["DROP TRIGGER IF EXISTS {table}_sync_seq_trg ON {table}"]
+
+_SQLITE_COUNTER = [
+    f"CREATE TABLE IF NOT EXISTS {SYNC_COUNTER_TABLE} (id INTEGER PRIMARY KEY CHECK (id = 1), value INTEGER NOT NULL)",
+    f"INSERT OR IGNORE INTO {SYNC_COUNTER_TABLE} (id, value) VALUES (1, 0)",
+]
+
+# recursive_triggers כבוי (ברירת המחדל) - ה-UPDATE שבתוך ה-trigger לא מפעיל אותו שוב
+_SQLITE_INSTALL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {{table}}_sync_seq_{suffix} AFTER {event} ON {{table}} BEGIN
+        UPDATE {SYNC_COUNTER_TABLE} SET value = value + 1 WHERE id = 1;
+        UPDATE {{table}} SET sync_seq = (SELECT value FROM {SYNC_COUNTER_TABLE} WHERE id = 1) WHERE id = new.id;
+    END
+    """
+    for suffix, event in (("ai", "INSERT"), ("au", "UPDATE"))
+]
+
+_SQLITE_UNINSTALL = ["DROP TRIGGER IF EXISTS {table}_sync_seq_ai", "DROP TRIGGER IF EXISTS {table}_sync_seq_au"]
+
+
+def install_sync_seq(connection, tables):
+    """triggers שמחתימים sync_seq בטבלאות. אידמפוטנטי - בטוח להריץ שוב."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            statements = _PG_INSTALL
+        elif connection.vendor == "sqlite":
+            for sql in _SQLITE_COUNTER:
+                cursor.execute(sql)
+            statements = _SQLITE_INSTALL
+        else:
+            return
+        for table in tables:
+            for sql in statements:
+                cursor.execute(sql.format(table=table))
+
+
+def uninstall_sync_seq(connection, tables):
+    statements = {"postgresql": _PG_UNINSTALL, "sqlite": _SQLITE_UNINSTALL}.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for table in tables:
+            for sql in statements:
+                cursor.execute(sql.format(table=table))
+
+
+def repair_sync_seq(sender, using, **kwargs):
+    """
+    post_migrate: SQLite בונה טבלה מחדש ב-AlterField/AddField וה-triggers נמחקים יחד
+    איתה - מתקינים מחדש לטבלאות של האפליקציה ב-SYNC_MODELS
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    existing = set(connection.introspection.table_names())
+    tables = [
+        model._meta.db_table
+        for model in (apps.get_model(label) for label in getattr(settings, "SYNC_MODELS", ()))
+        if model._meta.app_label == sender.label and model._meta.db_table in existing
+    ]
+    if tables:
+        install_sync_seq(connection, tables)
+
+
+def watermark(connection):
+    """גבול עליון (לא כולל) ל-sync_seq: כל שורה מתחתיו כבר committed ולא תופיע מאוחר יותר"""
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # הטרנזקציה הפעילה הוותיקה ביותר (או xmax אם אין). לא pg_snapshot_xmin - הוא כולל
+            # גם את הטרנזקציה של הקורא עצמו, שהשורות שלה גלויות לו ממילא
+            cursor.execute(
+                "SELECT LEAST(pg_snapshot_xmax(s)::text::bigint, "
+                "(SELECT min(xip::text::bigint) FROM pg_snapshot_xip(s) AS xip)) "
+                "FROM pg_current_snapshot() AS s"
+            )
+        else:
+            cursor.execute(f"SELECT value + 1 FROM {SYNC_COUNTER_TABLE} WHERE id = 1")
+        return cursor.fetchone()[0]
+
+
+def encode_token(rows_cursor, tombstones_cursor, tombstones_as_of):
+    """
+    cursor = (sync_seq, id); tombstones_as_of - הזמן שעד אליו ה-tombstones נקראו
+    (token ישן מ-SYNC_TOMBSTONE_DAYS - ייתכן שחלק מה-tombstones כבר נוקו)
+    """
+    data = {"r": list(rows_cursor), "t": list(tombstones_cursor), "at": tombstones_as_of.isoformat()}
+    return base64.urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode()).decode()
+
+
+def decode_token(token):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token.encode()))
+        if "at" not in data:
+            # token לפי updated_at (לפני sync_seq) - צריך סנכרון מלא
+            raise SyncTokenExpired()
+        cursors = tuple((int(data[key][0]), int(data[key][1])) for key in ("r", "t"))
+        as_of = parse_datetime(data["at"])
+        if as_of is None:
+            raise ValueError(token)
+    except (ValueError, TypeError, KeyError, IndexError, AttributeError, binascii.Error):
+        raise ValidationError({"since": ["Invalid sync token."]})
+    return cursors + (as_of,)
+
+
+def _page(queryset, cursor, upper, limit):
+    """שורות אחרי cursor (None - מההתחלה) ומתחת ל-upper, לפי (sync_seq, id); מחזיר (rows, has_more)"""
+    queryset = queryset.filter(sync_seq__lt=upper)
+    if cursor is not None:
+        seq, pk = cursor
+        queryset = queryset.filter(Q(sync_seq__gt=seq) | Q(sync_seq=seq, pk__gt=pk))
+    rows = list(queryset.order_by("sync_seq", "pk")[:limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+def _limit(request):
+    try:
+        limit = int(request.query_params.get("limit", SYNC_PAGE_SIZE))
+    except ValueError:
+        raise ValidationError({"limit": ["A valid integer is required."]})
+    return min(max(limit, 1), SYNC_MAX_PAGE_SIZE)
+
+
+def sync_delta(request, queryset, tombstones, serializer_class, context=None):
+    """
+    queryset   - השורות שהמשתמש רואה (עם sync_seq)
+    tombstones - ה-tombstones שלו (sync_seq, deleted_at, object_id)
+    מחזיר את גוף התשובה.
+    """
+    limit = _limit(request)
+    now = timezone.now()
+    token = request.query_params.get("since")
+    if token:
+        rows_cursor, tombstones_cursor, tombstones_as_of = decode_token(token)
+        if tombstones_as_of < now - timedelta(days=getattr(settings, "SYNC_TOMBSTONE_DAYS", 30)):
+            raise SyncTokenExpired()
+    upper = watermark(connections[queryset.db])
+    if not token:
+        # סנכרון ראשוני - כל השורות הקיימות; מחיקות רק מכאן והלאה
+        rows_cursor, tombstones_cursor = None, (upper, 0)
+
+    rows, rows_more = _page(queryset, rows_cursor, upper, limit)
+    deleted, deleted_more = _page(tombstones, tombstones_cursor, upper, limit)
+
+    # cursor שהגיע לסוף מתקדם ל-watermark - גם token של לקוח בלי שינויים לא מתיישן
+    rows_next = (rows[-1].sync_seq, rows[-1].pk) if rows_more else (upper, 0)
+    if deleted_more:
+        deleted_next, deleted_as_of = (deleted[-1].sync_seq, deleted[-1].pk), deleted[-1].deleted_at
+    else:
+        deleted_next, deleted_as_of = (upper, 0), now
+    return {
+        "results": serializer_class(rows, many=True, context=context).data,
+        "deleted": [tombstone.object_id for tombstone in deleted],
+        "next": encode_token(rows_next, deleted_next, deleted_as_of),
+        "has_more": rows_more or deleted_more,
+    }
+
+
+def prune_tombstones(batch_size=1000):
+    """מוחק tombstones ישנים מ-SYNC_TOMBSTONE_DAYS (tokens ישנים יותר מקבלים 410 בכל מקרה)"""
+    cutoff = timezone.now() - timedelta(days=getattr(settings, "SYNC_TOMBSTONE_DAYS", 30))
+    removed = {}
+    for label in getattr(settings, "SYNC_TOMBSTONE_MODELS", ()):
+        model = apps.get_model(label)
+        removed[label] = 0
+        while True:
+            ids = list(model.objects.filter(deleted_at__lt=cutoff).order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+            removed[label] += model.objects.filter(pk__in=ids).delete()[0]
+    return removed
@@ -0,0 +1,54 @@
+# config/tracking.py
+
+
+class FieldTrackerMixin:
+    """
+    מעקב אחרי שינויים בשדות מאז הטעינה מה-DB - בלי SELECT נוסף ב-pre_save.
+
+    - tracked_fields: שמות השדות למעקב (ל-ForeignKey נשמר ה-id, למשל job -> job_id).
+    - instance.changed_fields: השדות שהערך שלהם שונה מהערך שנטען/נשמר לאחרונה.
+    - instance.previous("status"): הערך הקודם (None לאובייקט חדש).
+
+    ה-snapshot נלקח ב-from_db / refresh_from_db ומתעדכן אחרי save - כך ש-signals
+    של post_save עדיין רואים את הערכים הקודמים. שדה שנדחה (defer/only) ועוד לא
+    נטען - לא במעקב.
+    """
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._snapshot(kwargs.get("fields"))
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # עם update_fields - רק השדות שנכתבו בפועל תואמים עכשיו ל-DB
+        self._snapshot(kwargs.get("update_fields"))
+
+    def _tracked_attnames(self):
+        return {name: self._meta.get_field(name).attname for name in self.tracked_fields}
+
+    def _snapshot(self, fields=None):
+        loaded = getattr(self, "_loaded_values", {})
+        for name, attname in self._tracked_attnames().items():
+            if fields is not None and name not in fields and attname not in fields:
+                continue
+            if attname in self.__dict__:
+                loaded[name] = self.__dict__[attname]
+        self._loaded_values = loaded
+
+    @property
+    def changed_fields(self):
+        loaded = getattr(self, "_loaded_values", {})
+        return {
+            name for name, attname in self._tracked_attnames().items()
+            if name in loaded and self.__dict__.get(attname) != loaded[name]
+        }
+
+    def previous(self, name):
+        return getattr(self, "_loaded_values", {}).get(name)
@@ -1,7 +1,10 @@
 # jobs/admin.py
 from django.contrib import admin
+from django.db import connection
+from django.db.models import Q
 from django.utils.html import format_html
 from .models import Job, Application
+from .search import search_filter
 
 
 @admin.register(Job)
@@ -49,6 +52,13 @@ class JobAdmin(admin.ModelAdmin):
     )
     
     list_per_page = 25
+
+    def get_search_results(self, request, queryset, search_term):
+        # title/description דרך אינדקס החיפוש במקום icontains על כל הטבלה
+        if not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        queryset = queryset.filter(search_filter(search_term, connection) | Q(posted_by__email__icontains=search_term))
+        return queryset, False
     
     def status_badge(self, obj):
         colors = {
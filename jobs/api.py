@@ -1,14 +1,28 @@
 # jobs/api.py
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, decorators
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import Http404
+from django.db.models import Count, Max
 
-from .models import Job, Application
-from .serializers import JobSerializer, ApplicationSerializer
+from .models import Job, Application, ApplicationTombstone
+from .serializers import (
+    JobSerializer, ApplicationSerializer, JobBulkIdsSerializer, JobFilterSerializer, JobSearchSerializer
+)
+from .bulk import bulk_create_jobs, bulk_set_status, bulk_update_jobs
+from .filters import apply_job_filters
+from .search import search_jobs
+from .cache import cached_response, job_version, listing_version
 from .permissions import (
     IsRecruiter, IsSeeker, IsJobOwner, IsApplicationOwnerOrRecruiter
 )
 from accounts.models import Roles
+from config.conditional import conditional_get, make_etag
+from config.pagination import KeysetPagination
+from config.sync import sync_delta
 
 User = get_user_model()
 
@@ -17,17 +31,102 @@ class JobViewSet(viewsets.ModelViewSet):
     """
     ניהול משרות.
     - list/retrieve: פתוח לכל (אפשר לשנות ל-IsAuthenticated אם תרצי)
+      list מקבל פילטרים: status, difficulty, deadline_before/after, posted_by,
+      created_after/before, has_free_slots.
     - create/update/destroy: רק RECRUITER ובעל המשרה.
+    - search: חיפוש טקסט מלא מדורג (?q=...), פתוח לכל.
+    - bulk (POST/PATCH), bulk/close, bulk/reopen: פעולות על כמה משרות - רק RECRUITER,
+      בעלות נבדקת בשאילתה אחת לכל ה-batch (jobs/bulk.py).
+    - list/retrieve לאנונימיים מוגשים מ-cache (jobs/cache.py).
+    - list/retrieve תומכים ב-GET מותנה (ETag) - 304 בלי serializer.
     """
     queryset = Job.objects.all().select_related("posted_by")
     serializer_class = JobSerializer
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        # ספירת מועמדויות + "כבר הגשתי" מחושבים ב-annotations - שאילתה אחת לעמוד
+        return Job.objects.with_application_stats(self.request.user).select_related("posted_by")
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action != "list":
+            return queryset
+        params = JobFilterSerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        return apply_job_filters(queryset, params.validated_data)
+
+    def list(self, request, *args, **kwargs):
+        def compute():
+            return super(JobViewSet, self).list(request, *args, **kwargs)
+
+        version = listing_version()
+        if version is None:
+            # Redis לא זמין - validator מאגרגציה זולה
+            version = Job.objects.aggregate(last=Max("updated_at"), total=Count("pk"))
+        etag = self._etag(request, "jobs-list", version)
+        if request.user.is_authenticated:
+            return conditional_get(request, compute, etag=etag)
+        return self._cached_conditional_get(request, lambda: cached_response(request, "list", compute), etag=etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        def compute():
+            return super(JobViewSet, self).retrieve(request, *args, **kwargs)
+
+        try:
+            job_id = int(kwargs[self.lookup_field])
+        except ValueError:
+            raise Http404("No Job matches the given query.")
+        version, last_modified = job_version(job_id), None
+        if version is None:
+            # אין גרסה עדיין / Redis לא זמין - validator מה-DB, ומפתח נוצר רק למשרה שקיימת
+            # user_has_applied - מחיקת מועמדות לא משנה את updated_at/applications_count
+            row = (
+                Job.objects.with_application_stats(request.user).filter(pk=job_id)
+                .values_list("updated_at", "applications_count", "user_has_applied").first()
+            )
+            if row is None:
+                return compute()  # 404
+            version = job_version(job_id, create=True)
+            if version is None:
+                version = row
+                if not request.user.is_authenticated:
+                    # לאנונימי user_has_applied תמיד False - updated_at מספיק ל-If-Modified-Since
+                    last_modified = row[0]
+        etag = self._etag(request, "job", job_id, version)
+        if request.user.is_authenticated:
+            return conditional_get(request, compute, etag=etag, last_modified=last_modified)
+        return self._cached_conditional_get(
+            request, lambda: cached_response(request, "detail", compute, job_id=job_id),
+            etag=etag, last_modified=last_modified,
+        )
+
+    @staticmethod
+    def _cached_conditional_get(request, compute, **validators):
+        response = conditional_get(request, compute, **validators)
+        if response.get("X-Cache") == "STALE":
+            # ה-validators נבנו מהגרסה הנוכחית, אבל הגוף מגרסה קודמת - בלי ETag/Last-Modified,
+            # אחרת הלקוח יקבל 304 על נתונים ישנים עד העלאת הגרסה הבאה
+            del response["ETag"]
+            if "Last-Modified" in response:
+                del response["Last-Modified"]
+        return response
+
+    @staticmethod
+    def _etag(request, *validators):
+        # השדות can_apply/user_has_applied תלויים במשתמש - לכן user.pk חלק מה-ETag
+        params = sorted(request.query_params.lists())
+        return make_etag(*validators, request.user.pk, request.accepted_renderer.format, params)
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "search"]:
             return [permissions.AllowAny()]
         if self.action in ["create"]:
             # משתמש מחובר וגם מגייס
             return [permissions.IsAuthenticated(), IsRecruiter()]
+        if self.action in ["bulk", "bulk_close", "bulk_reopen"]:
+            # בעלות נבדקת ב-jobs/bulk.py לכל ה-batch יחד
+            return [permissions.IsAuthenticated(), IsRecruiter()]
         if self.action in ["update", "partial_update", "destroy"]:
             # מחובר, מגייס, וגם בעל המשרה (בדיקת אובייקט)
             return [permissions.IsAuthenticated(), IsRecruiter(), IsJobOwner()]
@@ -42,6 +141,54 @@ class JobViewSet(viewsets.ModelViewSet):
 
     # ב-update/destroy בדיקת בעלות תתבצע ע״י IsJobOwner.has_object_permission
 
+    @decorators.action(detail=False, methods=["get"], pagination_class=PageNumberPagination)
+    def search(self, request):
+        """
+        GET /api/jobs/search/?q=...&status=&difficulty=&deadline_before=&deadline_after=
+        תוצאות מדורגות לפי רלוונטיות (עימוד לפי עמודים - דירוג לא מתאים ל-cursor).
+        """
+        params = JobSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        filters = dict(params.validated_data)
+        text = filters.pop("q")
+
+        qs = apply_job_filters(self.get_queryset(), filters)
+        qs = search_jobs(qs, text, connection)
+
+        page = self.paginate_queryset(qs)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @decorators.action(detail=False, methods=["post", "patch"])
+    def bulk(self, request):
+        """
+        POST  /api/jobs/bulk/ - רשימת משרות ליצירה.
+        PATCH /api/jobs/bulk/ - רשימת {"id": ..., <שדות>} לעדכון חלקי.
+        הכול או כלום; התשובה: {"results": [...]} - תוצאה/שגיאות לכל פריט.
+        """
+        context = self.get_serializer_context()
+        if request.method == "POST":
+            status_code, results = bulk_create_jobs(request.data, context)
+        else:
+            status_code, results = bulk_update_jobs(request.data, context)
+        return Response({"results": results}, status=status_code)
+
+    @decorators.action(detail=False, methods=["post"], url_path="bulk/close")
+    def bulk_close(self, request):
+        """POST /api/jobs/bulk/close/ {"ids": [...]}"""
+        return self._bulk_status(request, "closed")
+
+    @decorators.action(detail=False, methods=["post"], url_path="bulk/reopen")
+    def bulk_reopen(self, request):
+        """POST /api/jobs/bulk/reopen/ {"ids": [...]}"""
+        return self._bulk_status(request, "open")
+
+    def _bulk_status(self, request, new_status):
+        params = JobBulkIdsSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        status_code, results = bulk_set_status(params.validated_data["ids"], new_status, request.user)
+        return Response({"results": results}, status=status_code)
+
 
 class ApplicationViewSet(viewsets.ModelViewSet):
     """
@@ -50,8 +197,10 @@ class ApplicationViewSet(viewsets.ModelViewSet):
     - list/retrieve/update/destroy: מחייב התחברות.
       * SEEKER רואה/מנהל רק את ההגשות שלו.
       * RECRUITER רואה את ההגשות למשרות שהוא פרסם.
+    - sync: deltas מאז token (config/sync.py) - שינויים + ids שנמחקו.
     """
     serializer_class = ApplicationSerializer
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         user = self.request.user
@@ -82,3 +231,17 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         if self.request.user.role != Roles.SEEKER:
             raise PermissionDenied("רק מחפש עבודה יכול להגיש מועמדות.")
         serializer.save(applicant=self.request.user)
+
+    @decorators.action(detail=False, methods=["get"])
+    def sync(self, request):
+        """GET /api/applications/sync/?since=<token>"""
+        user = request.user
+        if user.role == Roles.SEEKER:
+            tombstones = ApplicationTombstone.objects.filter(applicant=user)
+        elif user.role == Roles.RECRUITER:
+            tombstones = ApplicationTombstone.objects.filter(recruiter=user)
+        else:
+            tombstones = ApplicationTombstone.objects.none()
+        return Response(sync_delta(
+            request, self.get_queryset(), tombstones, self.get_serializer_class(), self.get_serializer_context()
+        ))
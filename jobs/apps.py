@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import post_migrate
+
+
+def _repair_search_index(sender, using, **kwargs):
+    # SQLite בונה את jobs_job מחדש במיגרציות מסוימות ומוחק את ה-triggers של FTS5
+    connection = connections[using]
+    if connection.vendor == "sqlite" and "jobs_job" in connection.introspection.table_names():
+        from .search import install_search_index
+        install_search_index(connection)
 
 
 class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs'
+
+    def ready(self):
+        from config.sync import repair_sync_seq
+        from . import signals  # noqa
+        post_migrate.connect(_repair_search_index, sender=self)
+        post_migrate.connect(repair_sync_seq, sender=self)
@@ -0,0 +1,135 @@
+# jobs/bulk.py
+"""
+פעולות bulk על משרות (מגייסים שמפרסמים מ-ATS):
+יצירה, עדכון חלקי ושינוי סטטוס (סגירה/פתיחה מחדש) של כמה משרות בבקשה אחת.
+
+- ולידציה של כל הפריטים במעבר אחד; אם פריט אחד נכשל - שום דבר לא נכתב.
+- בדיקת בעלות בשאילתה אחת לכל ה-batch (במקום IsJobOwner לכל אובייקט).
+- הכתיבה ב-bulk_create/bulk_update/UPDATE אחד בתוך טרנזקציה אחת.
+- מסלולי bulk לא שולחים post_save - ה-cache מתעדכן כאן (invalidate_jobs).
+
+כל פונקציה מחזירה (status_code, results) - results הוא רשימה של תוצאה לכל פריט.
+"""
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+
+from .cache import invalidate_jobs
+from .models import Job
+from .permissions import IsJobOwner
+from .serializers import BULK_MAX_ITEMS, JobBulkSerializer
+
+
+def _item_errors(errors):
+    """שגיאות ListSerializer (רשימה מקבילה לקלט) -> רק הפריטים שנכשלו, עם האינדקס"""
+    if isinstance(errors, dict):  # הקלט עצמו לא תקין (לא רשימה, ריק, ארוך מדי)
+        return [{"index": None, "errors": errors}]
+    return [{"index": index, "errors": error} for index, error in enumerate(errors) if error]
+
+
+def _check_ownership(user, ids, jobs):
+    """
+    jobs - {id: Job} מתוך שאילתה אחת. מחזיר (status_code, errors) - ריק אם הכול בסדר.
+    משרה שלא קיימת -> 404; משרה של מגייס אחר -> 403 (כמו IsJobOwner).
+    """
+    is_admin = IsJobOwner._is_admin(user)
+    missing, forbidden = [], []
+    for index, job_id in enumerate(ids):
+        job = jobs.get(job_id)
+        if job is None:
+            missing.append({"index": index, "id": job_id, "errors": {"detail": "משרה לא נמצאה."}})
+        elif job.posted_by_id != user.pk and not is_admin:
+            forbidden.append({"index": index, "id": job_id, "errors": {"detail": "אין הרשאה לנהל משרה זו."}})
+    if forbidden:
+        return status.HTTP_403_FORBIDDEN, forbidden + missing
+    if missing:
+        return status.HTTP_404_NOT_FOUND, missing
+    return None, []
+
+
+def bulk_create_jobs(items, context):
+    user = context["request"].user
+    serializer = JobBulkSerializer(data=items, many=True, context=context, max_length=BULK_MAX_ITEMS)
+    if not serializer.is_valid():
+        return status.HTTP_400_BAD_REQUEST, _item_errors(serializer.errors)
+
+    jobs = [Job(posted_by=user, **attrs) for attrs in serializer.validated_data]
+    with transaction.atomic():
+        Job.objects.bulk_create(jobs)
+        invalidate_jobs(job.pk for job in jobs)
+    return status.HTTP_201_CREATED, [
+        {"index": index, "id": job.pk, "result": "created"} for index, job in enumerate(jobs)
+    ]
+
+
+def bulk_update_jobs(items, context):
+    """items - רשימת dict-ים, בכל אחד id + השדות לעדכון (כמו PATCH על משרה בודדת)"""
+    if not isinstance(items, list) or not items or len(items) > BULK_MAX_ITEMS:
+        return status.HTTP_400_BAD_REQUEST, _item_errors(
+            {"non_field_errors": [f"צריך לשלוח רשימה של 1-{BULK_MAX_ITEMS} משרות."]}
+        )
+    ids = [item.get("id") if isinstance(item, dict) else None for item in items]
+    id_errors = [
+        {"index": index, "errors": {"id": ["מזהה משרה חסר או לא תקין."]}}
+        for index, job_id in enumerate(ids)
+        if type(job_id) is not int
+    ]
+    if not id_errors and len(set(ids)) != len(ids):
+        id_errors = [{"index": None, "errors": {"id": ["אותה משרה מופיעה יותר מפעם אחת."]}}]
+    if id_errors:
+        return status.HTTP_400_BAD_REQUEST, id_errors
+
+    user = context["request"].user
+    with transaction.atomic():
+        jobs = Job.objects.select_for_update().in_bulk(ids)
+        status_code, errors = _check_ownership(user, ids, jobs)
+        if errors:
+            return status_code, errors
+
+        item_serializers = [
+            JobBulkSerializer(jobs[job_id], data=item, partial=True, context=context)
+            for job_id, item in zip(ids, items)
+        ]
+        errors = [
+            {"index": index, "id": job_id, "errors": serializer.errors}
+            for index, (job_id, serializer) in enumerate(zip(ids, item_serializers))
+            if not serializer.is_valid()
+        ]
+        if errors:
+            return status.HTTP_400_BAD_REQUEST, errors
+
+        # bulk_update לא מפעיל auto_now - updated_at מתעדכן ידנית (ETag/Last-Modified)
+        now, fields = timezone.now(), {"updated_at"}
+        for serializer in item_serializers:
+            for attr, value in serializer.validated_data.items():
+                setattr(serializer.instance, attr, value)
+                fields.add(attr)
+            serializer.instance.updated_at = now
+        Job.objects.bulk_update([s.instance for s in item_serializers], sorted(fields))
+        invalidate_jobs(ids)
+    return status.HTTP_200_OK, [
+        {"index": index, "id": job_id, "result": "updated"} for index, job_id in enumerate(ids)
+    ]
+
+
+def bulk_set_status(ids, new_status, user):
+    """
+    סגירה/פתיחה מחדש (או פרסום טיוטה) לפי Job.STATUS_TRANSITIONS - UPDATE אחד לכל ה-batch.
+    משרה שכבר בסטטוס היעד (או שאי אפשר להעביר אותה) מדווחת כ-unchanged.
+    """
+    with transaction.atomic():
+        jobs = Job.objects.select_for_update().only("id", "posted_by", "status").in_bulk(ids)
+        status_code, errors = _check_ownership(user, ids, jobs)
+        if errors:
+            return status_code, errors
+
+        allowed = Job.STATUS_TRANSITIONS[new_status]
+        changed = [job_id for job_id in ids if jobs[job_id].status in allowed]
+        if changed:
+            Job.objects.filter(pk__in=changed).update(status=new_status, updated_at=timezone.now())
+            invalidate_jobs(changed)
+    changed = set(changed)
+    return status.HTTP_200_OK, [
+        {"index": index, "id": job_id, "result": new_status if job_id in changed else "unchanged"}
+        for index, job_id in enumerate(ids)
+    ]
@@ -0,0 +1,163 @@
+# jobs/cache.py
+"""
+Cache תשובות למשתמשים אנונימיים ב-/api/jobs/ (list + retrieve).
+
+- המפתח כולל מספר גרסה: jobs:v:list לרשימות ו-jobs:v:job:<id> לכל משרה.
+  כל שינוי במשרה/מועמדות מעלה את הגרסה (אחרי commit) - ערך ישן לא יוגש לעולם
+  תחת הגרסה החדשה.
+- גרסת משרה נוצרת רק אחרי שה-retrieve וידא שהמשרה קיימת, ועם TTL
+  (JOBS_VERSION_TTL) - id שרירותי ב-URL לא משאיר מפתחות. העלאת גרסה לא יוצרת
+  מפתח חסר: בלי מפתח אין גם תשובות שמורות תחתיו.
+- הגנת stampede: רק בקשה אחת מחשבת מחדש (lock דרך cache.add); השאר מקבלות
+  את הערך האחרון שחושב (stale) אם קיים.
+- אם Redis לא זמין - הבקשה עוברת ישירות ל-DB, בלי שגיאה.
+"""
+import hashlib
+import logging
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+LIST_VERSION_KEY = "jobs:v:list"
+LOCK_TIMEOUT = 10
+STALE_TTL_FACTOR = 10  # ערך stale חי יותר מהערך הטרי, כדי שיהיה מה להגיש בזמן חישוב
+_UNAVAILABLE = object()
+STATS_KEYS = {"hit": "jobs:stats:hit", "miss": "jobs:stats:miss", "stale": "jobs:stats:stale"}
+
+
+def _job_version_key(job_id):
+    return f"jobs:v:job:{job_id}"
+
+
+def _ttl():
+    return getattr(settings, "JOBS_RESPONSE_CACHE_TTL", 300)
+
+
+def _version_ttl():
+    return getattr(settings, "JOBS_VERSION_TTL", 24 * 3600)
+
+
+def _safe(fn, *args, default=None, **kwargs):
+    """כל פעולת cache עוברת כאן - כשל ב-Redis לא מפיל את הבקשה"""
+    try:
+        return fn(*args, **kwargs)
+    except Exception as exc:  # redis.ConnectionError, TimeoutError וכו'
+        logger.warning("jobs cache unavailable: %s", exc)
+        return default
+
+
+def _incr(key):
+    if not cache.add(key, 1, timeout=None):
+        cache.incr(key)
+
+
+def _incr_existing(key):
+    try:
+        cache.incr(key)  # INCR שומר על ה-TTL
+    except ValueError:
+        pass  # אין מפתח - אין תשובות שמורות תחתיו
+
+
+def _bump(job_keys):
+    _safe(_incr, LIST_VERSION_KEY)
+    for key in job_keys:
+        _safe(_incr_existing, key)
+
+
+def invalidate_jobs(job_ids=()):
+    """
+    מעלה את גרסת הרשימות ואת הגרסאות של המשרות הנתונות.
+    מתבצע ב-on_commit כדי שבקשה מקבילה לא תשמור נתונים ישנים תחת הגרסה החדשה.
+    """
+    job_keys = [_job_version_key(job_id) for job_id in set(job_ids)]
+    transaction.on_commit(lambda: _bump(job_keys))
+
+
+def _get_version(version_key, create=True, timeout=None):
+    """
+    הגרסה הנוכחית של מפתח, או None אם Redis לא זמין (או שהמפתח חסר ו-create=False).
+    גרסה חסרה (חדשה / נמחקה ב-eviction / פגה) מאותחלת לפי הזמן ולא ל-1 - כך שלא
+    חוזרים לגרסה שכבר שימשה ולא מגישים ערך (או ETag) ישן.
+    """
+    version = _safe(cache.get, version_key, default=_UNAVAILABLE)
+    if version is _UNAVAILABLE:
+        return None
+    if version is None and create:
+        initial = time.time_ns() // 1000
+        if _safe(cache.add, version_key, initial, timeout=timeout):
+            return initial
+        version = _safe(cache.get, version_key)
+    return version
+
+
+def listing_version():
+    """גרסת הרשימות (משמשת גם כ-validator ל-ETag של /api/jobs/); None אם Redis לא זמין"""
+    return _get_version(LIST_VERSION_KEY)
+
+
+def job_version(job_id, create=False):
+    """
+    גרסת משרה בודדת; None אם Redis לא זמין או שאין עדיין גרסה.
+    create=True - רק אחרי שווידאנו שהמשרה קיימת.
+    """
+    return _get_version(_job_version_key(job_id), create=create, timeout=_version_ttl())
+
+
+def cache_stats():
+    values = _safe(cache.get_many, list(STATS_KEYS.values()), default={}) or {}
+    return {name: values.get(key, 0) for name, key in STATS_KEYS.items()}
+
+
+def _response_key(request, kind):
+    params = sorted((k, v) for k, values in request.query_params.lists() for v in values)
+    raw = f"{request.get_host()}|{request.path}|{request.accepted_renderer.format}|{urlencode(params)}"
+    return f"jobs:resp:{kind}:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def cached_response(request, kind, compute, job_id=None):
+    """
+    מחזיר Response מה-cache או מחשב (compute) ושומר.
+    kind: "list" / "detail"; ל-detail מעבירים job_id (הגרסה שלו כבר נוצרה ב-retrieve).
+    """
+    version = listing_version() if job_id is None else job_version(job_id)
+    if version is None:
+        return compute()  # Redis לא זמין - ישר ל-DB
+
+    base_key = _response_key(request, kind)
+    fresh_key, stale_key, lock_key = f"{base_key}:{version}", f"{base_key}:stale", f"{base_key}:lock"
+
+    cached = _safe(cache.get_many, [fresh_key, stale_key], default={}) or {}
+    if fresh_key in cached:
+        return _from_cache(cached[fresh_key], "HIT")
+
+    have_lock = _safe(cache.add, lock_key, 1, timeout=LOCK_TIMEOUT, default=False)
+    if not have_lock and stale_key in cached:
+        # מישהו אחר כבר מחשב - מגישים את הערך האחרון שחושב
+        return _from_cache(cached[stale_key], "STALE")
+
+    try:
+        response = compute()
+        if response.status_code == 200:
+            payload = (response.status_code, response.data)
+            _safe(cache.set, fresh_key, payload, timeout=_ttl())
+            _safe(cache.set, stale_key, payload, timeout=_ttl() * STALE_TTL_FACTOR)
+    finally:
+        if have_lock:
+            _safe(cache.delete, lock_key)
+    _safe(_incr, STATS_KEYS["miss"])
+    response["X-Cache"] = "MISS"
+    return response
+
+
+def _from_cache(payload, state):
+    _safe(_incr, STATS_KEYS["hit" if state == "HIT" else "stale"])
+    status_code, data = payload
+    response = Response(data, status=status_code)
+    response["X-Cache"] = state
+    return response
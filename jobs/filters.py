@@ -0,0 +1,30 @@
+# jobs/filters.py
+from django.db.models import F
+
+
+def apply_job_filters(queryset, params):
+    """
+    מחיל פילטרים על queryset של Job.
+    params - validated_data של JobFilterSerializer (מפתחות חסרים / None מתעלמים).
+    האינדקסים שתומכים בצירופים מוגדרים ב-Job.Meta.indexes.
+    """
+    params = {key: value for key, value in params.items() if value is not None}
+    if "status" in params:
+        queryset = queryset.filter(status=params["status"])
+    if "difficulty" in params:
+        queryset = queryset.filter(difficulty=params["difficulty"])
+    if "deadline_before" in params:
+        queryset = queryset.filter(deadline__lte=params["deadline_before"])
+    if "deadline_after" in params:
+        queryset = queryset.filter(deadline__gte=params["deadline_after"])
+    if "posted_by" in params:
+        queryset = queryset.filter(posted_by_id=params["posted_by"])
+    if "created_after" in params:
+        queryset = queryset.filter(created_at__gte=params["created_after"])
+    if "created_before" in params:
+        queryset = queryset.filter(created_at__lte=params["created_before"])
+    if params.get("has_free_slots") is True:
+        queryset = queryset.filter(applications_count__lt=F("max_applicants"))
+    elif params.get("has_free_slots") is False:
+        queryset = queryset.filter(applications_count__gte=F("max_applicants"))
+    return queryset
@@ -0,0 +1,53 @@
+# jobs/management/commands/_bench.py
+"""עזרים משותפים לפקודות ה-bench_* (זריעת נתונים ומדידה)."""
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+
+from accounts.models import Roles
+from jobs.models import Job
+
+User = get_user_model()
+
+BENCH_EMAIL = "bench-recruiter@example.com"
+
+
+def bench_recruiter():
+    user, _ = User.objects.get_or_create(
+        email=BENCH_EMAIL, defaults={"username": BENCH_EMAIL, "role": Roles.RECRUITER}
+    )
+    return user
+
+
+def seed_jobs(rows, make_job_kwargs=None, stdout=None, batch=10_000):
+    """משלים את טבלת המשרות ל-rows שורות ב-bulk_create (לא זורע מחדש אם כבר יש)."""
+    recruiter = bench_recruiter()
+    make_job_kwargs = make_job_kwargs or (lambda i: {
+        "title": f"Bench job {i}",
+        "description": "Seeded row for benchmarks.",
+    })
+    existing = Job.objects.count()
+    missing = rows - existing
+    while missing > 0:
+        size = min(batch, missing)
+        Job.objects.bulk_create(
+            Job(posted_by=recruiter, status="open", **make_job_kwargs(existing + i))
+            for i in range(size)
+        )
+        existing += size
+        missing -= size
+        if stdout:
+            stdout.write(f"seeded {existing}/{rows}", ending="\r")
+    if stdout:
+        stdout.write("")
+    return recruiter
+
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
@@ -0,0 +1,89 @@
+# jobs/management/commands/bench_apply.py
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections
+
+from accounts.models import Roles
+from jobs.models import Application, ApplyError, Job
+from ._bench import bench_recruiter
+
+User = get_user_model()
+
+RETRIES = 50
+
+
+def _bench_seekers(count):
+    emails = [f"bench-seeker-{i}@example.com" for i in range(count)]
+    existing = set(User.objects.filter(email__in=emails).values_list("email", flat=True))
+    missing = []
+    for email in emails:
+        if email not in existing:
+            user = User(email=email, username=email, role=Roles.SEEKER)
+            user.set_unusable_password()
+            missing.append(user)
+    User.objects.bulk_create(missing)
+    return list(User.objects.filter(email__in=emails).order_by("pk"))
+
+
+class Command(BaseCommand):
+    help = (
+        "הגשות מקבילות (thread לכל מחפש) למשרה אחת עם max_applicants דרך Application.objects.apply: "
+        "מודד applies/sec ומוודא שאין חריגה מהמכסה."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seekers", type=int, default=200, help="כמה הגשות מקבילות")
+        parser.add_argument("--max-applicants", type=int, default=50)
+
+    def handle(self, *args, seekers, max_applicants, **options):
+        seekers = _bench_seekers(seekers)
+        # משרה חדשה בכל הרצה - אותם מחפשים יכולים להגיש שוב
+        job = Job.objects.create(
+            posted_by=bench_recruiter(), title="Bench apply", description="Concurrent applies.",
+            status="open", max_applicants=max_applicants,
+        )
+
+        outcomes = []
+        retries = []
+        barrier = threading.Barrier(len(seekers))
+
+        def worker(seeker):
+            barrier.wait()
+            try:
+                for _ in range(RETRIES):
+                    try:
+                        Application.objects.apply(job, seeker)
+                        outcomes.append("ok")
+                        return
+                    except ApplyError:
+                        outcomes.append("rejected")
+                        return
+                    except OperationalError:
+                        retries.append(1)
+                        time.sleep(0.01)  # SQLite: "database is locked" - ננסה שוב
+                outcomes.append("gave up")
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(seeker,)) for seeker in seekers]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+
+        job.refresh_from_db()
+        self.stdout.write(
+            f"applies:      {len(outcomes)} (ok: {outcomes.count('ok')}, rejected: {outcomes.count('rejected')}, "
+            f"gave up: {outcomes.count('gave up')}, retries: {len(retries)})"
+        )
+        self.stdout.write(f"elapsed:      {elapsed:.3f} s")
+        self.stdout.write(f"throughput:   {len(outcomes) / elapsed:.0f} applies/sec")
+        self.stdout.write(
+            f"applications: {Application.objects.filter(job=job).count()} / {max_applicants} "
+            f"(applications_count: {job.applications_count}, status: {job.status})"
+        )
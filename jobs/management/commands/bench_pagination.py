@@ -0,0 +1,47 @@
+# jobs/management/commands/bench_pagination.py
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management.base import BaseCommand
+from rest_framework.pagination import Cursor
+from rest_framework.test import APIRequestFactory
+
+from config.pagination import KeysetPagination
+from jobs.api import JobViewSet
+from jobs.models import Job
+from ._bench import median_ms, seed_jobs
+
+
+class Command(BaseCommand):
+    help = "משווה latency של /api/jobs/ בעמוד 1 מול עמוד עמוק: cursor מול page=N."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000, help="כמה משרות לזרוע (אם חסרות)")
+        parser.add_argument("--page", type=int, default=10_000, help="העמוד העמוק למדידה")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, rows, page, repeat, **options):
+        seed_jobs(rows, stdout=self.stdout)
+        view = JobViewSet.as_view({"get": "list"})
+        factory = APIRequestFactory(SERVER_NAME="localhost")
+
+        def measure(params):
+            return median_ms(lambda: view(factory.get("/api/jobs/", params)).render(), repeat)
+
+        deep_cursor = self._cursor_for_offset((page - 1) * KeysetPagination.page_size)
+        results = [
+            ("cursor page 1", measure({})),
+            (f"cursor page {page}", measure({"cursor": deep_cursor})),
+            ("page=1", measure({"page": 1})),
+            (f"page={page}", measure({"page": page})),
+        ]
+        for label, ms in results:
+            self.stdout.write(f"{label:<24} {ms:8.2f} ms")
+
+    @staticmethod
+    def _cursor_for_offset(offset):
+        """בונה cursor שמצביע לשורה ה-offset (מחוץ למדידה - כמו לקוח שכבר גלל לשם)"""
+        row = Job.objects.order_by("-created_at", "-id").values_list("created_at", "id")[offset]
+        paginator = KeysetPagination()
+        paginator.base_url = "/api/jobs/"
+        url = paginator.encode_cursor(Cursor(offset=0, reverse=False, position=paginator.encode_position(row)))
+        return parse_qs(urlparse(url).query)[paginator.cursor_query_param][0]
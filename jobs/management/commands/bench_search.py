@@ -0,0 +1,42 @@
+# jobs/management/commands/bench_search.py
+import random
+
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory
+
+from jobs.api import JobViewSet
+from ._bench import median_ms, seed_jobs
+
+WORDS = (
+    "python django react postgres docker kubernetes backend frontend fullstack data "
+    "analyst qa automation devops cloud aws junior student intern mobile android ios "
+    "מפתח מפתחת פייתון צוות סטודנט משרה חלקית בדיקות אוטומציה ענן נתונים מערכות "
+    "ניסיון דרוש דרושה תמיכה טכנית אבטחת מידע"
+).split()
+
+QUERIES = ["python", "django developer", "פייתון", "סטודנט python", "kubernetes cloud", "react native"]
+
+
+class Command(BaseCommand):
+    help = "מודד latency של /api/jobs/search/ על קורפוס גדול (ברירת מחדל 500k משרות)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, rows, repeat, seed, **options):
+        rnd = random.Random(seed)
+        seed_jobs(rows, lambda i: {
+            "title": " ".join(rnd.choices(WORDS, k=4)),
+            "description": " ".join(rnd.choices(WORDS, k=40)),
+            "difficulty": rnd.choice(["easy", "medium", "hard"]),
+        }, stdout=self.stdout)
+
+        view = JobViewSet.as_view({"get": "search"})
+        factory = APIRequestFactory(SERVER_NAME="localhost")
+        for q in QUERIES:
+            for extra in ({}, {"difficulty": "easy"}):
+                params = {"q": q, **extra}
+                ms = median_ms(lambda: view(factory.get("/api/jobs/search/", params)).render(), repeat)
+                self.stdout.write(f"{str(params):<50} {ms:8.2f} ms")
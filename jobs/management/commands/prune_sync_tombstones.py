@@ -0,0 +1,15 @@
+# jobs/management/commands/prune_sync_tombstones.py
+from django.core.management.base import BaseCommand
+
+from config.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = "מוחק tombstones של סנכרון (SYNC_TOMBSTONE_MODELS) ישנים מ-SYNC_TOMBSTONE_DAYS, ב-batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, batch_size, **options):
+        for label, removed in prune_tombstones(batch_size).items():
+            self.stdout.write(f"{label}: removed {removed} tombstone(s)")
@@ -0,0 +1,38 @@
+# jobs/management/commands/reconcile_applications_count.py
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, Q
+
+from jobs.cache import invalidate_jobs
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = "מאתר ומתקן סטיות ב-Job.applications_count מול טבלת המועמדויות."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="רק לדווח, בלי לתקן")
+
+    def handle(self, *args, batch_size, dry_run, **options):
+        drifted_total = 0
+        last_id = 0
+        while True:
+            ids = list(
+                Job.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+            drifted = list(
+                Job.objects.filter(pk__in=ids)
+                .annotate(actual=Count("applications", filter=~Q(applications__status="withdrawn")))
+                .exclude(applications_count=F("actual"))
+                .values_list("pk", flat=True)
+            )
+            if drifted and not dry_run:
+                Job.objects.refresh_applications_count(drifted)
+                invalidate_jobs(drifted)
+            drifted_total += len(drifted)
+
+        verb = "found" if dry_run else "fixed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {drifted_total} job(s) with a drifted applications_count"))
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from jobs.search import install_search_index, uninstall_search_index
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_alter_application_options_alter_job_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
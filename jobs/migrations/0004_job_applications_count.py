@@ -0,0 +1,35 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:17
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_applications_count(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    Application = apps.get_model('jobs', 'Application')
+    counted = (
+        Application.objects.exclude(status='withdrawn')
+        .filter(job=OuterRef('pk'))
+        .order_by()
+        .values('job')
+        .annotate(c=Count('pk'))
+        .values('c')
+    )
+    Job.objects.update(applications_count=Coalesce(Subquery(counted), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_job_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='applications_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='מונה מנורמל (ללא מועמדויות שנמשכו) - מתוחזק אוטומטית', verbose_name='מספר מועמדויות'),
+        ),
+        migrations.RunPython(backfill_applications_count, migrations.RunPython.noop),
+    ]
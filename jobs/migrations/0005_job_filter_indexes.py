@@ -0,0 +1,35 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_job_applications_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_status_7d017a_idx',
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'deadline'], name='jobs_job_status_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['posted_by', '-created_at', '-id'], name='jobs_job_poster_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['difficulty', '-created_at', '-id'], name='jobs_job_diff_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['-created_at', '-id'], name='jobs_job_open_recent_idx'),
+        ),
+    ]
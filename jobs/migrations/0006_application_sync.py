@@ -0,0 +1,62 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    # שורות קיימות לא "השתנו" - updated_at = created_at
+    apps.get_model('jobs', 'Application').objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_job_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='עודכן ב'),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applicant', 'updated_at', 'id'], name='jobs_app_applicant_sync_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'updated_at', 'id'], name='jobs_app_job_sync_idx'),
+        ),
+        migrations.AddField(
+            model_name='applicationtombstone',
+            name='applicant',
+            field=models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='applicationtombstone',
+            name='recruiter',
+            field=models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='applicationtombstone',
+            index=models.Index(fields=['applicant', 'deleted_at', 'id'], name='jobs_app_tomb_applicant_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationtombstone',
+            index=models.Index(fields=['recruiter', 'deleted_at', 'id'], name='jobs_app_tomb_recruiter_idx'),
+        ),
+    ]
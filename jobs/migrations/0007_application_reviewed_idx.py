@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_application_sync'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'reviewed_at'], name='jobs_app_job_reviewed_idx'),
+        ),
+    ]
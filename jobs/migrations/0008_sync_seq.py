@@ -0,0 +1,71 @@
+# Generated by Django 5.1.2 on 2026-10-18 17:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+from config.sync import install_sync_seq, uninstall_sync_seq
+
+# שורות קיימות נשארות עם sync_seq=0 - tokens לפי updated_at מקבלים 410 (סנכרון מלא) בכל מקרה
+TABLES = ['jobs_application', 'jobs_applicationtombstone']
+
+
+def install(apps, schema_editor):
+    install_sync_seq(schema_editor.connection, TABLES)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_sync_seq(schema_editor.connection, TABLES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_application_reviewed_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='application',
+            name='jobs_app_applicant_sync_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='application',
+            name='jobs_app_job_sync_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='applicationtombstone',
+            name='jobs_app_tomb_applicant_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='applicationtombstone',
+            name='jobs_app_tomb_recruiter_idx',
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='sync_seq',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='applicationtombstone',
+            name='sync_seq',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['applicant', 'sync_seq', 'id'], name='jobs_app_applicant_sync_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'sync_seq', 'id'], name='jobs_app_job_sync_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationtombstone',
+            index=models.Index(fields=['applicant', 'sync_seq', 'id'], name='jobs_app_tomb_applicant_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationtombstone',
+            index=models.Index(fields=['recruiter', 'sync_seq', 'id'], name='jobs_app_tomb_recruiter_idx'),
+        ),
+        migrations.RunPython(install, uninstall),
+    ]
@@ -1,9 +1,29 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, Count, Exists, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.core.validators import MinLengthValidator
+from django.dispatch import Signal
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 
+from config.tracking import FieldTrackerMixin
+from .cache import invalidate_jobs
+
+
+class ApplyError(Exception):
+    """לא ניתן להגיש מועמדות (נזרק מ-Application.objects.apply)"""
+    message = _("לא ניתן להגיש מועמדות למשרה זו.")
+
+
+class JobUnavailable(ApplyError):
+    message = _("המשרה אינה פתוחה להגשות (סגורה, פגה או מלאה).")
+
+
+class AlreadyApplied(ApplyError):
+    message = _("כבר הגשת מועמדות למשרה זו.")
+
+
 class JobManager(models.Manager):
     """Custom manager למשרות"""
     
@@ -23,9 +43,71 @@ class JobManager(models.Manager):
         """משרות שאפשר להגיש אליהן"""
         return self.active()
 
+    def with_application_stats(self, user=None):
+        """
+        משרות עם דגל "המשתמש כבר הגיש" כ-annotation (Exists אחד לכל העמוד),
+        כך שרשימה שלמה נטענת בשאילתה אחת (בלי N+1 בסריאלייזר).
+        ספירת המועמדויות כבר שמורה בעמודה applications_count.
+        """
+        if user is not None and user.is_authenticated:
+            has_applied = Exists(
+                Application.objects.filter(job=OuterRef("pk"), applicant=user)
+            )
+        else:
+            has_applied = Value(False)
+        return self.annotate(user_has_applied=has_applied)
+
+    def refresh_applications_count(self, job_ids=None):
+        """
+        מחשב מחדש את applications_count מתוך טבלת המועמדויות (UPDATE אחד).
+        job_ids=None - לכל המשרות. מחזיר מספר שורות שעודכנו.
+        """
+        counted = (
+            Application.objects.counted()
+            .filter(job=OuterRef("pk"))
+            .order_by()
+            .values("job")
+            .annotate(c=Count("pk"))
+            .values("c")
+        )
+        qs = self.all() if job_ids is None else self.filter(pk__in=job_ids)
+        return qs.update(applications_count=Coalesce(Subquery(counted), 0), updated_at=timezone.now())
 
-class Job(models.Model):
+    def claim_slot(self, job_id):
+        """
+        תופס מקום במשרה ב-UPDATE מותנה אחד: מצליח רק אם המשרה פתוחה, לא פגה
+        ויש מקום. הנעילה על השורה מסדרת הגשות מקבילות, והמשרה עוברת ל-filled
+        באותו UPDATE כשהמקום האחרון נתפס. מחזיר True אם נתפס מקום.
+        """
+        now = timezone.now()
+        claimed = (
+            self.filter(pk=job_id, status='open', applications_count__lt=F('max_applicants'))
+            .exclude(deadline__lt=now)
+            .update(
+                applications_count=F('applications_count') + 1,
+                status=Case(
+                    When(applications_count__gte=F('max_applicants') - 1, then=Value('filled')),
+                    default=F('status'),
+                ),
+                updated_at=now,
+            )
+        )
+        return bool(claimed)
+
+    def bump_applications_count(self, job_id, delta):
+        """עדכון אטומי של המונה (F expression - בלי read-modify-write)"""
+        qs = self.filter(pk=job_id)
+        if delta < 0:
+            # לא יורדים מתחת ל-0 גם אם המונה סטה (CHECK של PositiveIntegerField)
+            qs = qs.filter(applications_count__gte=-delta)
+        # updated_at מתעדכן גם כן - המונה הוא חלק מהייצוג של המשרה (ETag/Last-Modified)
+        return qs.update(applications_count=F("applications_count") + delta, updated_at=timezone.now())
+
+
+class Job(FieldTrackerMixin, models.Model):
     """משרה/משימה שמפורסמת על ידי מגייס"""
+
+    tracked_fields = ("status", "deadline", "max_applicants")
     
     # Choices
     STATUS_CHOICES = [
@@ -34,6 +116,14 @@ class Job(models.Model):
         ('closed', _('סגור')),
         ('filled', _('אויש')),
     ]
+    # מעברי סטטוס מותרים (API ו-bulk): יעד -> סטטוסים שמהם אפשר להגיע אליו.
+    # draft -> open הוא פרסום; filled נקבע רק ע"י claim_slot
+    STATUS_TRANSITIONS = {
+        'open': ('draft', 'closed'),
+        'closed': ('open', 'filled'),
+    }
+    # מה שלקוח יכול לשלוח ב-status
+    WRITABLE_STATUSES = ('draft', 'open', 'closed')
     
     DIFFICULTY_CHOICES = [
         ('easy', _('קל')),
@@ -80,6 +170,12 @@ class Job(models.Model):
         default=10,
         help_text=_("כמה מועמדים מקסימום יכולים להגיש מועמדות")
     )
+    applications_count = models.PositiveIntegerField(
+        _("מספר מועמדויות"),
+        default=0,
+        editable=False,
+        help_text=_("מונה מנורמל (ללא מועמדויות שנמשכו) - מתוחזק אוטומטית"),
+    )
     
     # Timestamps
     created_at = models.DateTimeField(_("נוצר ב"), auto_now_add=True)
@@ -93,7 +189,15 @@ class Job(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=['-created_at']),
-            models.Index(fields=['status']),
+            # פילטרים ב-/api/jobs/ (jobs/filters.py) + JobManager.active()
+            models.Index(fields=['status', 'deadline'], name='jobs_job_status_deadline_idx'),
+            models.Index(fields=['posted_by', '-created_at', '-id'], name='jobs_job_poster_recent_idx'),
+            models.Index(fields=['difficulty', '-created_at', '-id'], name='jobs_job_diff_recent_idx'),
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(status='open'),
+                name='jobs_job_open_recent_idx',
+            ),
         ]
 
     def __str__(self):
@@ -111,18 +215,85 @@ class Job(models.Model):
             return False
         if self.is_expired():
             return False
-        if self.applications.count() >= self.max_applicants:
+        if self.applications_count >= self.max_applicants:
             return False
         return True
-    
-    def applications_count(self):
-        """מספר המועמדויות למשרה"""
-        return self.applications.count()
-    applications_count.short_description = _("מספר מועמדויות")
 
 
-class Application(models.Model):
+# מסלולי bulk (bulk_create / update של status או job) - במקום post_save לכל שורה.
+# kwargs: job_ids, applicant_ids (כולל המשרה החדשה בהעברה). נשלח בתוך הטרנזקציה.
+applications_bulk_changed = Signal()
+
+
+class ApplicationQuerySet(models.QuerySet):
+    """
+    מסלולי bulk לא שולחים post_save - לכן bulk_create/update מעדכנים כאן
+    את Job.applications_count בתוך אותה טרנזקציה, ושולחים applications_bulk_changed.
+    """
+
+    def counted(self):
+        """מועמדויות שנספרות במונה של המשרה (כל מה שלא נמשך)"""
+        return self.exclude(status='withdrawn')
+
+    def apply(self, job, applicant, **fields):
+        """
+        מסלול ההגשה: תפיסת מקום (Job.objects.claim_slot) + INSERT באותה טרנזקציה.
+        כפילות נתפסת ע"י unique_together (בלי SELECT מקדים; SELECT רק אחרי כישלון, כדי לזהות
+        אותה) ומבטלת גם את תפיסת המקום.
+        """
+        application = self.model(job=job, applicant=applicant, **fields)
+        application._slot_claimed = True  # המונה כבר עודכן - ה-post_save לא יספור שוב
+        try:
+            with transaction.atomic(using=self.db):
+                if not Job.objects.claim_slot(job.pk):
+                    raise JobUnavailable()
+                application.save(force_insert=True, using=self.db)
+        except IntegrityError:
+            # רק הפרת (job, applicant) היא "כבר הגשת"; FK / NOT NULL וכו' עולות כמו שהן.
+            # הטקסט של השגיאה שונה בין מסדי נתונים - בודקים את השורה עצמה (הטרנזקציה כבר בוטלה)
+            if self.filter(job=job, applicant=applicant).exists():
+                raise AlreadyApplied()
+            raise
+        return application
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            job_ids = {obj.job_id for obj in objs}
+            Job.objects.refresh_applications_count(job_ids)
+            invalidate_jobs(job_ids)
+            applications_bulk_changed.send(
+                sender=self.model, job_ids=job_ids, applicant_ids={obj.applicant_id for obj in objs}
+            )
+        return objs
+
+    def update(self, **kwargs):
+        kwargs.setdefault("updated_at", timezone.now())  # UPDATE לא מפעיל auto_now (סנכרון)
+        if kwargs.get("status") in Application.REVIEWED_STATUSES:
+            # הבדיקה הראשונה בלבד - באותו UPDATE, בלי לדרוס reviewed_at קיים
+            kwargs.setdefault("reviewed_at", Coalesce("reviewed_at", Value(kwargs["updated_at"])))
+        if not {"status", "job", "job_id"} & kwargs.keys():
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            keys = list(self.values_list("job_id", "applicant_id"))
+            job_ids = {job_id for job_id, _ in keys}
+            rows = super().update(**kwargs)
+            new_job = kwargs.get("job_id", kwargs.get("job"))
+            if new_job is not None:
+                job_ids.add(getattr(new_job, "pk", new_job))
+            Job.objects.refresh_applications_count(job_ids)
+            invalidate_jobs(job_ids)
+            applications_bulk_changed.send(
+                sender=self.model, job_ids=job_ids, applicant_ids={applicant_id for _, applicant_id in keys}
+            )
+        return rows
+
+
+class Application(FieldTrackerMixin, models.Model):
     """מועמדות למשרה"""
+
+    # משמש את ה-signals (מונה + התראת שינוי סטטוס) - בלי SELECT לפני שמירה
+    tracked_fields = ("status", "job")
     
     STATUS_CHOICES = [
         ('pending', _('ממתין')),
@@ -130,6 +301,8 @@ class Application(models.Model):
         ('rejected', _('נדחה')),
         ('withdrawn', _('משך מועמדות')),
     ]
+    # מעבר מ-pending לאחד מאלה הוא "בדיקה" - נרשם ב-reviewed_at (פעם אחת)
+    REVIEWED_STATUSES = ('accepted', 'rejected')
     
     job = models.ForeignKey(
         Job,
@@ -158,6 +331,12 @@ class Application(models.Model):
     # Timestamps
     created_at = models.DateTimeField(_("הוגש ב"), auto_now_add=True)
     reviewed_at = models.DateTimeField(_("נבדק ב"), null=True, blank=True)
+    # סנכרון אינקרמנטלי (/api/applications/sync/); ApplicationQuerySet.update מעדכן גם אותו
+    updated_at = models.DateTimeField(_("עודכן ב"), auto_now=True)
+    # סדר ה-commit של השינוי האחרון - מוחתם ע"י trigger ב-DB (config/sync.py), לא ע"י ה-ORM
+    sync_seq = models.BigIntegerField(default=0, editable=False)
+
+    objects = ApplicationQuerySet.as_manager()
 
     class Meta:
         verbose_name = _("מועמדות")
@@ -167,8 +346,52 @@ class Application(models.Model):
         indexes = [
             models.Index(fields=['applicant', '-created_at']),
             models.Index(fields=['job', 'status']),
+            # deltas: מחפש עבודה (applicant) / מגייס (דרך המשרות שלו)
+            models.Index(fields=['applicant', 'sync_seq', 'id'], name='jobs_app_applicant_sync_idx'),
+            models.Index(fields=['job', 'sync_seq', 'id'], name='jobs_app_job_sync_idx'),
+            # זמן עד בדיקה ראשונה (statsapi) - טווח reviewed_at לכל משרה של המגייס
+            models.Index(fields=['job', 'reviewed_at'], name='jobs_app_job_reviewed_idx'),
         ]
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if (self.reviewed_at is None and self.status in self.REVIEWED_STATUSES
+                and self.previous("status") == 'pending'
+                and (update_fields is None or "status" in update_fields)):
+            self.reviewed_at = timezone.now()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "reviewed_at"}
+        # השמירה + עדכון המונה (ב-post_save) באותה טרנזקציה (בלי savepoint מיותר)
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            return super().delete(*args, **kwargs)
+
     def __str__(self):
         name = getattr(self.applicant, "email", getattr(self.applicant, "username", "user"))
-        return f"{name} → {self.job.title}"
\ No newline at end of file
+        return f"{name} → {self.job.title}"
+
+class ApplicationTombstone(models.Model):
+    """
+    מועמדות שנמחקה - נשלחת ב-deleted של /api/applications/sync/ למועמד ולמגייס.
+    בלי FK constraint: נוצר גם בתוך cascade של מחיקת משתמש (הצד השני עדיין צריך לדעת);
+    שורות יתומות נמחקות עם הזמן (prune_sync_tombstones).
+    """
+    object_id = models.BigIntegerField()
+    applicant = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, db_constraint=False,
+                                  related_name="+", db_index=False)
+    recruiter = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, db_constraint=False,
+                                  related_name="+", db_index=False)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    sync_seq = models.BigIntegerField(default=0, editable=False)  # trigger (config/sync.py)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['applicant', 'sync_seq', 'id'], name='jobs_app_tomb_applicant_idx'),
+            models.Index(fields=['recruiter', 'sync_seq', 'id'], name='jobs_app_tomb_recruiter_idx'),
+        ]
+
+    def __str__(self):
+        return f"deleted application #{self.object_id}"
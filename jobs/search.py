@@ -0,0 +1,178 @@
+# jobs/search.py
+"""
+חיפוש טקסט מלא במשרות (title + description), מדורג לפי רלוונטיות.
+
+- PostgreSQL: עמודת tsvector (search_vector) שמתוחזקת ע"י trigger, אינדקס GIN,
+  וקונפיגורציה jobs_mixed - מילים באנגלית עוברות stemming, מילים בעברית
+  נשמרות כמו שהן (simple), כך שטקסט מעורב עובד בשתי השפות.
+- SQLite (dev): טבלת FTS5 חיצונית (jobs_job_fts) שמתוחזקת ע"י triggers, דירוג bm25.
+
+העמודה/הטבלה לא מופיעות במודל - ה-ORM לא צריך לדעת עליהן.
+"""
+import re
+
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "jobs_job_fts"
+PG_CONFIG = "jobs_mixed"
+
+_PG_VECTOR = (
+    "setweight(to_tsvector('{cfg}', coalesce({row}.title, '')), 'A') || "
+    "setweight(to_tsvector('{cfg}', coalesce({row}.description, '')), 'B')"
+)
+
+_PG_INSTALL = [
+    f"""
+    DO $$ BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{PG_CONFIG}') THEN
+            CREATE TEXT SEARCH CONFIGURATION {PG_CONFIG} (COPY = simple);
+            ALTER TEXT SEARCH CONFIGURATION {PG_CONFIG}
+                ALTER MAPPING FOR asciiword, asciihword, hword_asciipart WITH english_stem;
+        END IF;
+    END $$;
+    """,
+    "ALTER TABLE jobs_job ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    f"""
+    CREATE OR REPLACE FUNCTION jobs_job_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {_PG_VECTOR.format(cfg=PG_CONFIG, row="NEW")};
+        RETURN NEW;
+    END $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS jobs_job_search_vector_trg ON jobs_job",
+    """
+    CREATE TRIGGER jobs_job_search_vector_trg
+        BEFORE INSERT OR UPDATE OF title, description ON jobs_job
+        FOR EACH ROW EXECUTE FUNCTION jobs_job_search_vector_update()
+    """,
+    f"UPDATE jobs_job SET search_vector = {_PG_VECTOR.format(cfg=PG_CONFIG, row='jobs_job')} "
+    "WHERE search_vector IS NULL",
+    "CREATE INDEX IF NOT EXISTS jobs_job_search_vector_gin ON jobs_job USING GIN (search_vector)",
+]
+
+_PG_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS jobs_job_search_vector_trg ON jobs_job",
+    "DROP FUNCTION IF EXISTS jobs_job_search_vector_update()",
+    "DROP INDEX IF EXISTS jobs_job_search_vector_gin",
+    "ALTER TABLE jobs_job DROP COLUMN IF EXISTS search_vector",
+    f"DROP TEXT SEARCH CONFIGURATION IF EXISTS {PG_CONFIG}",
+]
+
+_SQLITE_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, description, content='jobs_job', content_rowid='id', "
+    "tokenize='porter unicode61 remove_diacritics 2')"
+)
+
+_SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON jobs_job BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON jobs_job BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON jobs_job BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+_SQLITE_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def install_search_index(connection):
+    """יוצר/משחזר את אינדקס החיפוש. אידמפוטנטי - בטוח להריץ שוב."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            for sql in _PG_INSTALL:
+                cursor.execute(sql)
+        elif connection.vendor == "sqlite":
+            # ב-SQLite, Django בונה טבלה מחדש ב-AlterField/AddField וה-triggers נמחקים
+            # יחד איתה - אם חסרים, יוצרים מחדש ובונים את האינדקס מהתוכן הקיים.
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s",
+                [f"{FTS_TABLE}_%"],
+            )
+            if cursor.fetchone()[0] == len(_SQLITE_TRIGGERS):
+                return
+            cursor.execute(_SQLITE_TABLE)
+            for sql in _SQLITE_TRIGGERS:
+                cursor.execute(sql)
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def uninstall_search_index(connection):
+    statements = {"postgresql": _PG_UNINSTALL, "sqlite": _SQLITE_UNINSTALL}.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def _fts5_query(text):
+    """הופך קלט חופשי לשאילתת FTS5 בטוחה: כל מילה בגרשיים, AND מרומז, התאמת קידומת."""
+    terms = re.findall(r"\w+", text)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_filter(text, connection):
+    """
+    Q שמסנן משרות לפי טקסט חופשי, בלי annotation של rank.
+    ה-MATCH רץ ב-subquery לא-מתואם (pk IN (SELECT ...)) - לא תלוי בשם/alias של הטבלה
+    החיצונית, כך שאפשר לשלב אותו בכל queryset (גם בתוך subquery או OR) והאינדקס
+    (GIN / FTS5) מוערך פעם אחת ולא לכל שורה.
+    """
+    if connection.vendor == "postgresql":
+        matches = f"SELECT id FROM jobs_job WHERE search_vector @@ websearch_to_tsquery('{PG_CONFIG}', %s)"
+        return Q(pk__in=RawSQL(matches, [text]))
+    if connection.vendor == "sqlite":
+        match = _fts5_query(text)
+        if not match:
+            return Q(pk__in=[])
+        return Q(pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
+    return Q(title__icontains=text) | Q(description__icontains=text)
+
+
+def search_jobs(queryset, text, connection):
+    """
+    מסנן queryset של Job לפי טקסט חופשי ומוסיף annotation בשם rank
+    (גבוה = רלוונטי יותר). ממוין לפי rank ואז חדשות.
+    ה-rank מתייחס ל-jobs_job בשמו - רק ל-queryset ברמה העליונה; לסינון בתוך
+    subquery משתמשים ב-search_filter.
+    """
+    queryset = queryset.filter(search_filter(text, connection))
+    if connection.vendor == "postgresql":
+        tsquery = f"websearch_to_tsquery('{PG_CONFIG}', %s)"
+        queryset = queryset.annotate(
+            rank=RawSQL(f"ts_rank_cd(jobs_job.search_vector, {tsquery})", [text], output_field=FloatField())
+        )
+    elif connection.vendor == "sqlite":
+        match = _fts5_query(text)
+        if not match:
+            return queryset.none()
+        # subquery לכל שורה עם MATCH ... AND rowid = jobs_job.id מריץ את ה-MATCH מחדש לכל
+        # התאמה (שניות על עשרות אלפי משרות). CTE עם MATERIALIZED (SQLite 3.35+) מוערך פעם
+        # אחת, ו-SQLite בונה עליו אינדקס אוטומטי לפי id. bm25 מחזיר ערך שלילי - קטן
+        # יותר = טוב יותר; הופכים סימן כדי ש-rank יהיה "גבוה = טוב"
+        scores = (
+            f"WITH scores AS MATERIALIZED (SELECT rowid AS id, -bm25({FTS_TABLE}, 10.0, 1.0) AS score "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s) "
+            "SELECT scores.score FROM scores WHERE scores.id = jobs_job.id"
+        )
+        queryset = queryset.annotate(rank=RawSQL(scores, [match], output_field=FloatField()))
+    else:
+        queryset = queryset.annotate(rank=Value(0.0))
+    return queryset.order_by("-rank", "-created_at", "-id")
@@ -1,7 +1,7 @@
 # jobs/serializers.py
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Job, Application
+from .models import Job, Application, ApplyError
 
 User = get_user_model()
 
@@ -18,7 +18,6 @@ class UserMiniSerializer(serializers.ModelSerializer):
 class JobListSerializer(serializers.ModelSerializer):
     """גרסה קלה לרשימת משרות - בלי תיאור מלא"""
     posted_by = UserMiniSerializer(read_only=True)
-    applications_count = serializers.SerializerMethodField()  # מספר מועמדויות
     is_expired = serializers.SerializerMethodField()  # האם פג תוקף
     
     class Meta:
@@ -28,10 +27,6 @@ class JobListSerializer(serializers.ModelSerializer):
             "applications_count", "is_expired"
         ]
     
-    def get_applications_count(self, obj):
-        """מחזיר מספר מועמדויות למשרה"""
-        return obj.applications.count()
-    
     def get_is_expired(self, obj):
         """בודק אם המשרה פגה (אם יש deadline במודל)"""
         # אם יש לך שדה deadline במודל Job:
@@ -42,7 +37,10 @@ class JobListSerializer(serializers.ModelSerializer):
 class JobSerializer(serializers.ModelSerializer):
     """גרסה מלאה למשרה - כולל תיאור מלא"""
     posted_by = UserMiniSerializer(read_only=True)
-    applications_count = serializers.SerializerMethodField()
+    # משרה נוצרת כטיוטה; open מפרסם אותה (מעברים לפי Job.STATUS_TRANSITIONS)
+    status = serializers.ChoiceField(
+        choices=[c for c in Job.STATUS_CHOICES if c[0] in Job.WRITABLE_STATUSES], required=False
+    )
     is_expired = serializers.SerializerMethodField()
     can_apply = serializers.SerializerMethodField()  # האם המשתמש יכול להגיש
     user_has_applied = serializers.SerializerMethodField()  # האם המשתמש הגיש
@@ -50,15 +48,18 @@ class JobSerializer(serializers.ModelSerializer):
     class Meta:
         model = Job
         fields = [
-            "id", "title", "description", "posted_by", 
+            "id", "title", "description", "posted_by", "status",
             "created_at", "updated_at",
             "applications_count", "is_expired", "can_apply", "user_has_applied"
         ]
-        read_only_fields = ["posted_by", "created_at", "updated_at"]
+        read_only_fields = ["posted_by", "created_at", "updated_at", "applications_count"]
+
+    def validate_status(self, value):
+        current = self.instance.status if self.instance is not None else None
+        if current is not None and value != current and current not in Job.STATUS_TRANSITIONS.get(value, ()):
+            raise serializers.ValidationError(f"לא ניתן להעביר משרה מ-{current} ל-{value}.")
+        return value
 
-    def get_applications_count(self, obj):
-        return obj.applications.count()
-    
     def get_is_expired(self, obj):
         return False  # או obj.is_expired() אם יש
     
@@ -67,27 +68,84 @@ class JobSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if not request or not request.user.is_authenticated:
             return False
+        # סגורה / טיוטה / פגה / מלאה - claim_slot ידחה את ההגשה
+        if not obj.can_apply():
+            return False
         # לא יכול להגיש למשרה שלו
-        if obj.posted_by == request.user:
+        if obj.posted_by_id == request.user.id:
             return False
         # כבר הגיש
-        if Application.objects.filter(job=obj, applicant=request.user).exists():
-            return False
-        return True
+        return not self._has_applied(obj, request.user)
     
     def get_user_has_applied(self, obj):
         """בודק אם המשתמש כבר הגיש"""
         request = self.context.get('request')
         if not request or not request.user.is_authenticated:
             return False
-        return Application.objects.filter(job=obj, applicant=request.user).exists()
+        return self._has_applied(obj, request.user)
+
+    @staticmethod
+    def _has_applied(obj, user):
+        # מגיע מ-JobManager.with_application_stats; אחרת - שאילתה בודדת
+        flag = getattr(obj, "user_has_applied", None)
+        if flag is not None:
+            return bool(flag)
+        return Application.objects.filter(job=obj, applicant=user).exists()
 
     def create(self, validated_data):
         """יוצר משרה חדשה - posted_by אוטומטי"""
         user = self.context["request"].user
+        validated_data.pop("posted_by", None)  # perform_create מעביר אותו גם כן
         return Job.objects.create(posted_by=user, **validated_data)
 
 
+# -------- פרמטרים לסינון/חיפוש (query string) --------
+class JobFilterSerializer(serializers.Serializer):
+    """ולידציה לפרמטרי סינון של משרות"""
+    status = serializers.ChoiceField(choices=Job.STATUS_CHOICES, required=False)
+    difficulty = serializers.ChoiceField(choices=Job.DIFFICULTY_CHOICES, required=False)
+    deadline_before = serializers.DateTimeField(required=False)
+    deadline_after = serializers.DateTimeField(required=False)
+    posted_by = serializers.IntegerField(required=False, min_value=1)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    # default=None - אחרת DRF מפרש פרמטר חסר ב-query string כ-False
+    has_free_slots = serializers.BooleanField(required=False, allow_null=True, default=None)
+
+
+class JobSearchSerializer(JobFilterSerializer):
+    """פרמטרים ל-/api/jobs/search/"""
+    q = serializers.CharField(max_length=200)
+
+
+# -------- פעולות bulk (jobs/bulk.py) --------
+BULK_MAX_ITEMS = 100
+
+
+class JobBulkSerializer(JobSerializer):
+    """
+    פריט ב-/api/jobs/bulk/: שדה לא מוכר או לקריאה בלבד נדחה (ולא נבלע בשקט).
+    בעדכון מותר גם id - מזהה המשרה.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict):
+            allowed = {name for name, field in self.fields.items() if not field.read_only}
+            if self.instance is not None:
+                allowed.add("id")
+            unknown = sorted(set(data) - allowed)
+            if unknown:
+                raise serializers.ValidationError({name: ["שדה לא מוכר או לקריאה בלבד."] for name in unknown})
+        return super().to_internal_value(data)
+
+
+class JobBulkIdsSerializer(serializers.Serializer):
+    """רשימת מזהי משרות לסגירה/פתיחה מחדש"""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=BULK_MAX_ITEMS
+    )
+
+
 # -------- מועמדויות --------
 class ApplicationSerializer(serializers.ModelSerializer):
     """להגשת מועמדות חדשה"""
@@ -96,28 +154,44 @@ class ApplicationSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Application
-        fields = ["id", "job", "applicant", "cover_letter", "created_at"]
-        read_only_fields = ["applicant", "created_at"]
+        fields = ["id", "job", "applicant", "cover_letter", "status", "created_at", "updated_at"]
+        read_only_fields = ["applicant", "status", "created_at", "updated_at"]
+        # כפילות נבדקת ע"י ה-unique constraint בזמן ה-INSERT (Application.objects.apply)
+        validators = []
+
+    def validate_job(self, job):
+        """
+        משרה נקבעת בהגשה בלבד - העברה למשרה אחרת הייתה עוקפת את תפיסת המקום (claim_slot)
+        ואת בדיקת המשרה הסגורה/המלאה, ומתנגשת ב-unique constraint של (job, applicant)
+        """
+        if self.instance is not None and job.pk != self.instance.job_id:
+            raise serializers.ValidationError("לא ניתן להעביר מועמדות למשרה אחרת.")
+        return job
 
     def validate(self, attrs):
-        """מוודא שלא מגישים פעמיים לאותה משרה"""
+        """מוודא שלא מגישים למשרה שלך"""
         user = self.context["request"].user
         job = attrs.get("job")
         
-        # בדיקה שלא הגיש כבר
-        if Application.objects.filter(job=job, applicant=user).exists():
-            raise serializers.ValidationError({"job": "כבר הגשת מועמדות למשרה זו."})
-        
         # בדיקה שלא מגיש למשרה שלו
-        if job.posted_by == user:
+        if job and job.posted_by_id == user.id:
             raise serializers.ValidationError({"job": "לא ניתן להגיש מועמדות למשרה שלך."})
         
         return attrs
 
     def create(self, validated_data):
-        """יוצר מועמדות - applicant אוטומטי"""
+        """יוצר מועמדות - applicant אוטומטי, מקום במשרה נתפס אטומית"""
         user = self.context["request"].user
-        return Application.objects.create(applicant=user, **validated_data)
+        validated_data.pop("applicant", None)
+        job = validated_data.pop("job")
+        try:
+            return Application.objects.apply(job, user, **validated_data)
+        except ApplyError as exc:
+            raise serializers.ValidationError({"job": str(exc.message)})
+
+    def update(self, instance, validated_data):
+        validated_data.pop("job", None)
+        return super().update(instance, validated_data)
 
 
 class ApplicationDetailSerializer(serializers.ModelSerializer):
@@ -127,5 +201,5 @@ class ApplicationDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Application
-        fields = ["id", "job", "applicant", "cover_letter", "created_at"]
-        read_only_fields = ["applicant", "created_at"]
\ No newline at end of file
+        fields = ["id", "job", "applicant", "cover_letter", "status", "created_at", "updated_at"]
+        read_only_fields = ["applicant", "status", "created_at", "updated_at"]
\ No newline at end of file
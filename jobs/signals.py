@@ -0,0 +1,53 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import Job, Application, ApplicationTombstone
+from .cache import invalidate_jobs
+
+
+# תחזוקת Job.applications_count (מסלולי ORM רגילים; bulk - ב-ApplicationQuerySet)
+@receiver(post_save, sender=Application)
+def count_on_application_saved(sender, instance: Application, created, update_fields=None, **kwargs):
+    invalidate_jobs([instance.job_id])
+    if created:
+        # Application.objects.apply כבר תפס מקום ועדכן את המונה
+        if instance.status != "withdrawn" and not getattr(instance, "_slot_claimed", False):
+            Job.objects.bump_applications_count(instance.job_id, 1)
+        return
+    changed = instance.changed_fields
+    if update_fields is not None:
+        changed &= set(update_fields)
+    if "job" in changed:
+        # מועמדות שהועברה למשרה אחרת - שתי המשרות מחושבות מחדש
+        invalidate_jobs([instance.previous("job")])
+        Job.objects.refresh_applications_count([instance.job_id, instance.previous("job")])
+    elif "status" in changed and (instance.previous("status") == "withdrawn") != (instance.status == "withdrawn"):
+        # משיכת מועמדות / ביטול משיכה - המונה משתנה ב-1
+        Job.objects.bump_applications_count(instance.job_id, -1 if instance.status == "withdrawn" else 1)
+
+
+@receiver(post_delete, sender=Application)
+def count_on_application_deleted(sender, instance: Application, **kwargs):
+    invalidate_jobs([instance.job_id])
+    if instance.status != "withdrawn":
+        Job.objects.bump_applications_count(instance.job_id, -1)
+
+
+# tombstone לסנכרון (/api/applications/sync/) - גם במחיקות cascade של משרה/משתמש
+@receiver(post_delete, sender=Application)
+def tombstone_on_application_deleted(sender, instance: Application, **kwargs):
+    if Application.job.is_cached(instance):
+        recruiter_id = instance.job.posted_by_id
+    else:
+        recruiter_id = Job.objects.filter(pk=instance.job_id).values_list("posted_by_id", flat=True).first()
+    if recruiter_id is None:
+        return
+    ApplicationTombstone.objects.create(
+        object_id=instance.pk, applicant_id=instance.applicant_id, recruiter_id=recruiter_id
+    )
+
+
+# ה-cache של /api/jobs/ (אנונימיים) - גרסה חדשה אחרי כל שינוי במשרה
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_cache(sender, instance: Job, **kwargs):
+    invalidate_jobs([instance.pk])
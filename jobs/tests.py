@@ -1,3 +1,963 @@
-from django.test import TestCase
+import base64
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.pagination import Cursor
+from rest_framework.test import APITestCase
+
+from accounts.models import Roles
+from config.pagination import KeysetPagination
+from .models import Job, Application, ApplyError
+from .cache import cache_stats, invalidate_jobs
+
+User = get_user_model()
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+DEAD_REDIS_CACHE = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": "redis://127.0.0.1:1/0",
+        "OPTIONS": {"SOCKET_CONNECT_TIMEOUT": 0.05, "SOCKET_TIMEOUT": 0.05},
+    }
+}
+
+
+def make_job(recruiter, **kwargs):
+    defaults = {
+        "title": "Junior Python Developer",
+        "description": "Build and maintain internal Django services.",
+        "status": "open",
+    }
+    defaults.update(kwargs)
+    return Job.objects.create(posted_by=recruiter, **defaults)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class JobListQueryCountTests(APITestCase):
+    """רשימת משרות - מספר שאילתות קבוע, ללא תלות במספר השורות בעמוד"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+        cls.seeker = User.objects.create_user(email="js@example.com", password="x", role=Roles.SEEKER)
+        cls.other = User.objects.create_user(email="js2@example.com", password="x", role=Roles.SEEKER)
+
+    def setUp(self):
+        cache.clear()
+
+    def _seed(self, n):
+        # on_commit מריץ את ה-invalidation של ה-cache - כל רשימה נבנית מה-DB
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs = [make_job(self.recruiter, title=f"Junior role #{i}") for i in range(n)]
+            for job in jobs[::2]:
+                Application.objects.create(job=job, applicant=self.seeker)
+            for job in jobs[::3]:
+                Application.objects.create(job=job, applicant=self.other)
+
+    def _list(self):
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get("/api/jobs/")
+        self.assertEqual(r.status_code, 200)
+        return len(ctx.captured_queries), r.data["results"]
+
+    def _assert_constant_cost(self):
+        self._seed(2)
+        small, rows = self._list()
+        self.assertEqual(len(rows), 2)
+        self._seed(10)
+        large, rows = self._list()
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(small, large)
+        return large
+
+    def test_anonymous_list_cost_is_constant(self):
+        self.assertEqual(self._assert_constant_cost(), 1)  # keyset - בלי COUNT
+
+    def test_authenticated_list_cost_is_constant(self):
+        self.client.force_authenticate(self.seeker)
+        self.assertEqual(self._assert_constant_cost(), 1)
+
+    def test_retrieve_is_single_query(self):
+        self._seed(1)
+        job = Job.objects.get()
+        self.client.force_authenticate(self.seeker)
+        self.client.get(f"/api/jobs/{job.pk}/")  # צפייה ראשונה מוודאת שהמשרה קיימת ויוצרת את הגרסה
+        with self.assertNumQueries(1):
+            r = self.client.get(f"/api/jobs/{job.pk}/")
+        self.assertTrue(r.data["user_has_applied"])
+
+    def test_annotated_values_match_rows(self):
+        self._seed(6)
+        self.client.force_authenticate(self.seeker)
+        _, rows = self._list()
+        for row in rows:
+            job = Job.objects.get(pk=row["id"])
+            applied = Application.objects.filter(job=job, applicant=self.seeker).exists()
+            self.assertEqual(row["applications_count"], job.applications.count())
+            self.assertEqual(row["user_has_applied"], applied)
+            self.assertEqual(row["can_apply"], not applied)
+
+    def test_recruiter_cannot_apply_to_own_job(self):
+        self._seed(3)
+        self.client.force_authenticate(self.recruiter)
+        _, rows = self._list()
+        self.assertFalse(any(row["can_apply"] for row in rows))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class KeysetPaginationTests(APITestCase):
+    """עימוד cursor למשרות/מועמדויות, ו-?page= כמצב אופציונלי"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+        cls.seeker = User.objects.create_user(email="js@example.com", password="x", role=Roles.SEEKER)
+        cls.jobs = [make_job(cls.recruiter, title=f"Junior role #{i}") for i in range(25)]
+        for job in cls.jobs:
+            Application.objects.create(job=job, applicant=cls.seeker)
+
+    def _walk(self, url):
+        seen, pages = [], 0
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                r = self.client.get(url)
+            self.assertEqual(r.status_code, 200)
+            self.assertNotIn("count", r.data)
+            self.assertFalse(any("COUNT(*)" in q["sql"] for q in ctx.captured_queries))
+            seen += [row["id"] for row in r.data["results"]]
+            url, pages = r.data["next"], pages + 1
+        return seen, pages
+
+    def test_jobs_cursor_walk_covers_all_rows_newest_first(self):
+        seen, pages = self._walk("/api/jobs/")
+        self.assertEqual(pages, 3)
+        expected = list(Job.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_applications_cursor_walk(self):
+        self.client.force_authenticate(self.seeker)
+        seen, _ = self._walk("/api/applications/")
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+
+    def test_rows_sharing_created_at_are_paged_by_id(self):
+        Job.objects.update(created_at=timezone.now())  # כל השורות באותו created_at
+        expected = list(Job.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        url, seen, previous = "/api/jobs/?page_size=4", [], None
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                r = self.client.get(url)
+            self.assertFalse(any("OFFSET" in q["sql"] for q in ctx.captured_queries))
+            seen += [row["id"] for row in r.data["results"]]
+            url, previous = r.data["next"], r.data["previous"]
+        self.assertEqual(seen, expected)
+
+        # חזרה אחורה מהעמוד האחרון
+        back = self.client.get(previous)
+        self.assertEqual([row["id"] for row in back.data["results"]], expected[-5:-1])
+
+    def test_malformed_cursor_is_404(self):
+        paginator = KeysetPagination()
+        paginator.base_url = "/api/jobs/"
+        for position in ("not-a-date|1", "2024-01-01 00:00:00+00:00"):
+            self.assertEqual(self.client.get(paginator.encode_cursor(Cursor(0, False, position))).status_code, 404)
+
+    def test_page_number_is_opt_in(self):
+        r = self.client.get("/api/jobs/", {"page": 3})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["count"], 25)
+        self.assertEqual(len(r.data["results"]), 5)
+
+
+class JobSearchTests(APITestCase):
+    """/api/jobs/search/ - אינדקס טקסט מלא, דירוג וסינון"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+        cls.python_title = make_job(
+            cls.recruiter, title="Python developer", description="Backend work on internal services.",
+            difficulty="easy",
+        )
+        cls.python_body = make_job(
+            cls.recruiter, title="Backend engineer", description="Our stack is Python, Django and Postgres.",
+            difficulty="hard",
+        )
+        cls.hebrew = make_job(
+            cls.recruiter, title="מפתח/ת פייתון ג'וניור", description="עבודה על מערכות Django בצוות קטן ודינמי.",
+            status="draft",
+        )
+        make_job(cls.recruiter, title="Graphic designer", description="Figma, branding and marketing assets.")
+
+    def _search(self, **params):
+        r = self.client.get("/api/jobs/search/", params)
+        self.assertEqual(r.status_code, 200, r.data)
+        return [row["id"] for row in r.data["results"]]
+
+    def test_title_match_ranks_above_description_match(self):
+        self.assertEqual(self._search(q="python"), [self.python_title.id, self.python_body.id])
+
+    def test_stemming_and_prefix(self):
+        self.assertIn(self.python_title.id, self._search(q="developers"))
+
+    def test_mixed_hebrew_english(self):
+        self.assertEqual(self._search(q="פייתון"), [self.hebrew.id])
+        self.assertIn(self.hebrew.id, self._search(q="django"))
+
+    def test_filters(self):
+        self.assertEqual(self._search(q="python", difficulty="hard"), [self.python_body.id])
+        self.assertEqual(self._search(q="django", status="draft"), [self.hebrew.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        job = make_job(self.recruiter, title="Kotlin mobile developer", description="Android apps for our clients.")
+        self.assertEqual(self._search(q="kotlin"), [job.id])
+        job.title = "Swift mobile developer"
+        job.save()
+        self.assertEqual(self._search(q="kotlin"), [])
+        self.assertEqual(self._search(q="swift"), [job.id])
+        job.delete()
+        self.assertEqual(self._search(q="swift"), [])
+
+    def test_q_is_required(self):
+        r = self.client.get("/api/jobs/search/")
+        self.assertEqual(r.status_code, 400)
+
+    def test_punctuation_only_query_is_empty(self):
+        self.assertEqual(self._search(q='"*()'), [])
+
+    def test_admin_search_uses_index_and_email(self):
+        admin = User.objects.create_superuser(email="admin@example.com", password="x")
+        self.client.force_login(admin)
+        r = self.client.get("/admin/jobs/job/", {"q": "python"})
+        self.assertEqual({job.id for job in r.context["cl"].result_list}, {self.python_title.id, self.python_body.id})
+        r = self.client.get("/admin/jobs/job/", {"q": "hr@example"})
+        self.assertEqual(r.context["cl"].result_count, 4)
+
+
+class ApplicationsCountTests(APITestCase):
+    """Job.applications_count - מונה מנורמל שמתעדכן בכל מסלולי הכתיבה"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user(
+            email="hr@example.com", password="x", role=Roles.RECRUITER, is_staff=True, is_superuser=True,
+        )
+        cls.seekers = [
+            User.objects.create_user(email=f"js{i}@example.com", password="x", role=Roles.SEEKER)
+            for i in range(4)
+        ]
+
+    def setUp(self):
+        self.job = make_job(self.recruiter)
+
+    def _count(self):
+        self.job.refresh_from_db(fields=["applications_count"])
+        return self.job.applications_count
+
+    def test_create_withdraw_delete(self):
+        app = Application.objects.create(job=self.job, applicant=self.seekers[0])
+        Application.objects.create(job=self.job, applicant=self.seekers[1])
+        self.assertEqual(self._count(), 2)
+
+        app.status = "withdrawn"
+        app.save(update_fields=["status"])
+        self.assertEqual(self._count(), 1)
+
+        app.status = "pending"
+        app.save()
+        self.assertEqual(self._count(), 2)
+
+        app.delete()
+        self.assertEqual(self._count(), 1)
+
+    def test_bulk_paths(self):
+        Application.objects.bulk_create(
+            [Application(job=self.job, applicant=seeker) for seeker in self.seekers]
+        )
+        self.assertEqual(self._count(), 4)
+        Application.objects.filter(applicant__in=self.seekers[:3]).update(status="withdrawn")
+        self.assertEqual(self._count(), 1)
+        Application.objects.filter(job=self.job).delete()
+        self.assertEqual(self._count(), 0)
+
+    def test_can_apply_reads_column(self):
+        self.job.max_applicants = 1
+        self.job.save()
+        Application.objects.create(job=self.job, applicant=self.seekers[0])
+        self.job.refresh_from_db()
+        with self.assertNumQueries(0):
+            self.assertFalse(self.job.can_apply())
+
+    def test_reconcile_command_fixes_drift(self):
+        Application.objects.create(job=self.job, applicant=self.seekers[0])
+        Job.objects.filter(pk=self.job.pk).update(applications_count=7)
+        out = StringIO()
+        call_command("reconcile_applications_count", "--dry-run", stdout=out)
+        self.assertIn("found 1", out.getvalue())
+        self.assertEqual(self._count(), 7)
+        call_command("reconcile_applications_count", stdout=out)
+        self.assertEqual(self._count(), 1)
+
+    def test_admin_changelist_has_no_per_row_aggregates(self):
+        for seeker in self.seekers:
+            make_job(self.recruiter, title=f"Another junior role {seeker.pk}")
+        self.client.force_login(self.recruiter)
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get("/admin/jobs/job/")
+        self.assertEqual(r.status_code, 200)
+        self.assertFalse(any("jobs_application" in q["sql"] for q in ctx.captured_queries))
+
+
+class ApplyPathTests(APITestCase):
+    """POST /api/applications/ - תפיסת מקום אטומית, כפילות דרך ה-unique constraint"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+        cls.seekers = [
+            User.objects.create_user(email=f"js{i}@example.com", password="x", role=Roles.SEEKER)
+            for i in range(3)
+        ]
+
+    def _apply(self, seeker, job):
+        self.client.force_authenticate(seeker)
+        return self.client.post("/api/applications/", {"job": job.pk, "cover_letter": "hi"}, format="json")
+
+    def test_fills_job_and_rejects_overflow(self):
+        job = make_job(self.recruiter, max_applicants=2)
+        self.assertEqual(self._apply(self.seekers[0], job).status_code, 201)
+        self.assertEqual(self._apply(self.seekers[1], job).status_code, 201)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.applications_count), ("filled", 2))
+
+        r = self._apply(self.seekers[2], job)
+        self.assertEqual(r.status_code, 400)
+        self.assertEqual(Application.objects.filter(job=job).count(), 2)
+
+    def test_duplicate_is_rejected_without_consuming_a_slot(self):
+        job = make_job(self.recruiter, max_applicants=5)
+        self.assertEqual(self._apply(self.seekers[0], job).status_code, 201)
+        r = self._apply(self.seekers[0], job)
+        self.assertEqual(r.status_code, 400)
+        self.assertIn("job", r.data)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.applications_count), ("open", 1))
+
+    def test_other_integrity_errors_are_not_reported_as_duplicates(self):
+        from django.db import IntegrityError
+
+        job = make_job(self.recruiter)
+        with self.assertRaises(IntegrityError):  # NOT NULL - לא "כבר הגשת"
+            with transaction.atomic():
+                Application.objects.apply(job, self.seekers[0], cover_letter=None)
+        job.refresh_from_db()
+        self.assertEqual(job.applications_count, 0)  # תפיסת המקום בוטלה
+
+    def test_closed_or_expired_job_is_rejected(self):
+        closed = make_job(self.recruiter, status="closed")
+        expired = make_job(self.recruiter, deadline=timezone.now() - timedelta(days=1))
+        self.assertEqual(self._apply(self.seekers[0], closed).status_code, 400)
+        self.assertEqual(self._apply(self.seekers[0], expired).status_code, 400)
+
+    def test_cannot_apply_to_own_job(self):
+        job = make_job(self.recruiter)
+        self.client.force_authenticate(self.recruiter)
+        r = self.client.post("/api/applications/", {"job": job.pk}, format="json")
+        self.assertEqual(r.status_code, 403)
+
+    def test_job_created_through_the_api_takes_applications(self):
+        self.client.force_authenticate(self.recruiter)
+        payload = {"title": "Backend Developer", "description": "Own the public jobs API end to end."}
+        draft = self.client.post("/api/jobs/", payload, format="json").data
+        self.assertEqual(draft["status"], "draft")
+        published = self.client.post("/api/jobs/", {**payload, "status": "open"}, format="json").data
+        self.assertEqual(published["status"], "open")
+
+        self.client.force_authenticate(self.seekers[0])
+        self.assertFalse(self.client.get(f"/api/jobs/{draft['id']}/").data["can_apply"])
+        self.assertTrue(self.client.get(f"/api/jobs/{published['id']}/").data["can_apply"])
+        r = self.client.post("/api/applications/", {"job": published["id"]}, format="json")
+        self.assertEqual(r.status_code, 201, r.data)
+        self.assertEqual(self._apply(self.seekers[0], Job(pk=draft["id"])).status_code, 400)
+
+        # פרסום הטיוטה; טיוטה לא חוזרת מ-open, ו-filled לא נשלח ע"י לקוח
+        self.client.force_authenticate(self.recruiter)
+        r = self.client.patch(f"/api/jobs/{draft['id']}/", {"status": "open"}, format="json")
+        self.assertEqual(r.data["status"], "open")
+        self.assertEqual(self.client.patch(f"/api/jobs/{draft['id']}/", {"status": "draft"}, format="json").status_code, 400)
+        self.assertEqual(self.client.patch(f"/api/jobs/{draft['id']}/", {"status": "filled"}, format="json").status_code, 400)
+        self.assertEqual(self._apply(self.seekers[1], Job(pk=draft["id"])).status_code, 201)
+
+    def test_can_apply_reflects_fullness(self):
+        job = make_job(self.recruiter, max_applicants=1)
+        self._apply(self.seekers[0], job)
+        self.client.force_authenticate(self.seekers[1])
+        self.assertFalse(self.client.get(f"/api/jobs/{job.pk}/").data["can_apply"])
+
+    def test_application_cannot_be_moved_to_another_job(self):
+        job = make_job(self.recruiter)
+        full = make_job(self.recruiter, max_applicants=1)
+        closed = make_job(self.recruiter, status="closed")
+        self._apply(self.seekers[1], full)
+        application = Application.objects.apply(job, self.seekers[0])
+        Application.objects.apply(make_job(self.recruiter), self.seekers[0])
+        already = Application.objects.filter(applicant=self.seekers[0]).exclude(job=job).get().job
+
+        self.client.force_authenticate(self.seekers[0])
+        url = f"/api/applications/{application.pk}/"
+        for target in (full, closed, already):
+            r = self.client.patch(url, {"job": target.pk}, format="json")
+            self.assertEqual(r.status_code, 400, r.data)
+            self.assertIn("job", r.data)
+        application.refresh_from_db()
+        full.refresh_from_db()
+        self.assertEqual(application.job_id, job.pk)
+        self.assertEqual(full.applications_count, 1)
+        self.assertEqual(Application.objects.filter(job=closed).count(), 0)
+
+        # שדות אחרים (וה-job הנוכחי) עדיין ניתנים לעדכון
+        r = self.client.patch(url, {"job": job.pk, "cover_letter": "updated"}, format="json")
+        self.assertEqual(r.status_code, 200, r.data)
+        application.refresh_from_db()
+        self.assertEqual(application.cover_letter, "updated")
+
+    def test_apply_round_trips(self):
+        job = make_job(self.recruiter)
+        self.client.force_authenticate(self.seekers[0])
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.post("/api/applications/", {"job": job.pk}, format="json")
+        self.assertEqual(r.status_code, 201)
+        # SELECT job, UPDATE job (claim), INSERT application, INSERT outbox (ההתראה נוצרת ב-worker),
+        # upsert לכל אחת מטבלאות ה-rollup של statsapi
+        # (SAVEPOINT/RELEASE נובעים מהטרנזקציה של TestCase; בפרודקשן זה BEGIN/COMMIT)
+        statements = [q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]]
+        self.assertEqual(len(statements), 8, statements)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ApplyConcurrencyTests(TransactionTestCase):
+    """הגשות מקבילות מכמה threads - אסור לחרוג מ-max_applicants (bench_apply בקטן)"""
+
+    SEEKERS = 24
+    MAX_APPLICANTS = 5
+
+    def test_no_overbooking_under_concurrent_applies(self):
+        out = StringIO()
+        call_command("bench_apply", seekers=self.SEEKERS, max_applicants=self.MAX_APPLICANTS, stdout=out)
+        report = dict(line.split(":", 1) for line in out.getvalue().splitlines())
+
+        job = Job.objects.get()
+        self.assertEqual(Application.objects.filter(job=job).count(), self.MAX_APPLICANTS)
+        self.assertEqual(job.applications_count, self.MAX_APPLICANTS)
+        self.assertEqual(job.status, "filled")
+        self.assertIn(f"ok: {self.MAX_APPLICANTS},", report["applies"])
+        self.assertIn("gave up: 0,", report["applies"])
+        self.assertGreater(float(report["throughput"].split()[0]), 0)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class AnonymousJobCacheTests(APITestCase):
+    """cache תשובות /api/jobs/ לאנונימיים - גרסאות, invalidation ונפילה ל-DB"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+        cls.seeker = User.objects.create_user(email="js@example.com", password="x", role=Roles.SEEKER)
+
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job = make_job(self.recruiter)
+
+    def test_second_request_is_served_from_cache(self):
+        r = self.client.get("/api/jobs/")
+        self.assertEqual(r["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            r = self.client.get("/api/jobs/")
+        self.assertEqual(r["X-Cache"], "HIT")
+        self.assertEqual(r.data["results"][0]["id"], self.job.id)
+        self.assertEqual(cache_stats()["hit"], 1)
+
+    def test_query_string_is_normalized(self):
+        self.client.get("/api/jobs/", {"page": 1, "page_size": 5})
+        r = self.client.get("/api/jobs/?page_size=5&page=1")
+        self.assertEqual(r["X-Cache"], "HIT")
+
+    def test_job_update_invalidates_list_and_detail(self):
+        self.client.get("/api/jobs/")
+        self.client.get(f"/api/jobs/{self.job.pk}/")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.title = "Senior-ish junior role"
+            self.job.save()
+        for url in ("/api/jobs/", f"/api/jobs/{self.job.pk}/"):
+            r = self.client.get(url)
+            self.assertEqual(r["X-Cache"], "MISS")
+        self.assertEqual(r.data["title"], "Senior-ish junior role")
+
+    def test_apply_invalidates_counts(self):
+        self.client.get(f"/api/jobs/{self.job.pk}/")
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.apply(self.job, self.seeker)
+        r = self.client.get(f"/api/jobs/{self.job.pk}/")
+        self.assertEqual(r.data["applications_count"], 1)
+
+    def test_stale_value_is_served_while_another_request_recomputes(self):
+        self.client.get("/api/jobs/")
+        with self.captureOnCommitCallbacks(execute=True):
+            make_job(self.recruiter, title="Brand new junior role")
+        # מדמה בקשה אחרת שמחזיקה את ה-lock של החישוב מחדש
+        cache_key = [k for k in cache._cache if ":stale" in k][0].split(":", 2)[-1].rsplit(":", 1)[0]
+        cache.add(f"{cache_key}:lock", 1)
+        with self.assertNumQueries(0):
+            r = self.client.get("/api/jobs/")
+        self.assertEqual(r["X-Cache"], "STALE")
+        self.assertEqual(len(r.data["results"]), 1)
+
+    def test_stale_value_has_no_validators(self):
+        url = f"/api/jobs/{self.job.pk}/"
+        old_etag = self.client.get(url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.apply(self.job, self.seeker)
+        cache_key = [k for k in cache._cache if ":stale" in k][0].split(":", 2)[-1].rsplit(":", 1)[0]
+        cache.add(f"{cache_key}:lock", 1)
+        r = self.client.get(url)
+        self.assertEqual(r["X-Cache"], "STALE")
+        self.assertNotIn("ETag", r)
+        self.assertNotIn("Last-Modified", r)
+        r = self.client.get(url, HTTP_IF_NONE_MATCH=old_etag)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r["X-Cache"], "STALE")
+        self.assertNotIn("ETag", r)
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.force_authenticate(self.seeker)
+        self.client.get("/api/jobs/")
+        r = self.client.get("/api/jobs/")
+        self.assertNotIn("X-Cache", r)
+
+    def test_unknown_ids_do_not_create_version_keys(self):
+        for path in ("/api/jobs/abc/", "/api/jobs/999999/"):
+            self.assertEqual(self.client.get(path).status_code, 404)
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_jobs([888888])  # העלאת גרסה לא יוצרת מפתח חסר
+        self.assertEqual(
+            [key for key in ("jobs:v:job:abc", "jobs:v:job:999999", "jobs:v:job:888888") if cache.get(key) is not None],
+            [],
+        )
+        self.assertEqual(self.client.get(f"/api/jobs/{self.job.pk}/").status_code, 200)
+        self.assertIsNotNone(cache.get(f"jobs:v:job:{self.job.pk}"))
+
+    @override_settings(CACHES=DEAD_REDIS_CACHE)
+    def test_non_numeric_id_is_404_when_redis_is_down(self):
+        with self.assertLogs("jobs.cache", level="WARNING"):
+            self.assertEqual(self.client.get("/api/jobs/abc/").status_code, 404)
+            self.assertEqual(self.client.get(f"/api/jobs/{self.job.pk}/").status_code, 200)
+
+    @override_settings(CACHES=DEAD_REDIS_CACHE)
+    def test_unreachable_redis_falls_back_to_db(self):
+        with self.assertLogs("jobs.cache", level="WARNING"):
+            r = self.client.get("/api/jobs/")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["results"][0]["id"], self.job.id)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ConditionalGetTests(APITestCase):
+    """ETag/Last-Modified ב-/api/jobs/ - 304 בלי serializer"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+        cls.seeker = User.objects.create_user(email="js@example.com", password="x", role=Roles.SEEKER)
+
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job = make_job(self.recruiter)
+
+    def _revalidate(self, url):
+        etag = self.client.get(url)["ETag"]
+        return etag, self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_list_and_detail_return_304_without_queries(self):
+        for url in ("/api/jobs/", f"/api/jobs/{self.job.pk}/"):
+            etag = self.client.get(url)["ETag"]
+            with self.assertNumQueries(0):
+                r = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(r.status_code, 304)
+            self.assertEqual(r["ETag"], etag)
+            self.assertEqual(r.content, b"")
+
+    def test_change_produces_new_etag(self):
+        etag, _ = self._revalidate(f"/api/jobs/{self.job.pk}/")
+        with self.captureOnCommitCallbacks(execute=True):
+            Application.objects.apply(self.job, self.seeker)
+        r = self.client.get(f"/api/jobs/{self.job.pk}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["applications_count"], 1)
+
+    def test_etag_is_per_user(self):
+        anon_etag = self.client.get("/api/jobs/")["ETag"]
+        self.client.force_authenticate(self.seeker)
+        r = self.client.get("/api/jobs/", HTTP_IF_NONE_MATCH=anon_etag)
+        self.assertEqual(r.status_code, 200)
+
+    @override_settings(CACHES=DEAD_REDIS_CACHE)
+    def test_db_validators_when_redis_is_down(self):
+        with self.assertLogs("jobs.cache", level="WARNING"):
+            etag, r = self._revalidate(f"/api/jobs/{self.job.pk}/")
+            self.assertEqual(r.status_code, 304)
+            r = self.client.get(f"/api/jobs/{self.job.pk}/", HTTP_IF_MODIFIED_SINCE=r["Last-Modified"])
+            self.assertEqual(r.status_code, 304)
+            _, r = self._revalidate("/api/jobs/")
+            self.assertEqual(r.status_code, 304)
+
+    @override_settings(CACHES=DEAD_REDIS_CACHE)
+    def test_db_validators_follow_the_callers_application(self):
+        url = f"/api/jobs/{self.job.pk}/"
+        application = Application.objects.apply(self.job, self.seeker)
+        self.client.force_authenticate(self.seeker)
+        with self.assertLogs("jobs.cache", level="WARNING"):
+            r = self.client.get(url)
+            self.assertTrue(r.data["user_has_applied"])
+            self.assertNotIn("Last-Modified", r)
+            Application.objects.filter(pk=application.pk).delete()
+            r = self.client.get(url, HTTP_IF_NONE_MATCH=r["ETag"])
+        self.assertEqual(r.status_code, 200)
+        self.assertFalse(r.data["user_has_applied"])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class JobFilterTests(APITestCase):
+    """פילטרים מצטברים ב-/api/jobs/ + בדיקה שהשאילתות משתמשות באינדקסים"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+        cls.other_recruiter = User.objects.create_user(email="hr2@example.com", password="x", role=Roles.RECRUITER)
+        now = timezone.now()
+        cls.easy_open = make_job(cls.recruiter, title="Easy open role", difficulty="easy",
+                                 deadline=now + timedelta(days=3))
+        cls.hard_open = make_job(cls.recruiter, title="Hard open role", difficulty="hard",
+                                 deadline=now + timedelta(days=30))
+        cls.closed = make_job(cls.other_recruiter, title="Closed role", status="closed")
+        cls.full = make_job(cls.other_recruiter, title="Full open role", max_applicants=1)
+        Job.objects.filter(pk=cls.full.pk).update(applications_count=1)
+
+    def setUp(self):
+        cache.clear()
+
+    def _titles(self, **params):
+        res = self.client.get("/api/jobs/", params)
+        self.assertEqual(res.status_code, 200, res.data)
+        return {row["title"] for row in res.data["results"]}
+
+    def test_filters_compose(self):
+        self.assertEqual(self._titles(status="open", difficulty="easy"), {"Easy open role"})
+        self.assertEqual(
+            self._titles(status="open", posted_by=self.other_recruiter.pk), {"Full open role"}
+        )
+        deadline = (timezone.now() + timedelta(days=7)).isoformat()
+        self.assertEqual(self._titles(status="open", deadline_before=deadline), {"Easy open role"})
+        self.assertEqual(self._titles(deadline_after=deadline), {"Hard open role"})
+
+    def test_has_free_slots(self):
+        self.assertNotIn("Full open role", self._titles(status="open", has_free_slots="true"))
+        self.assertEqual(self._titles(has_free_slots="false"), {"Full open role"})
+        # בלי הפרמטר - אין סינון
+        self.assertEqual(len(self._titles()), 4)
+
+    def test_created_range(self):
+        Job.objects.filter(pk=self.closed.pk).update(created_at=timezone.now() - timedelta(days=10))
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        self.assertNotIn("Closed role", self._titles(created_after=since))
+        self.assertEqual(self._titles(created_before=since), {"Closed role"})
+
+    def test_invalid_filter_returns_400(self):
+        res = self.client.get("/api/jobs/", {"status": "nope"})
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("status", res.data)
+
+    def test_filtered_pages_use_indexes(self):
+        from .filters import apply_job_filters
+
+        deadline = timezone.now() + timedelta(days=7)
+        cases = [
+            {"status": "open"},
+            {"status": "open", "deadline_before": deadline},
+            {"posted_by": self.recruiter.pk},
+            {"difficulty": "hard"},
+            {"status": "open", "has_free_slots": True},
+        ]
+        for params in cases:
+            qs = apply_job_filters(Job.objects.order_by("-created_at", "-id"), params)[:20]
+            plan = qs.explain()
+            with self.subTest(params=params):
+                self.assertIn("USING", plan)
+                self.assertNotRegex(plan, r"SCAN jobs_job(\s|$)(?!USING)")
+                if "posted_by" in params or "difficulty" in params:
+                    # סדר ה-cursor (-created_at, -id) נקרא ישירות מהאינדקס - בלי מיון
+                    self.assertNotIn("TEMP B-TREE", plan)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class BulkJobTests(APITestCase):
+    """פעולות bulk ל-/api/jobs/bulk/ - הכול או כלום, בדיקת בעלות אחת לכל ה-batch"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+        cls.other = User.objects.create_user(email="hr2@example.com", password="x", role=Roles.RECRUITER)
+        cls.seeker = User.objects.create_user(email="js@example.com", password="x", role=Roles.SEEKER)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.recruiter)
+
+    def _payload(self, n):
+        return [
+            {"title": f"Imported role #{i}", "description": "Imported from the ATS in a single batch."}
+            for i in range(n)
+        ]
+
+    def _statements(self, ctx):
+        return [q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]]
+
+    def test_bulk_create(self):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.post("/api/jobs/bulk/", self._payload(5), format="json")
+        self.assertEqual(res.status_code, 201, res.data)
+        ids = [item["id"] for item in res.data["results"]]
+        self.assertEqual(Job.objects.filter(pk__in=ids, posted_by=self.recruiter).count(), 5)
+        inserts = [sql for sql in self._statements(ctx) if sql.startswith("INSERT")]
+        self.assertEqual(len(inserts), 1)
+
+    def test_bulk_create_is_all_or_nothing(self):
+        payload = self._payload(3)
+        payload[1]["title"] = "x"
+        res = self.client.post("/api/jobs/bulk/", payload, format="json")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual([item["index"] for item in res.data["results"]], [1])
+        self.assertIn("title", res.data["results"][0]["errors"])
+        self.assertFalse(Job.objects.exists())
+
+    def test_bulk_patch(self):
+        jobs = [make_job(self.recruiter, title=f"Role number {i}") for i in range(4)]
+        payload = [{"id": job.pk, "title": f"Renamed role {job.pk}"} for job in jobs]
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.patch("/api/jobs/bulk/", payload, format="json")
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual({r["result"] for r in res.data["results"]}, {"updated"})
+        for job in jobs:
+            job.refresh_from_db()
+            self.assertEqual(job.title, f"Renamed role {job.pk}")
+        # שאילתת בעלות אחת + UPDATE אחד, בלי קשר למספר המשרות
+        statements = self._statements(ctx)
+        self.assertEqual(len([sql for sql in statements if 'FROM "jobs_job"' in sql]), 1)
+        self.assertEqual(len([sql for sql in statements if sql.startswith("UPDATE")]), 1)
+
+    def test_bulk_patch_rejects_foreign_jobs(self):
+        mine = make_job(self.recruiter)
+        theirs = make_job(self.other, title="Someone else's role")
+        payload = [{"id": mine.pk, "title": "Hijacked title"}, {"id": theirs.pk, "title": "Hijacked title"}]
+        res = self.client.patch("/api/jobs/bulk/", payload, format="json")
+        self.assertEqual(res.status_code, 403)
+        self.assertEqual([r["id"] for r in res.data["results"]], [theirs.pk])
+        mine.refresh_from_db()
+        self.assertEqual(mine.title, "Junior Python Developer")
+
+    def test_bulk_close_and_reopen(self):
+        open_job = make_job(self.recruiter)
+        draft = make_job(self.recruiter, status="draft")
+        res = self.client.post("/api/jobs/bulk/close/", {"ids": [open_job.pk, draft.pk]}, format="json")
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual([r["result"] for r in res.data["results"]], ["closed", "unchanged"])
+        self.assertEqual(Job.objects.get(pk=open_job.pk).status, "closed")
+
+        res = self.client.post("/api/jobs/bulk/reopen/", {"ids": [open_job.pk]}, format="json")
+        self.assertEqual(res.data["results"][0]["result"], "open")
+        self.assertEqual(Job.objects.get(pk=open_job.pk).status, "open")
+
+        # reopen מפרסם גם טיוטה
+        res = self.client.post("/api/jobs/bulk/reopen/", {"ids": [draft.pk]}, format="json")
+        self.assertEqual(res.data["results"][0]["result"], "open")
+
+    def test_bulk_status_field_is_stored_or_rejected(self):
+        payload = self._payload(2)
+        payload[0]["status"] = "open"
+        res = self.client.post("/api/jobs/bulk/", payload, format="json")
+        self.assertEqual(res.status_code, 201, res.data)
+        ids = [item["id"] for item in res.data["results"]]
+        self.assertEqual([Job.objects.get(pk=pk).status for pk in ids], ["open", "draft"])
+
+        # שדות לא מוכרים / לקריאה בלבד - 400 ולא "created" שקט
+        payload = self._payload(1)
+        payload[0].update(applications_count=3, salary=1)
+        res = self.client.post("/api/jobs/bulk/", payload, format="json")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(set(res.data["results"][0]["errors"]), {"applications_count", "salary"})
+
+        # עדכון - פרסום טיוטה מותר, חזרה לטיוטה לא
+        res = self.client.patch("/api/jobs/bulk/", [{"id": ids[1], "status": "open"}], format="json")
+        self.assertEqual(res.status_code, 200, res.data)
+        self.assertEqual(Job.objects.get(pk=ids[1]).status, "open")
+        res = self.client.patch("/api/jobs/bulk/", [{"id": ids[0], "status": "draft"}], format="json")
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("status", res.data["results"][0]["errors"])
+
+    def test_bulk_status_missing_job(self):
+        res = self.client.post("/api/jobs/bulk/close/", {"ids": [999999]}, format="json")
+        self.assertEqual(res.status_code, 404)
+
+    def test_seeker_cannot_use_bulk(self):
+        self.client.force_authenticate(self.seeker)
+        res = self.client.post("/api/jobs/bulk/", self._payload(1), format="json")
+        self.assertEqual(res.status_code, 403)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class FieldTrackingTests(APITestCase):
+    """FieldTrackerMixin - ערכים קודמים בלי SELECT נוסף"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+        cls.seeker = User.objects.create_user(email="js@example.com", password="x", role=Roles.SEEKER)
+        cls.job = make_job(cls.recruiter)
+        Application.objects.create(job=cls.job, applicant=cls.seeker)
+
+    def test_changed_fields_and_previous(self):
+        app = Application.objects.get(job=self.job)
+        self.assertEqual(app.changed_fields, set())
+        app.status = "accepted"
+        self.assertEqual(app.changed_fields, {"status"})
+        self.assertEqual(app.previous("status"), "pending")
+        app.save()
+        self.assertEqual(app.changed_fields, set())
+        self.assertEqual(app.previous("status"), "accepted")
+
+    def test_partial_save_keeps_unsaved_changes(self):
+        job = Job.objects.get(pk=self.job.pk)
+        job.status, job.max_applicants = "closed", 3
+        job.save(update_fields=["status"])
+        self.assertEqual(job.changed_fields, {"max_applicants"})
+
+    def test_status_update_is_a_single_update(self):
+        app = Application.objects.select_related("job").get(job=self.job)
+        app.status = "rejected"
+        with CaptureQueriesContext(connection) as ctx:
+            app.save()
+        statements = [q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]]
+        # UPDATE המועמדות + INSERT ל-outbox (התראת שינוי סטטוס), ואז rollups של statsapi:
+        # הסטטוס הישן -1 (UPDATE) והחדש +1 (upsert) - למגייס ולמועמד; טבלאות הסיכום (בלי סטטוס)
+        # לא משתנות. בלי SELECT ובלי עדכון מונה
+        self.assertEqual(
+            [sql.split()[0] for sql in statements], ["UPDATE", "INSERT", "UPDATE", "INSERT", "UPDATE", "INSERT"],
+            statements,
+        )
+
+    def test_withdraw_bumps_counter(self):
+        app = Application.objects.get(job=self.job)
+        app.status = "withdrawn"
+        app.save()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, 0)
+        app.status = "pending"
+        app.save()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ApplicationSyncTests(APITestCase):
+    """/api/applications/sync/ - רק מה שהשתנה מאז ה-token, ו-tombstones למחיקות"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+        cls.seeker = User.objects.create_user(email="js@example.com", password="x", role=Roles.SEEKER)
+        cls.jobs = [make_job(cls.recruiter, title=f"Job {i}") for i in range(3)]
+
+    def setUp(self):
+        self.apps = [Application.objects.create(job=job, applicant=self.seeker) for job in self.jobs]
+        self.client.force_authenticate(self.seeker)
+
+    def _sync(self, token=None, **params):
+        if token:
+            params["since"] = token
+        res = self.client.get("/api/applications/sync/", params)
+        self.assertEqual(res.status_code, 200, res.content)
+        return res.data
+
+    def _drain(self, token=None, limit=100):
+        ids, deleted = [], []
+        while True:
+            data = self._sync(token, limit=limit)
+            ids += [row["id"] for row in data["results"]]
+            deleted += data["deleted"]
+            token = data["next"]
+            if not data["has_more"]:
+                return ids, deleted, token
+
+    def test_initial_sync_pages_then_deltas_only(self):
+        ids, deleted, token = self._drain(limit=2)
+        self.assertEqual(sorted(ids), sorted(a.pk for a in self.apps))
+        self.assertEqual(deleted, [])
+        self.assertEqual(self._drain(token)[:2], ([], []))
+
+        Application.objects.filter(pk=self.apps[0].pk).update(status="accepted")
+        self.apps[1].cover_letter = "updated"
+        self.apps[1].save()
+        data = self._sync(token)
+        self.assertEqual({row["id"]: row["status"] for row in data["results"]},
+                         {self.apps[0].pk: "accepted", self.apps[1].pk: "pending"})
+
+    def test_deletes_become_tombstones_for_both_sides(self):
+        token = self._drain()[2]
+        self.client.force_authenticate(self.recruiter)
+        recruiter_token = self._drain()[2]
+
+        deleted_id = self.apps[2].pk
+        self.jobs[2].delete()  # cascade
+        self.assertEqual(self._drain(recruiter_token)[:2], ([], [deleted_id]))
+        self.client.force_authenticate(self.seeker)
+        self.assertEqual(self._drain(token)[:2], ([], [deleted_id]))
+
+    def test_delta_cost_does_not_grow_with_history(self):
+        token = self._drain()[2]
+        with self.assertNumQueries(3):  # watermark + שורות + tombstones
+            self._sync(token)
+
+    def test_change_stamped_before_the_token_is_not_skipped(self):
+        # טרנזקציה שלקחה את updated_at מזמן ועשתה commit רק עכשיו (lock, outbox איטי) -
+        # הסדר לפי sync_seq (commit), לא לפי השעון
+        token = self._drain()[2]
+        stale = timezone.now() - timedelta(minutes=10)
+        Application.objects.filter(pk=self.apps[0].pk).update(status="accepted", updated_at=stale)
+        ids, _, token = self._drain(token)
+        self.assertEqual(ids, [self.apps[0].pk])
+        self.assertEqual(self._drain(token)[:2], ([], []))
+
+    def test_old_updated_at_token_requires_full_resync(self):
+        legacy = base64.urlsafe_b64encode(json.dumps(
+            {"r": [timezone.now().isoformat(), 1], "t": [timezone.now().isoformat(), 0]}
+        ).encode()).decode()
+        res = self.client.get("/api/applications/sync/", {"since": legacy})
+        self.assertEqual(res.status_code, 410)
+
+    def test_bad_and_expired_tokens(self):
+        res = self.client.get("/api/applications/sync/", {"since": "garbage"})
+        self.assertEqual(res.status_code, 400)
+        token = self._drain()[2]
+        with mock.patch("config.sync.timezone.now", return_value=timezone.now() + timedelta(days=31)):
+            res = self.client.get("/api/applications/sync/", {"since": token})
+        self.assertEqual(res.status_code, 410)
@@ -1,7 +1,9 @@
 from django.views.generic import ListView, DetailView, CreateView
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import HttpResponseRedirect
+from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
-from .models import Job, Application
+from .models import Job, Application, ApplyError
 from .forms import JobForm, ApplicationForm
 
 
@@ -42,9 +44,13 @@ class ApplicationCreateView(LoginRequiredMixin, CreateView):
     template_name = 'jobs/application_form.html'
     
     def form_valid(self, form):
-        form.instance.applicant = self.request.user
-        form.instance.job_id = self.kwargs['job_id']
-        return super().form_valid(form)
+        job = get_object_or_404(Job, pk=self.kwargs['job_id'])
+        try:
+            self.object = Application.objects.apply(job, self.request.user, **form.cleaned_data)
+        except ApplyError as exc:
+            form.add_error(None, exc.message)
+            return self.form_invalid(form)
+        return HttpResponseRedirect(self.get_success_url())
     
     def get_success_url(self):
         return reverse_lazy('jobs:job-detail', kwargs={'pk': self.kwargs['job_id']})
\ No newline at end of file
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Notification
+from .models import Notification, NotificationArchive, NotificationOutbox
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
@@ -7,3 +7,16 @@ class NotificationAdmin(admin.ModelAdmin):
     list_filter = ("type", "is_read", "created_at")
     search_fields = ("title", "message", "to_user__email")
 
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ("id", "to_user", "type", "title", "created_at")
+    list_filter = ("type",)
+
+
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ("id", "to_user", "type", "title", "is_read", "created_at", "archived_at")
+    list_filter = ("type",)
+    search_fields = ("to_user__email",)
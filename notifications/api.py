@@ -1,27 +1,73 @@
+from django.db.models import Count, Max
+from django.utils import timezone
 from rest_framework import viewsets, permissions, decorators, response, status
-from .models import Notification
+from config.conditional import conditional_get, make_etag
+from config.pagination import IdKeysetPagination
+from config.sync import sync_delta
+from .counters import adjust_unread, bump_list_version, list_version, unread_count
+from .models import Notification, NotificationTombstone
 from .serializers import NotificationSerializer
 
 class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     """
     קריאה בלבד: רשימת ההתראות שלי + סימון כנקרא.
+    unread_count - badge מ-Redis (notifications/counters.py), בלי שאילתה כשהמונה קיים.
+    sync - deltas מאז token (config/sync.py) במקום למשוך שוב את כל הרשימה.
     """
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = IdKeysetPagination
 
     def get_queryset(self):
         return Notification.objects.filter(to_user=self.request.user)
 
+    def list(self, request, *args, **kwargs):
+        # validators: max(id) (חדשות), max(sync_seq) (כל שורה שנכתבה - סימון כנקרא, שורה מאוחדת
+        # שעודכנה) - seek על (to_user, -id) ו-(to_user, sync_seq, id), בלי לעבור על ההיסטוריה;
+        # מחיקות וסימון כנקרא מעלים גם את גרסת הרשימה ב-Redis (notifications/counters.py)
+        version = list_version(request.user.pk)
+        aggregates = {"last_id": Max("id"), "last_change": Max("sync_seq")}
+        if version is None:
+            # Redis לא זמין - מחיקה של שורה שאינה האחרונה נחשפת רק בספירה
+            aggregates["total"] = Count("id")
+        state = self.get_queryset().aggregate(**aggregates)
+        etag = make_etag(
+            "notifications", request.user.pk, version, state,
+            sorted(request.query_params.lists()), request.accepted_renderer.format,
+        )
+        return conditional_get(request, lambda: super(NotificationViewSet, self).list(request, *args, **kwargs), etag=etag)
+
     @decorators.action(detail=True, methods=["post"])
     def read(self, request, pk=None):
         obj = self.get_object()
         if not obj.is_read:
+            # UPDATE מותנה - שתי בקשות מקבילות לא יורידו את המונה פעמיים
+            if Notification.objects.filter(pk=obj.pk, is_read=False).update(is_read=True, updated_at=timezone.now()):
+                adjust_unread({request.user.pk: -1})
+                bump_list_version([request.user.pk])
             obj.is_read = True
-            obj.save(update_fields=["is_read"])
         return response.Response({"status": "ok", "id": obj.id, "is_read": obj.is_read})
 
     @decorators.action(detail=False, methods=["post"])
     def read_all(self, request):
         qs = Notification.objects.filter(to_user=request.user, is_read=False)
-        updated = qs.update(is_read=True)
+        updated = qs.update(is_read=True, updated_at=timezone.now())
+        adjust_unread({request.user.pk: -updated})
+        if updated:
+            bump_list_version([request.user.pk])
         return response.Response({"status": "ok", "updated": updated}, status=status.HTTP_200_OK)
+
+    @decorators.action(detail=False, methods=["get"])
+    def unread_count(self, request):
+        return response.Response({"unread": unread_count(request.user.pk)})
+
+    @decorators.action(detail=False, methods=["get"])
+    def sync(self, request):
+        """GET /api/notifications/sync/?since=<token> - חדשות/שהשתנו + ids שנמחקו"""
+        return response.Response(sync_delta(
+            request,
+            self.get_queryset(),
+            NotificationTombstone.objects.filter(to_user=request.user),
+            self.get_serializer_class(),
+            self.get_serializer_context(),
+        ))
@@ -1,9 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
 
 class NotificationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "notifications"
 
     def ready(self):
+        from config.sync import repair_sync_seq
         from . import signals  # noqa
-
+        # SQLite בונה טבלאות מחדש במיגרציות מסוימות ומוחק את ה-triggers של sync_seq
+        post_migrate.connect(repair_sync_seq, sender=self)
@@ -0,0 +1,132 @@
+# notifications/broker.py
+"""
+pub/sub להתראות בזמן אמת (SSE / long-poll ב-notifications/stream.py).
+
+- InProcessBroker: fan-out מקומי ל-asyncio.Queue של כל חיבור פתוח.
+  לבדיקות ולהרצה על node אחד (NOTIFICATIONS_BROKER = "memory").
+- RedisBroker: publish ל-channel notifications:user:<id>. כל event loop (worker)
+  מחזיק חיבור pub/sub אחד בלבד (PSUBSCRIBE) ומפזר מקומית - 10k חיבורים פתוחים
+  הם 10k תורים בזיכרון, לא 10k חיבורי Redis ולא 10k threads.
+
+publish הוא סינכרוני ואפשר לקרוא לו מכל thread (למשל מה-worker של ה-outbox).
+הודעה: {"event": "notification" | "notification.updated", "notifications": [...]}.
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import threading
+from collections import defaultdict
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "notifications:user:"
+RECONNECT_DELAY = 1.0
+
+
+class InProcessBroker:
+    def __init__(self):
+        self._subscribers = defaultdict(set)  # user_id -> {(loop, queue)}
+        self._lock = threading.Lock()
+
+    def publish(self, user_id, message):
+        self._deliver(user_id, message)
+
+    def _deliver(self, user_id, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+            except RuntimeError:  # ה-loop של החיבור כבר נסגר
+                pass
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, user_id):
+        """async with broker.subscribe(user_id) as queue: await queue.get() -> הודעה"""
+        entry = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._subscribers[user_id].add(entry)
+        try:
+            await self._on_subscribe()
+            yield entry[1]
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(user_id)
+                if subscribers is not None:
+                    subscribers.discard(entry)
+                    if not subscribers:
+                        del self._subscribers[user_id]
+
+    async def _on_subscribe(self):
+        pass
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+class RedisBroker(InProcessBroker):
+    def __init__(self, url):
+        super().__init__()
+        self._url = url
+        self._client = None
+        self._listeners = {}  # loop -> task
+
+    def _sync_client(self):
+        if self._client is None:
+            self._client = redis.Redis.from_url(self._url, socket_connect_timeout=0.25, socket_timeout=0.25)
+        return self._client
+
+    def publish(self, user_id, message):
+        try:
+            self._sync_client().publish(f"{CHANNEL_PREFIX}{user_id}", json.dumps(message))
+        except Exception as exc:  # redis.ConnectionError, TimeoutError וכו'
+            # Redis לא זמין - לפחות החיבורים של התהליך הזה יקבלו את ההתראה
+            logger.warning("notifications broker unavailable: %s", exc)
+            self._deliver(user_id, message)
+
+    async def _on_subscribe(self):
+        loop = asyncio.get_running_loop()
+        task = self._listeners.get(loop)
+        if task is None or task.done():
+            self._listeners[loop] = loop.create_task(self._listen())
+
+    async def _listen(self):
+        while True:
+            client = aioredis.from_url(self._url)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                    async for message in pubsub.listen():
+                        if message["type"] != "pmessage":
+                            continue
+                        user_id = int(message["channel"][len(CHANNEL_PREFIX):])
+                        self._deliver(user_id, json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("notifications broker unavailable: %s", exc)
+                await asyncio.sleep(RECONNECT_DELAY)
+            finally:
+                await client.aclose()
+
+
+_brokers = {}
+_brokers_lock = threading.Lock()
+
+
+def get_broker():
+    """ה-broker של התהליך לפי NOTIFICATIONS_BROKER ("redis" / "memory")"""
+    kind = getattr(settings, "NOTIFICATIONS_BROKER", "memory")
+    with _brokers_lock:
+        if kind not in _brokers:
+            if kind == "redis":
+                _brokers[kind] = RedisBroker(settings.NOTIFICATIONS_REDIS_URL)
+            else:
+                _brokers[kind] = InProcessBroker()
+        return _brokers[kind]
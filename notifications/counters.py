@@ -0,0 +1,103 @@
+# notifications/counters.py
+"""
+מונה התראות שלא נקראו לכל משתמש ב-Redis (badge ב-/api/notifications/unread_count/).
+
+- עולה כשה-worker יוצר התראות (deliver_notifications), יורד ב-read / read_all.
+  העדכונים רצים אחרי commit.
+- incr/decr רק אם המפתח קיים (django_redis עושה זאת אטומית) - מפתח חסר נבנה
+  מחדש מה-DB בקריאה הבאה (COUNT על האינדקס to_user, is_read, -id).
+- למפתח יש TTL, כך שסטייה נדירה (מחיקת משתמש/התראות, מרוץ בבנייה מחדש) מתקנת את עצמה.
+- אם Redis לא זמין - COUNT ישיר מה-DB, בלי שגיאה.
+
+גרסת רשימה לכל משתמש (validator ל-ETag של /api/notifications/): עולה במחיקה ובסימון
+כנקרא - שינויים ש-max(id) / max(sync_seq) לבדם לא תמיד חושפים (מחיקה של שורה ישנה).
+"""
+import logging
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+UNREAD_TTL = 60 * 60
+LIST_VERSION_TTL = 24 * 60 * 60
+_UNAVAILABLE = object()
+
+
+def _unread_key(user_id):
+    return f"notifications:unread:{user_id}"
+
+
+def _list_version_key(user_id):
+    return f"notifications:list_version:{user_id}"
+
+
+def _safe(fn, *args, default=None, **kwargs):
+    try:
+        return fn(*args, **kwargs)
+    except ValueError:  # המפתח לא קיים - ייבנה מחדש בקריאה הבאה
+        return default
+    except Exception as exc:  # redis.ConnectionError, TimeoutError וכו'
+        logger.warning("notifications cache unavailable: %s", exc)
+        return default
+
+
+def _adjust(deltas):
+    for user_id, delta in deltas.items():
+        if not delta:
+            continue
+        key = _unread_key(user_id)
+        value = _safe(cache.incr, key, delta)
+        if value is not None and value < 0:
+            _safe(cache.delete, key)  # סטייה - נבנה מחדש מה-DB
+
+
+def adjust_unread(deltas):
+    """deltas - {user_id: +n/-n}; מתבצע אחרי commit"""
+    deltas = dict(deltas)
+    transaction.on_commit(lambda: _adjust(deltas))
+
+
+def unread_count(user_id):
+    """מספר ההתראות שלא נקראו - מ-Redis, או COUNT מה-DB (ושמירה) אם המפתח חסר"""
+    key = _unread_key(user_id)
+    value = _safe(cache.get, key, default=_UNAVAILABLE)
+    if value is not _UNAVAILABLE and value is not None:
+        return value
+    count = Notification.objects.filter(to_user_id=user_id, is_read=False).count()
+    if value is None:
+        _safe(cache.add, key, count, timeout=UNREAD_TTL)
+    return count
+
+
+def _bump_list_versions(user_ids):
+    for user_id in user_ids:
+        _safe(cache.incr, _list_version_key(user_id))  # מפתח חסר - ייווצר מחדש בקריאה הבאה
+
+
+def bump_list_version(user_ids):
+    """מחיקה / סימון כנקרא - משנה את ה-ETag של רשימת ההתראות; מתבצע אחרי commit"""
+    user_ids = set(user_ids)
+    if user_ids:
+        transaction.on_commit(lambda: _bump_list_versions(user_ids))
+
+
+def list_version(user_id):
+    """
+    גרסת רשימת ההתראות של המשתמש, או None אם Redis לא זמין.
+    מפתח חסר (חדש / eviction / TTL) מאותחל לפי הזמן ולא ל-1 - לא חוזרים לגרסה שכבר
+    הופיעה ב-ETag של לקוח.
+    """
+    key = _list_version_key(user_id)
+    value = _safe(cache.get, key, default=_UNAVAILABLE)
+    if value is _UNAVAILABLE:
+        return None
+    if value is None:
+        initial = time.time_ns() // 1000
+        if _safe(cache.add, key, initial, timeout=LIST_VERSION_TTL):
+            return initial
+        value = _safe(cache.get, key)
+    return value
@@ -0,0 +1,161 @@
+# notifications/management/commands/bench_stream.py
+import asyncio
+import resource
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import Roles
+from notifications.broker import get_broker
+
+User = get_user_model()
+
+STREAM_PATH = "/api/notifications/stream/"
+
+
+def _rss_mb():
+    """RSS נוכחי (Linux: /proc); אחרת - השיא (ru_maxrss)"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _bench_users(count):
+    emails = [f"bench-stream-{i}@example.com" for i in range(count)]
+    existing = set(User.objects.filter(email__in=emails).values_list("email", flat=True))
+    missing = []
+    for email in emails:
+        if email not in existing:
+            user = User(email=email, username=email, role=Roles.SEEKER)
+            user.set_unusable_password()
+            missing.append(user)
+    User.objects.bulk_create(missing)
+    return list(User.objects.filter(email__in=emails).order_by("pk"))
+
+
+class _Connection:
+    """לקוח SSE אחד מול אפליקציית ה-ASGI - בלי socket, רק הודעות ASGI"""
+
+    def __init__(self, bench, token):
+        self.bench = bench
+        self.token = token
+        self.request_sent = False
+
+    async def receive(self):
+        if not self.request_sent:
+            self.request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.bench.disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            self.bench.failed += 1
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            if body.startswith(b"retry:"):
+                self.bench.mark("connected")
+            elif b"event: notification" in body:
+                self.bench.mark("received")
+
+    async def run(self, app):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": STREAM_PATH,
+            "raw_path": STREAM_PATH.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"localhost"), (b"authorization", f"Bearer {self.token}".encode())],
+            "client": ("127.0.0.1", 0),
+            "server": ("localhost", 80),
+        }
+        await app(scope, self.receive, self.send)
+
+
+class _Bench:
+    def __init__(self, connections):
+        self.connections = connections
+        self.failed = 0
+        self.counts = {"connected": 0, "received": 0}
+        self.events = {"connected": asyncio.Event(), "received": asyncio.Event()}
+        self.disconnect = asyncio.Event()
+
+    def mark(self, name):
+        self.counts[name] += 1
+        if self.counts[name] + self.failed >= self.connections:
+            self.events[name].set()
+
+
+class Command(BaseCommand):
+    help = (
+        "מחזיק N חיבורי SSE פתוחים ל-/api/notifications/stream/ (אפליקציית ה-ASGI, event loop אחד) "
+        "ומודד זיכרון, threads ו-latency של fan-out."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--connections", type=int, default=10_000)
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--broker", choices=["memory", "redis"], default="memory")
+        parser.add_argument("--timeout", type=float, default=300)
+
+    def handle(self, *args, connections, users, broker, timeout, **options):
+        bench_users = _bench_users(users)
+        tokens = [str(AccessToken.for_user(user)) for user in bench_users]
+        with override_settings(NOTIFICATIONS_BROKER=broker):
+            asyncio.run(self._run(connections, tokens, [user.pk for user in bench_users], timeout))
+
+    async def _run(self, connections, tokens, user_ids, timeout):
+        from config.asgi import application
+
+        bench = _Bench(connections)
+        threads_before, rss_before = threading.active_count(), _rss_mb()
+
+        start = time.perf_counter()
+        clients = [
+            asyncio.ensure_future(_Connection(bench, tokens[i % len(tokens)]).run(application))
+            for i in range(connections)
+        ]
+        await asyncio.wait_for(bench.events["connected"].wait(), timeout)
+        connect_s = time.perf_counter() - start
+        await asyncio.sleep(1)  # חיבורים במצב idle
+
+        rss_idle, threads_idle = _rss_mb(), threading.active_count()
+        self.stdout.write(f"connections open:   {bench.counts['connected']} (failed: {bench.failed})")
+        self.stdout.write(f"connect time:       {connect_s:.2f} s")
+        self.stdout.write(f"threads:            {threads_before} -> {threads_idle}")
+        self.stdout.write(
+            f"RSS:                {rss_before:.1f} -> {rss_idle:.1f} MB "
+            f"(~{(rss_idle - rss_before) * 1024 / max(connections, 1):.1f} KB/connection)"
+        )
+        self.stdout.write(f"broker subscribers: {get_broker().subscriber_count()}")
+
+        # fan-out: הודעה אחת לכל משתמש -> כל החיבורים שלו
+        start = time.perf_counter()
+        broker = get_broker()
+        for user_id in user_ids:
+            broker.publish(user_id, {
+                "event": "notification",
+                "notifications": [{"id": 2**62, "type": "GENERAL", "title": "bench", "to_user": user_id}],
+            })
+        await asyncio.wait_for(bench.events["received"].wait(), timeout)
+        self.stdout.write(
+            f"fan-out:            {bench.counts['received']} events in "
+            f"{(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+
+        bench.disconnect.set()
+        await asyncio.gather(*clients, return_exceptions=True)
+        self.stdout.write(f"after disconnect:   {get_broker().subscriber_count()} subscribers")
@@ -0,0 +1,33 @@
+# notifications/management/commands/deliver_notifications.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.services import DELIVERY_BATCH_SIZE, deliver_digests, deliver_notifications
+
+
+class Command(BaseCommand):
+    help = "Worker: מרוקן את NotificationOutbox להתראות (bulk_create) ב-batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DELIVERY_BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="לרוץ ברציפות (אחרת - עד שה-outbox ריק)")
+        parser.add_argument("--interval", type=float, default=1.0, help="שניות המתנה כשה-outbox ריק (עם --loop)")
+        parser.add_argument("--digest", action="store_true", help="רק לגלגל אירועי digest לסיכום (להרצה מ-cron)")
+
+    def handle(self, *args, batch_size, loop, interval, digest, **options):
+        if digest:
+            self.stdout.write(self.style.SUCCESS(f"delivered {deliver_digests()} digest(s)"))
+            return
+        total = 0
+        try:
+            while True:
+                delivered = deliver_notifications(batch_size)
+                total += delivered
+                if delivered < batch_size:
+                    if not loop:
+                        break
+                    time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"delivered {total} notification(s)"))
@@ -0,0 +1,47 @@
+# notifications/management/commands/prune_notifications.py
+from django.core.management.base import BaseCommand, CommandError
+
+from notifications.retention import ARCHIVE_BACKENDS, apply_policy, get_policies
+
+
+class Command(BaseCommand):
+    help = (
+        "מוחק/מעביר לארכיון התראות ישנות לפי NOTIFICATIONS_RETENTION, ב-batches קטנים עם sleep ביניהם. "
+        "המקום מתפנה לשימוש חוזר מיד; החזרת נפח לדיסק - VACUUM (autovacuum ב-PostgreSQL)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--sleep", type=float, default=0.1, help="שניות המתנה בין batches")
+        parser.add_argument("--policy", action="append", dest="policies", help="רק המדיניות האלה (לפי name)")
+        parser.add_argument("--archive", choices=ARCHIVE_BACKENDS, help="ברירת מחדל: NOTIFICATIONS_ARCHIVE")
+        parser.add_argument("--archive-dir", help="תיקייה לקבצי jsonl.gz (ברירת מחדל: NOTIFICATIONS_ARCHIVE_DIR)")
+        parser.add_argument("--dry-run", action="store_true", help="רק לדווח, בלי למחוק (כל מדיניות נספרת בנפרד)")
+
+    def handle(self, *args, batch_size, sleep, policies, archive, archive_dir, dry_run, **options):
+        selected = get_policies()
+        if policies:
+            unknown = set(policies) - {policy["name"] for policy in selected}
+            if unknown:
+                raise CommandError(f"unknown retention policy: {', '.join(sorted(unknown))}")
+            selected = [policy for policy in selected if policy["name"] in policies]
+
+        total_rows = total_bytes = 0
+        for policy in selected:
+            try:
+                result = apply_policy(
+                    policy, batch_size=batch_size, sleep=sleep, archive=archive,
+                    archive_dir=archive_dir, dry_run=dry_run,
+                )
+            except ValueError as exc:
+                raise CommandError(str(exc))
+            verb = "would remove" if dry_run else f"{policy.get('action', 'delete')}d"
+            line = f"{policy['name']} (>{policy['days']}d): {verb} {result['rows']} notification(s), ~{result['bytes']} bytes"
+            if result["path"]:
+                line += f" -> {result['path']}"
+            self.stdout.write(line)
+            total_rows += result["rows"]
+            total_bytes += result["bytes"]
+
+        verb = "would reclaim" if dry_run else "reclaimed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {total_rows} row(s), ~{total_bytes} bytes"))
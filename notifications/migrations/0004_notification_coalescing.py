@@ -0,0 +1,44 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_notification_unread_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='group_key',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='notificationoutbox',
+            name='digest',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='notificationoutbox',
+            name='group_key',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='type',
+            field=models.CharField(choices=[('APPLICATION_RECEIVED', 'Application received'), ('APPLICATION_STATUS', 'Application status update'), ('GENERAL', 'General'), ('DIGEST', 'Digest')], max_length=40),
+        ),
+        migrations.AlterField(
+            model_name='notificationoutbox',
+            name='type',
+            field=models.CharField(choices=[('APPLICATION_RECEIVED', 'Application received'), ('APPLICATION_STATUS', 'Application status update'), ('GENERAL', 'General'), ('DIGEST', 'Digest')], max_length=40),
+        ),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_read', False), models.Q(('group_key', ''), _negated=True)), fields=('to_user', 'type', 'group_key'), name='notif_open_group_uniq'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_notification_coalescing'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('type', models.CharField(choices=[('APPLICATION_RECEIVED', 'Application received'), ('APPLICATION_STATUS', 'Application status update'), ('GENERAL', 'General'), ('DIGEST', 'Digest')], max_length=40)),
+                ('title', models.CharField(max_length=120)),
+                ('message', models.TextField(blank=True)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('is_read', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('to_user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['to_user', '-id'], name='notif_archive_user_idx')],
+            },
+        ),
+    ]
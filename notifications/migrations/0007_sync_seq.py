@@ -0,0 +1,55 @@
+# Generated by Django 5.1.2 on 2026-10-18 17:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+from config.sync import install_sync_seq, uninstall_sync_seq
+
+# שורות קיימות נשארות עם sync_seq=0 - tokens לפי updated_at מקבלים 410 (סנכרון מלא) בכל מקרה
+TABLES = ['notifications_notification', 'notifications_notificationtombstone']
+
+
+def install(apps, schema_editor):
+    install_sync_seq(schema_editor.connection, TABLES)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_sync_seq(schema_editor.connection, TABLES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0006_notification_sync'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notif_user_sync_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='notificationtombstone',
+            name='notif_tombstone_sync_idx',
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='sync_seq',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='notificationtombstone',
+            name='sync_seq',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['to_user', 'sync_seq', 'id'], name='notif_user_sync_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificationtombstone',
+            index=models.Index(fields=['to_user', 'sync_seq', 'id'], name='notif_tombstone_sync_idx'),
+        ),
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-18 17:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0007_sync_seq'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['to_user', '-id'], name='notif_user_recent_idx'),
+        ),
+    ]
@@ -6,17 +6,113 @@ class Notification(models.Model):
         APPLICATION_RECEIVED = "APPLICATION_RECEIVED", "Application received"
         APPLICATION_STATUS   = "APPLICATION_STATUS",   "Application status update"
         GENERAL              = "GENERAL",              "General"
+        DIGEST               = "DIGEST",               "Digest"
 
-    to_user   = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="notifications")
+    # בלי אינדקס FK נפרד - to_user הוא הקידומת של notif_user_recent_idx
+    to_user   = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="notifications", db_index=False)
     type      = models.CharField(max_length=40, choices=Types.choices)
     title     = models.CharField(max_length=120)
     message   = models.TextField(blank=True)
     payload   = models.JSONField(default=dict, blank=True)  # לדוגמה: {"job_id":1,"application_id":10,"status":"PENDING"}
     is_read   = models.BooleanField(default=False)
+    # קבוצת איחוד (למשל "job:42") - אירועים נוספים באותה קבוצה מעדכנים את payload["count"]
+    # של השורה הפתוחה במקום שורה חדשה. ריק = לא מתאחד / הקבוצה נסגרה.
+    group_key = models.CharField(max_length=64, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
+    # סנכרון אינקרמנטלי (/api/notifications/sync/) - גם UPDATE-ים ב-queryset מעדכנים אותו
+    updated_at = models.DateTimeField(auto_now=True)
+    # סדר ה-commit של השינוי האחרון - מוחתם ע"י trigger ב-DB (config/sync.py), לא ע"י ה-ORM
+    sync_seq = models.BigIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["-id"]
+        indexes = [
+            # רשימת ההתראות של משתמש (WHERE to_user ORDER BY -id, keyset לפי id) - בלי מיון;
+            # ב-notif_user_unread_idx הסדר לפי id הוא רק בתוך כל ערך של is_read
+            models.Index(fields=["to_user", "-id"], name="notif_user_recent_idx"),
+            # badge (COUNT לא-נקראו) + רשימת הלא-נקראו
+            models.Index(fields=["to_user", "is_read", "-id"], name="notif_user_unread_idx"),
+            models.Index(fields=["to_user", "sync_seq", "id"], name="notif_user_sync_idx"),
+        ]
+        constraints = [
+            # לכל היותר קבוצה פתוחה אחת (לא נקראה) לכל משתמש+סוג+מפתח - שומר על איחוד בטוח
+            # גם כששני workers מעבדים אירועים של אותה קבוצה במקביל
+            models.UniqueConstraint(
+                fields=["to_user", "type", "group_key"],
+                condition=models.Q(is_read=False) & ~models.Q(group_key=""),
+                name="notif_open_group_uniq",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.to_user_id} · {self.type} · {self.title[:30]}"
+
+
+class NotificationTombstone(models.Model):
+    """התראה שנמחקה (prune_notifications) - נשלחת ב-deleted של /api/notifications/sync/"""
+    object_id  = models.BigIntegerField()
+    to_user    = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+", db_index=False)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    sync_seq   = models.BigIntegerField(default=0, editable=False)  # trigger (config/sync.py)
+
+    class Meta:
+        indexes = [models.Index(fields=["to_user", "sync_seq", "id"], name="notif_tombstone_sync_idx")]
+
+    def __str__(self):
+        return f"deleted #{self.object_id} → {self.to_user_id}"
+
+
+class NotificationOutbox(models.Model):
+    """
+    תור התראות עמיד (transactional outbox): נכתב באותה טרנזקציה של האירוע
+    (למשל הגשת מועמדות), ומרוקן ל-Notification ע"י ה-worker
+    (python manage.py deliver_notifications). worker שקרס לא מאבד אירועים -
+    שורה נמחקת רק באותה טרנזקציה שבה נוצרה ההתראה.
+    """
+    to_user    = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    type       = models.CharField(max_length=40, choices=Notification.Types.choices)
+    title      = models.CharField(max_length=120)
+    message    = models.TextField(blank=True)
+    payload    = models.JSONField(default=dict, blank=True)
+    group_key  = models.CharField(max_length=64, blank=True, default="")
+    # True - נאסף לסיכום תקופתי (deliver_notifications --digest) ולא נמסר מיד
+    digest     = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"outbox #{self.pk} → {self.to_user_id} · {self.type}"
+
+    def to_notification(self):
+        return Notification(
+            to_user_id=self.to_user_id,
+            type=self.type,
+            title=self.title,
+            message=self.message,
+            payload=self.payload,
+        )
+
+
+class NotificationArchive(models.Model):
+    """
+    ארכיון קר להתראות ישנות (python manage.py prune_notifications, פעולת "archive").
+    אותו id כמו ב-Notification; הטבלה החמה נשארת קטנה ו-get_queryset לא סורק היסטוריה.
+    """
+    id          = models.BigIntegerField(primary_key=True)
+    to_user     = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+", db_index=False)
+    type        = models.CharField(max_length=40, choices=Notification.Types.choices)
+    title       = models.CharField(max_length=120)
+    message     = models.TextField(blank=True)
+    payload     = models.JSONField(default=dict, blank=True)
+    is_read     = models.BooleanField(default=False)
+    created_at  = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-id"]
+        indexes = [models.Index(fields=["to_user", "-id"], name="notif_archive_user_idx")]
+
+    def __str__(self):
+        return f"archived #{self.pk} → {self.to_user_id} · {self.type}"
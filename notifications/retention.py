@@ -0,0 +1,168 @@
+# notifications/retention.py
+"""
+מדיניות שמירה להתראות (python manage.py prune_notifications, מ-cron).
+
+settings.NOTIFICATIONS_RETENTION - רשימת מדיניות שרצות לפי הסדר:
+    {"name": "read", "days": 30, "read_only": True, "action": "delete"}
+    {"name": "all", "days": 180, "action": "archive"}
+
+- "delete"  - מחיקה.
+- "archive" - העתקה לארכיון ואז מחיקה. NOTIFICATIONS_ARCHIVE: "table" (NotificationArchive)
+  או "jsonl" (קובץ jsonl.gz ב-NOTIFICATIONS_ARCHIVE_DIR).
+
+העבודה ב-batches קטנים לפי טווח id: טרנזקציה קצרה לכל batch ו-sleep ביניהם, כך שאין
+נעילות ארוכות על הטבלה החמה, ומה שכבר נבדק לא נסרק שוב.
+"""
+import gzip
+import json
+import time
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .counters import adjust_unread, bump_list_version
+from .models import Notification, NotificationArchive, NotificationTombstone
+
+DEFAULT_POLICIES = (
+    {"name": "read", "days": 30, "read_only": True, "action": "delete"},
+    {"name": "all", "days": 180, "action": "archive"},
+)
+ACTIONS = ("delete", "archive")
+ARCHIVE_BACKENDS = ("table", "jsonl")
+# הערכה ל-header + עמודות קבועות (id, to_user_id, is_read, timestamps, group_key ריק)
+ROW_OVERHEAD = 64
+
+
+def get_policies():
+    return list(getattr(settings, "NOTIFICATIONS_RETENTION", DEFAULT_POLICIES))
+
+
+def _row_bytes(notification):
+    """הערכת גודל שורה (לדיווח "bytes reclaimed")"""
+    return (
+        ROW_OVERHEAD
+        + len(notification.title.encode())
+        + len(notification.message.encode())
+        + len(notification.group_key.encode())
+        + len(json.dumps(notification.payload).encode())
+    )
+
+
+def _id_bound(cutoff):
+    """
+    id של ההתראה הראשונה שנוצרה מ-cutoff והלאה (או max+1). id עולה יחד עם created_at,
+    כך שכל השורות הישנות נמצאות מתחתיו וה-batches הם סריקות טווח על ה-PK, בלי אינדקס על created_at.
+    """
+    ids = Notification.objects.order_by("id").values_list("id", flat=True)
+    first_new = ids.filter(created_at__gte=cutoff).first()
+    if first_new is not None:
+        return first_new
+    last = ids.order_by("-id").first()
+    return (last or 0) + 1
+
+
+class _JsonlArchive:
+    """קובץ jsonl.gz אחד להרצה של מדיניות - נפתח רק כשיש מה לכתוב"""
+
+    def __init__(self, directory, name):
+        stamp = timezone.now().strftime("%Y%m%dT%H%M%S")
+        self.path = Path(directory) / f"notifications-{name}-{stamp}.jsonl.gz"
+        self._file = None
+
+    @property
+    def written(self):
+        return self._file is not None
+
+    def write(self, notifications):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = gzip.open(self.path, "at", encoding="utf-8")
+        for n in notifications:
+            self._file.write(json.dumps({
+                "id": n.pk, "to_user": n.to_user_id, "type": n.type, "title": n.title,
+                "message": n.message, "payload": n.payload, "is_read": n.is_read,
+                "created_at": n.created_at,
+            }, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n")
+        # לדיסק לפני שהמחיקה נכנסת - קריסה באמצע משאירה לכל היותר כפילות בארכיון, לא אובדן
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def _archive_to_table(notifications):
+    NotificationArchive.objects.bulk_create(
+        [
+            NotificationArchive(
+                id=n.pk, to_user_id=n.to_user_id, type=n.type, title=n.title, message=n.message,
+                payload=n.payload, is_read=n.is_read, created_at=n.created_at,
+            )
+            for n in notifications
+        ],
+        ignore_conflicts=True,  # הרצה חוזרת אחרי כשל - id כבר בארכיון
+    )
+
+
+def apply_policy(policy, *, batch_size=1000, sleep=0.0, archive=None, archive_dir=None,
+                 dry_run=False, now=None):
+    """
+    מריץ מדיניות אחת. מחזיר {"rows": n, "bytes": הערכה, "path": קובץ ה-jsonl או None}.
+    שורות נעולות ע"י טרנזקציה אחרת מדולגות (SKIP LOCKED) ויטופלו בהרצה הבאה.
+    """
+    action = policy.get("action", "delete")
+    if action not in ACTIONS:
+        raise ValueError(f"unknown retention action {action!r} in policy {policy.get('name')!r}")
+    archive = archive or getattr(settings, "NOTIFICATIONS_ARCHIVE", "table")
+    if action == "archive" and archive not in ARCHIVE_BACKENDS:
+        raise ValueError(f"unknown archive backend {archive!r}")
+
+    cutoff = (now or timezone.now()) - timedelta(days=policy["days"])
+    qs = Notification.objects.filter(created_at__lt=cutoff, pk__lt=_id_bound(cutoff)).order_by("id")
+    if policy.get("read_only"):
+        qs = qs.filter(is_read=True)
+    if not dry_run:
+        qs = qs.select_for_update(skip_locked=True)
+
+    jsonl = None
+    if action == "archive" and archive == "jsonl" and not dry_run:
+        jsonl = _JsonlArchive(archive_dir or settings.NOTIFICATIONS_ARCHIVE_DIR, policy["name"])
+
+    rows = reclaimed = last_id = 0
+    try:
+        while True:
+            with transaction.atomic():
+                batch = list(qs.filter(pk__gt=last_id)[:batch_size])
+                if not batch:
+                    break
+                last_id = batch[-1].pk
+                if not dry_run:
+                    if jsonl is not None:
+                        jsonl.write(batch)
+                    elif action == "archive":
+                        _archive_to_table(batch)
+                    Notification.objects.filter(pk__in=[n.pk for n in batch]).delete()
+                    # לקוחות שמסנכרנים (/api/notifications/sync/) מוחקים גם אצלם
+                    NotificationTombstone.objects.bulk_create(
+                        [NotificationTombstone(object_id=n.pk, to_user_id=n.to_user_id) for n in batch]
+                    )
+                    unread = Counter(n.to_user_id for n in batch if not n.is_read)
+                    adjust_unread({user_id: -count for user_id, count in unread.items()})
+                    bump_list_version(n.to_user_id for n in batch)
+                rows += len(batch)
+                reclaimed += sum(_row_bytes(n) for n in batch)
+            if len(batch) < batch_size:
+                break
+            if sleep:
+                time.sleep(sleep)  # נותן לכתיבות רגילות לעבור בין batches
+    finally:
+        if jsonl is not None:
+            jsonl.close()
+
+    path = jsonl.path if jsonl is not None and jsonl.written else None
+    return {"rows": rows, "bytes": reclaimed, "path": path}
@@ -4,5 +4,5 @@ from .models import Notification
 class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
-        fields = ["id", "type", "title", "message", "payload", "is_read", "created_at"]
+        fields = ["id", "type", "title", "message", "payload", "is_read", "created_at", "updated_at"]
         read_only_fields = fields
@@ -1,10 +1,162 @@
-from .models import Notification
+from collections import Counter, defaultdict
+from datetime import timedelta
 
-def send_notification(*, to_user, type, title, message="", payload=None):
-    return Notification.objects.create(
-        to_user=to_user,
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .broker import get_broker
+from .counters import adjust_unread
+from .models import Notification, NotificationOutbox
+from .serializers import NotificationSerializer
+
+DELIVERY_BATCH_SIZE = 500
+
+# כותרת לשורה מאוחדת (payload["count"] > 1) לפי סוג; סוג שלא מופיע - נשארת הכותרת האחרונה
+COALESCED_TITLES = {
+    Notification.Types.APPLICATION_RECEIVED: "התקבלו {count} מועמדויות חדשות",
+}
+
+
+def send_notification(*, to_user=None, to_user_id=None, type, title, message="", payload=None,
+                      group_key="", digest=False):
+    """
+    מכניס התראה ל-outbox (INSERT אחד, באותה טרנזקציה של הקורא).
+    ההתראה עצמה נוצרת ע"י deliver_notifications (ה-worker) - מחוץ למסלול הבקשה.
+    אפשר להעביר to_user_id במקום to_user כדי לא לטעון את המשתמש.
+    group_key - איחוד עם התראה פתוחה מאותה קבוצה; digest - לסיכום התקופתי (deliver_digests).
+    """
+    return NotificationOutbox.objects.create(
+        to_user_id=to_user_id if to_user is None else to_user.pk,
         type=type,
         title=title,
         message=message or "",
         payload=payload or {},
+        group_key=group_key,
+        digest=digest,
     )
+
+
+def _coalesce_window():
+    return timedelta(seconds=getattr(settings, "NOTIFICATIONS_COALESCE_WINDOW", 30 * 60))
+
+
+def _coalesce(user_id, type, group_key, entries):
+    """
+    מאחד entries (אותו משתמש/סוג/קבוצה) לשורה הפתוחה של הקבוצה, אם נוצרה בתוך החלון;
+    אחרת סוגר אותה ופותח שורה חדשה. מחזיר (notification, created).
+    השורה הפתוחה נעולה (select_for_update), ופתיחה מקבילה נחסמת ע"י notif_open_group_uniq.
+    """
+    latest, count = entries[-1], len(entries)
+    for _ in range(2):
+        current = (
+            Notification.objects.select_for_update()
+            .filter(to_user_id=user_id, type=type, group_key=group_key, is_read=False)
+            .first()
+        )
+        if current is not None and current.created_at >= timezone.now() - _coalesce_window():
+            total = current.payload.get("count", 1) + count
+            current.payload = {**current.payload, **latest.payload, "count": total}
+            current.title = COALESCED_TITLES.get(type, latest.title).format(count=total)
+            current.message = latest.message
+            current.save(update_fields=["payload", "title", "message", "updated_at"])
+            return current, False
+        if current is not None:
+            # החלון עבר - הקבוצה נסגרת (השורה נשארת בפיד כמו שהיא)
+            Notification.objects.filter(pk=current.pk).update(group_key="")
+
+        notification = latest.to_notification()
+        notification.group_key = group_key
+        notification.payload = {**latest.payload, "count": count}
+        if count > 1:
+            notification.title = COALESCED_TITLES.get(type, latest.title).format(count=count)
+        try:
+            with transaction.atomic():
+                notification.save(force_insert=True)
+            return notification, True
+        except IntegrityError:
+            continue  # worker אחר פתח את הקבוצה הרגע - מאחדים לתוכה
+    raise RuntimeError(f"could not coalesce notification group {group_key!r} for user {user_id}")
+
+
+def deliver_notifications(batch_size=DELIVERY_BATCH_SIZE):
+    """
+    מרוקן batch אחד מה-outbox: bulk_create להתראות + מחיקת השורות, בטרנזקציה אחת.
+    אירועים עם group_key מתאחדים (ראו _coalesce); אירועי digest מחכים ל-deliver_digests.
+    מוני ה-badge (notifications/counters.py) עולים ו-streams פתוחים מקבלים את ההתראות - אחרי commit.
+    SKIP LOCKED (ב-PostgreSQL) מאפשר כמה workers במקביל בלי לעבד אותה שורה פעמיים.
+    מחזיר את מספר האירועים שעובדו.
+    """
+    with transaction.atomic():
+        batch = list(
+            NotificationOutbox.objects.select_for_update(skip_locked=True)
+            .filter(digest=False)
+            .order_by("id")[:batch_size]
+        )
+        if not batch:
+            return 0
+        coalesce = _coalesce_window().total_seconds() > 0
+        plain, groups = [], defaultdict(list)
+        for entry in batch:
+            if coalesce and entry.group_key:
+                groups[(entry.to_user_id, entry.type, entry.group_key)].append(entry)
+            else:
+                plain.append(entry)
+
+        created = Notification.objects.bulk_create([entry.to_notification() for entry in plain])
+        updated = []
+        for (user_id, type, group_key), entries in groups.items():
+            notification, is_new = _coalesce(user_id, type, group_key, entries)
+            (created if is_new else updated).append(notification)
+
+        NotificationOutbox.objects.filter(pk__in=[entry.pk for entry in batch]).delete()
+        adjust_unread(Counter(notification.to_user_id for notification in created))
+        transaction.on_commit(lambda: publish_notifications(created))
+        transaction.on_commit(lambda: publish_notifications(updated, event="notification.updated"))
+    return len(batch)
+
+
+def deliver_digests():
+    """
+    מצב digest: מגלגל את כל אירועי ה-digest שממתינים לכל משתמש להתראת DIGEST אחת.
+    נועד להרצה תקופתית (cron: deliver_notifications --digest). מחזיר מספר סיכומים שנוצרו.
+    """
+    with transaction.atomic():
+        entries = list(
+            NotificationOutbox.objects.select_for_update(skip_locked=True).filter(digest=True).order_by("id")
+        )
+        if not entries:
+            return 0
+        by_user = defaultdict(list)
+        for entry in entries:
+            by_user[entry.to_user_id].append(entry)
+
+        digests = []
+        for user_id, items in by_user.items():
+            job_ids = sorted({item.payload["job_id"] for item in items if "job_id" in item.payload})
+            digests.append(Notification(
+                to_user_id=user_id,
+                type=Notification.Types.DIGEST,
+                title=f"סיכום: {len(items)} עדכונים חדשים",
+                message="\n".join(item.title for item in items[:10]),
+                payload={"count": len(items), "types": dict(Counter(item.type for item in items)),
+                         "job_ids": job_ids},
+            ))
+        created = Notification.objects.bulk_create(digests)
+        NotificationOutbox.objects.filter(pk__in=[entry.pk for entry in entries]).delete()
+        adjust_unread(Counter(notification.to_user_id for notification in created))
+        transaction.on_commit(lambda: publish_notifications(created))
+    return len(created)
+
+
+def publish_notifications(notifications, event="notification"):
+    """
+    שולח התראות לחיבורי ה-stream הפתוחים (pub/sub) - הודעה אחת לכל משתמש.
+    event: "notification" (חדשות) או "notification.updated" (שורה מאוחדת שהתעדכנה).
+    """
+    by_user = defaultdict(list)
+    for notification in notifications:
+        by_user[notification.to_user_id].append(NotificationSerializer(notification).data)
+    broker = get_broker()
+    for user_id, items in by_user.items():
+        broker.publish(user_id, {"event": event, "notifications": items})
@@ -0,0 +1,149 @@
+# notifications/stream.py
+"""
+התראות בזמן אמת - views אסינכרוניים (ASGI), בלי thread לכל חיבור פתוח.
+
+- GET /api/notifications/stream/ - Server-Sent Events. השלמה של מה שפוספס
+  לפי Last-Event-ID (או ?since_id=), ואז התראות חדשות מה-broker + heartbeat.
+- GET /api/notifications/poll/?since_id=&timeout= - long-poll למי שלא יכול SSE
+  (since_id חובה - ה-id האחרון שהלקוח ראה, 0 בהתחלה):
+  חוזר מיד אם יש התראות חדשות, אחרת ממתין עד timeout שניות.
+
+אימות: JWT ב-Authorization, או ?token= (EventSource לא שולח headers), או session.
+"""
+import asyncio
+import json
+import math
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+
+from accounts.authentication import ClaimsJWTAuthentication
+
+from .broker import get_broker
+from .models import Notification
+from .serializers import NotificationSerializer
+
+CATCH_UP_LIMIT = 100
+RETRY_MS = 5000
+
+
+def _jwt_user(request):
+    auth = ClaimsJWTAuthentication()
+    token = request.GET.get("token")
+    if token:
+        return auth.get_user(auth.get_validated_token(token))
+    result = auth.authenticate(request)
+    return result[0] if result else None
+
+
+async def _authenticate(request):
+    """המשתמש המחובר או None"""
+    try:
+        user = await sync_to_async(_jwt_user)(request)
+    except AuthenticationFailed:  # InvalidToken יורש ממנו
+        return None
+    if user is None:
+        user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+def _parse_since_id(value):
+    if value in (None, ""):
+        return None
+    since_id = int(value)
+    if since_id < 0:
+        raise ValueError(value)
+    return since_id
+
+
+async def _missed(user_id, since_id):
+    """עד CATCH_UP_LIMIT התראות שנוצרו אחרי since_id (לפי id עולה) - השלמה אחרי ניתוק"""
+    if since_id is None:
+        return []
+    qs = Notification.objects.filter(to_user_id=user_id, id__gt=since_id).order_by("id")[:CATCH_UP_LIMIT]
+    return [NotificationSerializer(notification).data async for notification in qs]
+
+
+def _sse(notification):
+    return f"id: {notification['id']}\nevent: notification\ndata: {json.dumps(notification)}\n\n"
+
+
+async def _events(user_id, since_id):
+    heartbeat = getattr(settings, "NOTIFICATIONS_STREAM_HEARTBEAT", 15)
+    # נרשמים לפני ההשלמה מה-DB - התראה שנוצרת באמצע לא תיפול בין הכיסאות
+    async with get_broker().subscribe(user_id) as queue:
+        last_id = since_id or 0
+        yield f"retry: {RETRY_MS}\n\n"
+        if since_id is not None:
+            # בעמודים של CATCH_UP_LIMIT עד שאין עוד - broker מעביר רק ids מעל last_id, כך
+            # שהשלמה שנעצרת באמצע הייתה מדלגת לתמיד על השאר (ו-Last-Event-ID היה עובר אותן)
+            while True:
+                missed = await _missed(user_id, last_id)
+                for notification in missed:
+                    last_id = notification["id"]
+                    yield _sse(notification)
+                if len(missed) < CATCH_UP_LIMIT:
+                    break
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"  # שומר על החיבור פתוח דרך proxies
+                continue
+            if message["event"] == "notification.updated":
+                # שורה מאוחדת שהתעדכנה (payload["count"]) - ה-id שלה כבר נשלח
+                for notification in message["notifications"]:
+                    yield f"event: notification.updated\ndata: {json.dumps(notification)}\n\n"
+                continue
+            for notification in message["notifications"]:
+                if notification["id"] > last_id:
+                    last_id = notification["id"]
+                    yield _sse(notification)
+
+
+async def notification_stream(request):
+    user = await _authenticate(request)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    try:
+        since_id = _parse_since_id(request.headers.get("Last-Event-ID") or request.GET.get("since_id"))
+    except ValueError:
+        return JsonResponse({"since_id": ["A valid integer is required."]}, status=400)
+    return StreamingHttpResponse(
+        _events(user.pk, since_id),
+        content_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def notification_poll(request):
+    user = await _authenticate(request)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    max_timeout = getattr(settings, "NOTIFICATIONS_POLL_TIMEOUT", 25)
+    try:
+        since_id = _parse_since_id(request.GET.get("since_id"))
+        timeout = float(request.GET.get("timeout", max_timeout))
+        if not math.isfinite(timeout):  # nan עובר דרך min/max כמו שהוא
+            raise ValueError(timeout)
+        timeout = min(max(timeout, 0), max_timeout)
+    except ValueError:
+        since_id = None
+    if since_id is None:
+        return JsonResponse({"detail": "since_id (integer) and numeric timeout are required."}, status=400)
+
+    async with get_broker().subscribe(user.pk) as queue:
+        results = await _missed(user.pk, since_id)
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not results:
+            remaining = deadline - asyncio.get_running_loop().time()
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=max(remaining, 0))
+            except asyncio.TimeoutError:
+                break
+            if message["event"] == "notification":  # עדכוני שורות מאוחדות לא רלוונטיים ל-since_id
+                results = [n for n in message["notifications"] if n["id"] > since_id]
+    last_id = results[-1]["id"] if results else since_id
+    return JsonResponse({"results": results, "last_id": last_id})
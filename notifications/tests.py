@@ -1,3 +1,561 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import Roles
+from jobs.models import Job
+from .models import Notification, NotificationArchive, NotificationOutbox
+from .broker import get_broker
+from .counters import unread_count
+from .services import deliver_digests, deliver_notifications, send_notification
+from .stream import CATCH_UP_LIMIT
+
+User = get_user_model()
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class NotificationConditionalGetTests(APITestCase):
+    """ETag ברשימת ההתראות - 304 כל עוד אין חדשות/מחיקות/סימון כנקרא"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+        send_notification(to_user=self.user, type=Notification.Types.GENERAL, title="hello")
+        deliver_notifications()
+        self.note = Notification.objects.get(to_user=self.user)
+
+    def _etag(self):
+        r = self.client.get("/api/notifications/")
+        self.assertEqual(r.status_code, 200)
+        return r["ETag"]
+
+    def test_unchanged_list_returns_304(self):
+        etag = self._etag()
+        with CaptureQueriesContext(connection) as ctx:
+            r = self.client.get("/api/notifications/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 304)
+        # האגרגציה בלבד - max(id), max(sync_seq), בלי COUNT על ההיסטוריה
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertNotIn("COUNT", ctx.captured_queries[0]["sql"].upper())
+
+    def test_new_and_read_notifications_change_etag(self):
+        etag = self._etag()
+        send_notification(to_user=self.user, type=Notification.Types.GENERAL, title="second")
+        deliver_notifications()
+        self.assertNotEqual(self._etag(), etag)
+        etag = self._etag()
+        self.client.post(f"/api/notifications/{self.note.pk}/read/")
+        self.assertNotEqual(self._etag(), etag)
+
+    def _prune_first(self):
+        # השורה הישנה (לא max(id) ולא max(sync_seq)) נמחקת ע"י retention
+        Notification.objects.filter(pk=self.note.pk).update(
+            is_read=True, created_at=timezone.now() - timedelta(days=40)
+        )
+        send_notification(to_user=self.user, type=Notification.Types.GENERAL, title="second")
+        deliver_notifications()
+        etag = self._etag()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("prune_notifications", "--policy", "read", "--sleep", "0", stdout=StringIO())
+        self.assertFalse(Notification.objects.filter(pk=self.note.pk).exists())
+        return etag
+
+    def test_deleting_an_older_notification_changes_etag(self):
+        etag = self._prune_first()
+        self.assertNotEqual(self._etag(), etag)
+
+    def test_without_redis_counts_catch_deletes(self):
+        with mock.patch("notifications.api.list_version", return_value=None):
+            etag = self._prune_first()
+            self.assertNotEqual(self._etag(), etag)
+
+
+class NotificationOutboxTests(APITestCase):
+    """התראות עוברות דרך outbox - ההגשה לא יוצרת Notification, ה-worker כן"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+        cls.seeker = User.objects.create_user(email="js@example.com", password="x", role=Roles.SEEKER)
+        cls.job = Job.objects.create(
+            posted_by=cls.recruiter, title="Backend developer", status="open",
+            description="Build and maintain internal Django services.",
+        )
+
+    def test_apply_enqueues_and_worker_delivers(self):
+        self.client.force_authenticate(self.seeker)
+        r = self.client.post("/api/applications/", {"job": self.job.pk}, format="json")
+        self.assertEqual(r.status_code, 201)
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(NotificationOutbox.objects.count(), 1)
+
+        out = StringIO()
+        call_command("deliver_notifications", stdout=out)
+        self.assertIn("delivered 1 notification(s)", out.getvalue())
+        note = Notification.objects.get()
+        self.assertEqual(note.to_user, self.recruiter)
+        self.assertEqual(note.payload["application_id"], r.data["id"])
+        self.assertFalse(NotificationOutbox.objects.exists())
+
+    def test_worker_drains_in_batches(self):
+        for i in range(5):
+            send_notification(to_user=self.recruiter, type=Notification.Types.GENERAL, title=f"note {i}")
+        # SELECT batch, INSERT (bulk), DELETE + SAVEPOINT/RELEASE של ה-atomic בתוך TestCase
+        with self.assertNumQueries(5):
+            self.assertEqual(deliver_notifications(batch_size=3), 3)
+        self.assertEqual(deliver_notifications(batch_size=3), 2)
+        self.assertEqual(deliver_notifications(batch_size=3), 0)
+        self.assertEqual(
+            list(Notification.objects.order_by("id").values_list("title", flat=True)),
+            [f"note {i}" for i in range(5)],
+        )
+
+    def test_failed_delivery_keeps_events(self):
+        send_notification(to_user=self.recruiter, type=Notification.Types.GENERAL, title="keep me")
+        with mock.patch.object(Notification.objects, "bulk_create", side_effect=RuntimeError("worker crashed")):
+            with self.assertRaises(RuntimeError):
+                deliver_notifications()
+        self.assertEqual(NotificationOutbox.objects.count(), 1)
+        self.assertEqual(deliver_notifications(), 1)
+
+    def test_status_change_notifies_seeker(self):
+        from jobs.models import Application
+
+        app = Application.objects.create(job=self.job, applicant=self.seeker)
+        NotificationOutbox.objects.all().delete()
+        app.status = "accepted"
+        app.save()
+        app.save()  # בלי שינוי - בלי התראה נוספת
+        entry = NotificationOutbox.objects.get()
+        self.assertEqual(entry.to_user_id, self.seeker.pk)
+        self.assertEqual((entry.payload["prev_status"], entry.payload["new_status"]), ("pending", "accepted"))
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    NOTIFICATIONS_BROKER="memory",
+)
+class UnreadCountTests(APITestCase):
+    """badge של התראות שלא נקראו - מונה ב-cache, נבנה מחדש מה-DB כשחסר"""
+
+    URL = "/api/notifications/unread_count/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def _deliver(self, n):
+        for i in range(n):
+            send_notification(to_user=self.user, type=Notification.Types.GENERAL, title=f"note {i}")
+        with self.captureOnCommitCallbacks(execute=True):
+            deliver_notifications()
+
+    def _unread(self):
+        return self.client.get(self.URL).data["unread"]
+
+    def test_counter_is_built_then_served_without_queries(self):
+        self._deliver(3)
+        self.assertEqual(self._unread(), 3)  # מפתח חסר - COUNT מה-DB
+        with self.assertNumQueries(0):
+            self.assertEqual(self._unread(), 3)
+
+    def test_delivery_and_reads_keep_counter_in_sync(self):
+        self.assertEqual(self._unread(), 0)
+        self._deliver(3)
+        self.assertEqual(self._unread(), 3)
+
+        note = Notification.objects.filter(to_user=self.user).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/api/notifications/{note.pk}/read/")
+            self.client.post(f"/api/notifications/{note.pk}/read/")  # פעם שנייה - בלי שינוי
+        self.assertEqual(self._unread(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/notifications/read_all/")
+        self.assertEqual(self._unread(), 0)
+
+    def test_count_query_uses_index(self):
+        # בצורת ה-COUNT של unread_count: בלי ORDER BY ובלי עמודות השורה
+        plan = Notification.objects.filter(to_user=self.user, is_read=False).order_by().values("pk").explain()
+        self.assertIn("notif_user_unread_idx", plan)
+
+    def test_list_query_uses_index_without_sort(self):
+        self._deliver(3)
+        first = Notification.objects.filter(to_user=self.user).order_by("-id")[:20]
+        after = Notification.objects.filter(to_user=self.user, id__lt=2**62).order_by("-id")[:20]
+        for qs in (first, after):
+            plan = qs.explain()
+            self.assertIn("notif_user_recent_idx", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    NOTIFICATIONS_BROKER="memory",
+)
+class NotificationStreamTests(APITestCase):
+    """SSE + long-poll (views אסינכרוניים) מוזנים מה-broker"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="js@example.com", password="x", role=Roles.SEEKER)
+        cls.other = User.objects.create_user(email="js2@example.com", password="x", role=Roles.SEEKER)
+
+    def _deliver(self, user, title):
+        send_notification(to_user=user, type=Notification.Types.GENERAL, title=title)
+        with self.captureOnCommitCallbacks(execute=True):
+            deliver_notifications()
+        return Notification.objects.filter(to_user=user).latest("id")
+
+    def _auth(self, user):
+        return {"authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+    async def _open_stream(self, headers):
+        """
+        צורך את ה-stream ב-task נפרד (כמו ה-ASGI handler); ביטול ה-task = ניתוק הלקוח.
+        מחזיר (task, תור של אירועים).
+        """
+        response = await self.async_client.get("/api/notifications/stream/", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = asyncio.Queue()
+
+        async def consume():
+            async for chunk in response.streaming_content:
+                await events.put(chunk.decode())
+
+        return asyncio.ensure_future(consume()), events
+
+    async def _disconnect(self, task):
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+    async def test_sse_streams_new_notifications(self):
+        task, events = await self._open_stream(self._auth(self.user))
+        first = await asyncio.wait_for(events.get(), timeout=5)
+        self.assertTrue(first.startswith("retry:"))  # נרשם ל-broker
+
+        await sync_to_async(self._deliver)(self.other, "not for me")
+        note = await sync_to_async(self._deliver)(self.user, "hello")
+        event = await asyncio.wait_for(events.get(), timeout=5)
+        self.assertIn(f"id: {note.pk}\n", event)
+        self.assertIn('"title": "hello"', event)
+
+        await self._disconnect(task)
+        self.assertEqual(get_broker().subscriber_count(), 0)
+
+    async def test_sse_catches_up_from_last_event_id(self):
+        first = await sync_to_async(self._deliver)(self.user, "first")
+        await sync_to_async(self._deliver)(self.user, "second")
+        task, events = await self._open_stream({**self._auth(self.user), "Last-Event-ID": str(first.pk)})
+        await asyncio.wait_for(events.get(), timeout=5)
+        self.assertIn('"title": "second"', await asyncio.wait_for(events.get(), timeout=5))
+        await self._disconnect(task)
+
+    async def test_sse_catch_up_pages_past_the_limit(self):
+        missed = CATCH_UP_LIMIT * 2 + 50
+        await Notification.objects.abulk_create(
+            Notification(to_user=self.user, type=Notification.Types.GENERAL, title=f"missed {i}")
+            for i in range(missed)
+        )
+        ids = [
+            pk async for pk in Notification.objects.filter(to_user=self.user).order_by("id").values_list("id", flat=True)
+        ]
+        task, events = await self._open_stream({**self._auth(self.user), "Last-Event-ID": "0"})
+        await asyncio.wait_for(events.get(), timeout=5)  # retry
+        received = []
+        for _ in range(missed):
+            event = await asyncio.wait_for(events.get(), timeout=5)
+            received.append(int(event.split("\n", 1)[0].removeprefix("id: ")))
+        self.assertEqual(received, ids)
+
+        note = await sync_to_async(self._deliver)(self.user, "after catch-up")
+        self.assertIn(f"id: {note.pk}\n", await asyncio.wait_for(events.get(), timeout=5))
+        await self._disconnect(task)
+
+    async def test_stream_requires_auth(self):
+        response = await self.async_client.get("/api/notifications/stream/")
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get("/api/notifications/stream/", {"token": "garbage"})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_long_poll_returns_missed_immediately(self):
+        note = await sync_to_async(self._deliver)(self.user, "missed")
+        response = await self.async_client.get(
+            "/api/notifications/poll/", {"since_id": 0, "token": str(AccessToken.for_user(self.user))}
+        )
+        data = response.json()
+        self.assertEqual([n["id"] for n in data["results"]], [note.pk])
+        self.assertEqual(data["last_id"], note.pk)
+
+    async def test_long_poll_waits_for_new_notification(self):
+        poll = asyncio.ensure_future(self.async_client.get(
+            "/api/notifications/poll/", {"since_id": 0, "timeout": 5}, headers=self._auth(self.user)
+        ))
+        while get_broker().subscriber_count() == 0:
+            await asyncio.sleep(0.01)
+        note = await sync_to_async(self._deliver)(self.user, "late")
+        data = (await asyncio.wait_for(poll, timeout=5)).json()
+        self.assertEqual([n["id"] for n in data["results"]], [note.pk])
+
+    async def test_long_poll_times_out_empty(self):
+        response = await self.async_client.get(
+            "/api/notifications/poll/", {"since_id": 0, "timeout": 0.05}, headers=self._auth(self.user)
+        )
+        self.assertEqual(response.json(), {"results": [], "last_id": 0})
+        response = await self.async_client.get("/api/notifications/poll/", headers=self._auth(self.user))
+        self.assertEqual(response.status_code, 400)
+
+    async def test_long_poll_rejects_non_finite_timeout(self):
+        for timeout in ("nan", "inf", "-inf"):
+            response = await self.async_client.get(
+                "/api/notifications/poll/", {"since_id": 0, "timeout": timeout}, headers=self._auth(self.user)
+            )
+            self.assertEqual(response.status_code, 400, timeout)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    NOTIFICATIONS_BROKER="memory",
+)
+class StreamConnectionCostTests(TransactionTestCase):
+    """חיבורי stream פתוחים דרך config.asgi - בלי thread לכל חיבור (bench_stream בקטן)"""
+
+    def test_open_streams_share_threads(self):
+        out = StringIO()
+        call_command("bench_stream", connections=50, users=5, timeout=30, stdout=out)
+        report = dict(line.split(":", 1) for line in out.getvalue().splitlines())
+        self.assertEqual(report["connections open"].split()[0], "50")
+        before, after = (int(n) for n in report["threads"].split("->"))
+        self.assertLessEqual(after - before, 2)
+        self.assertEqual(report["after disconnect"].split()[0], "0")
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    NOTIFICATIONS_BROKER="memory",
+    NOTIFICATIONS_COALESCE_WINDOW=600,
+)
+class NotificationCoalescingTests(APITestCase):
+    """הגשות לאותה משרה מתאחדות לשורה אחת כל עוד לא נקראה ובתוך החלון"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+        cls.seekers = [
+            User.objects.create_user(email=f"js{i}@example.com", password="x", role=Roles.SEEKER)
+            for i in range(6)
+        ]
+        cls.job = Job.objects.create(
+            posted_by=cls.recruiter, title="Backend developer", status="open",
+            description="Build and maintain internal Django services.",
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.applied = 0
+
+    def _apply(self, n):
+        from jobs.models import Application
+
+        for seeker in self.seekers[self.applied:self.applied + n]:
+            Application.objects.create(job=self.job, applicant=seeker)
+        self.applied += n
+
+    def _deliver(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            deliver_notifications()
+
+    def _received(self):
+        return list(Notification.objects.filter(
+            to_user=self.recruiter, type=Notification.Types.APPLICATION_RECEIVED
+        ).order_by("id"))
+
+    def test_burst_updates_one_row(self):
+        self._apply(3)
+        self._deliver()
+        self._apply(2)
+        self._deliver()
+        [note] = self._received()
+        self.assertEqual(note.payload["count"], 5)
+        self.assertEqual(note.title, "התקבלו 5 מועמדויות חדשות")
+        self.assertEqual(unread_count(self.recruiter.pk), 1)
+
+    def test_coalesced_update_changes_list_etag(self):
+        self._apply(1)
+        self._deliver()
+        self.client.force_authenticate(self.recruiter)
+        etag = self.client.get("/api/notifications/")["ETag"]
+
+        self._apply(1)
+        self._deliver()  # אותה שורה נכתבת מחדש - id/count/unread לא משתנים
+        r = self.client.get("/api/notifications/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["results"][0]["payload"]["count"], 2)
+
+    def test_read_or_expired_row_starts_a_new_one(self):
+        self._apply(2)
+        self._deliver()
+        Notification.objects.filter(to_user=self.recruiter).update(is_read=True)
+        self._apply(1)
+        self._deliver()
+        self.assertEqual([n.payload["count"] for n in self._received()], [2, 1])
+
+        Notification.objects.filter(is_read=False).update(created_at=timezone.now() - timedelta(hours=1))
+        self._apply(1)
+        self._deliver()
+        self.assertEqual([n.payload["count"] for n in self._received()], [2, 1, 1])
+        self.assertEqual(Notification.objects.filter(is_read=False).exclude(group_key="").count(), 1)
+
+    def test_one_open_group_per_recipient(self):
+        self._apply(1)
+        self._deliver()
+        duplicate = Notification(
+            to_user=self.recruiter, type=Notification.Types.APPLICATION_RECEIVED,
+            title="dup", group_key=f"job:{self.job.pk}",
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            duplicate.save()
+
+    @override_settings(NOTIFICATIONS_DIGEST=True)
+    def test_digest_mode_rolls_events_into_one_summary(self):
+        self._apply(4)
+        self._deliver()
+        self.assertFalse(Notification.objects.exists())  # ממתין לסיכום התקופתי
+
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("deliver_notifications", "--digest", stdout=out)
+        self.assertIn("delivered 1 digest(s)", out.getvalue())
+        digest = Notification.objects.get(to_user=self.recruiter)
+        self.assertEqual(digest.type, Notification.Types.DIGEST)
+        self.assertEqual(digest.payload["count"], 4)
+        self.assertEqual(digest.payload["job_ids"], [self.job.pk])
+        self.assertFalse(NotificationOutbox.objects.exists())
+        self.assertEqual(deliver_digests(), 0)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    NOTIFICATIONS_ARCHIVE="table",
+)
+class NotificationRetentionTests(APITestCase):
+    """prune_notifications: נקראו > 30 יום נמחקות, הכל > 180 יום עובר לארכיון"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.rows = {}
+        for name, age, is_read in [  # לפי סדר יצירה, כמו בטבלה אמיתית (id עולה עם created_at)
+            ("ancient_unread", 200, False), ("ancient_read", 200, True),
+            ("old_read", 40, True), ("old_unread", 40, False), ("fresh_read", 5, True),
+        ]:
+            note = Notification.objects.create(to_user=self.user, type=Notification.Types.GENERAL,
+                                               title=name, is_read=is_read)
+            Notification.objects.filter(pk=note.pk).update(created_at=now - timedelta(days=age))
+            self.rows[name] = note.pk
+
+    def _prune(self, *args):
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("prune_notifications", "--batch-size", "1", "--sleep", "0", *args, stdout=out)
+        return out.getvalue()
+
+    def test_policies_delete_and_archive_in_batches(self):
+        self.assertEqual(unread_count(self.user.pk), 2)
+        out = self._prune()
+        self.assertIn("read (>30d): deleted 2 notification(s)", out)
+        self.assertIn("all (>180d): archived 1 notification(s)", out)
+        self.assertIn("reclaimed 3 row(s)", out)
+        self.assertEqual(
+            set(Notification.objects.values_list("title", flat=True)), {"fresh_read", "old_unread"}
+        )
+        archived = NotificationArchive.objects.get()
+        self.assertEqual((archived.pk, archived.title), (self.rows["ancient_unread"], "ancient_unread"))
+        self.assertEqual(unread_count(self.user.pk), 1)
+
+    def test_dry_run_keeps_everything(self):
+        out = self._prune("--dry-run")
+        self.assertIn("read (>30d): would remove 2 notification(s)", out)
+        self.assertEqual(Notification.objects.count(), 5)
+        self.assertFalse(NotificationArchive.objects.exists())
+
+    def test_jsonl_archive(self):
+        with tempfile.TemporaryDirectory() as directory:
+            out = self._prune("--policy", "all", "--archive", "jsonl", "--archive-dir", directory)
+            [path] = Path(directory).glob("notifications-all-*.jsonl.gz")
+            with gzip.open(path, "rt", encoding="utf-8") as archive:
+                lines = [json.loads(line) for line in archive]
+        self.assertIn(str(path), out)
+        self.assertEqual(sorted(line["title"] for line in lines), ["ancient_read", "ancient_unread"])
+        self.assertFalse(Notification.objects.filter(title__startswith="ancient").exists())
+        self.assertFalse(NotificationArchive.objects.exists())
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    NOTIFICATIONS_BROKER="memory",
+)
+class NotificationSyncTests(APITestCase):
+    """/api/notifications/sync/ - סימון כנקרא מופיע כשינוי, prune כ-tombstone"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        self.notes = [
+            Notification.objects.create(to_user=self.user, type=Notification.Types.GENERAL, title=f"n{i}")
+            for i in range(3)
+        ]
+
+    def _sync(self, token=None):
+        res = self.client.get("/api/notifications/sync/", {"since": token} if token else {})
+        self.assertEqual(res.status_code, 200, res.content)
+        return res.data
+
+    def test_read_and_prune_show_up_as_deltas(self):
+        data = self._sync()
+        self.assertEqual([row["id"] for row in data["results"]], [n.pk for n in self.notes])
+        token = data["next"]
+
+        self.client.post(f"/api/notifications/{self.notes[1].pk}/read/")
+        data = self._sync(token)
+        self.assertEqual([(row["id"], row["is_read"]) for row in data["results"]], [(self.notes[1].pk, True)])
+
+        Notification.objects.filter(pk=self.notes[0].pk).update(created_at=timezone.now() - timedelta(days=40))
+        Notification.objects.filter(pk=self.notes[0].pk).update(is_read=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("prune_notifications", "--policy", "read", "--sleep", "0", stdout=StringIO())
+        data = self._sync(data["next"])
+        self.assertEqual(data["deleted"], [self.notes[0].pk])
@@ -1,7 +1,13 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 from .api import NotificationViewSet
+from .stream import notification_poll, notification_stream
 
 router = DefaultRouter()
 router.register(r"notifications", NotificationViewSet, basename="notification")
 
-urlpatterns = router.urls
+# views אסינכרוניים (ASGI) - לפני ה-router, אחרת notifications/<pk>/ תופס אותם
+urlpatterns = [
+    path("notifications/stream/", notification_stream, name="notification-stream"),
+    path("notifications/poll/", notification_poll, name="notification-poll"),
+] + router.urls
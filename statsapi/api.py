@@ -1,24 +1,43 @@
 from datetime import timedelta
+
+from django.db.models import Sum
 from django.utils import timezone
-from django.db.models import Count
-from django.db.models.functions import TruncDate
 
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
 from accounts.models import Roles
-from jobs.models import Job, Application
+from jobs.models import Application, Job
+from .models import (
+    PlatformDailyStats, PlatformRecruiterStats, PlatformSnapshot, RecruiterDailyTotals, RecruiterJobTotals,
+    SeekerDailyStats,
+)
+from .serializers import DailyWindowSerializer, StatsWindowSerializer
+from .reviews import review_metrics
+from .series import WINDOWS, cached, series
+
 
+def _window(request):
+    params = StatsWindowSerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    return params.validated_data["window"], params.validated_data["bucket"]
 
-def _last_days(days: int):
-    return timezone.now() - timedelta(days=days)
+
+def _with_series(data, window, bucket, points, legacy_key):
+    data.update({"window": window, "bucket": bucket, "series": points})
+    if (window, bucket) == ("7d", "day"):
+        data[legacy_key] = points  # השם הישן (טרנד 7 ימים) נשמר לברירת המחדל
+    return data
 
 
 class RecruiterOverviewView(APIView):
     """
-    סטטיסטיקות למגייס: ספירת משרות, מועמדויות, חלוקה לפי משרה, וטרנד ל-7 ימים.
+    סטטיסטיקות למגייס: ספירת משרות, מועמדויות, חלוקה לפי משרה, וטרנד (series).
+    ?window=24h|7d|30d|90d|365d&bucket=hour|day|week - ראו statsapi/series.py.
+    הכל מטבלאות הסיכום (statsapi/rollups.py): שורה למשרה + שורה ליום - לא סריקה של
+    כל המועמדויות, ובלי תלות באורך ההיסטוריה.
     """
     permission_classes = [IsAuthenticated]
 
@@ -26,46 +45,58 @@ class RecruiterOverviewView(APIView):
         user = request.user
         if getattr(user, "role", None) != Roles.RECRUITER and not (user.is_staff or user.is_superuser):
             return Response({"detail": "Recruiter only."}, status=status.HTTP_403_FORBIDDEN)
+        window, bucket = _window(request)
+        data = cached("recruiter", user.pk, window, bucket, lambda: self._compute(user, window, bucket))
+        return Response(data, status=status.HTTP_200_OK)
 
+    def _compute(self, user, window, bucket):
         # סה״כ משרות שפרסם המשתמש
         jobs_qs = Job.objects.filter(posted_by=user)
         jobs_total = jobs_qs.count()
 
-        # סה״כ מועמדויות למשרות שלו
-        apps_qs = Application.objects.filter(job__posted_by=user)
-        applications_total = apps_qs.count()
-
-        # חלוקת מועמדויות לפי משרה
-        applications_by_job = (
-            apps_qs.values("job_id", "job__title")
-                  .annotate(count=Count("id"))
-                  .order_by("-count")
+        # חלוקת מועמדויות לפי משרה (סה״כ המועמדויות - סכום החלוקה, בלי שאילתה נוספת)
+        applications_by_job = list(
+            RecruiterJobTotals.objects.filter(recruiter=user, count__gt=0)
+                .values("job_id", "job__title", "count")
+                .order_by("-count")
         )
 
-        # טרנד 7 ימים אחרונים (לפי created_at של Application)
-        since = _last_days(7)
-        last_7d_applications = (
-            apps_qs.filter(created_at__gte=since)  # אם שם השדה שונה, עדכני בהתאם
-                  .annotate(day=TruncDate("created_at"))
-                  .values("day")
-                  .annotate(count=Count("id"))
-                  .order_by("day")
+        # טרנד לפי יום ההגשה
+        points = series(
+            window, bucket,
+            rollups=RecruiterDailyTotals.objects.filter(recruiter=user),
+            applications=Application.objects.filter(job__posted_by=user),
         )
-
         data = {
             "jobs_total": jobs_total,
-            "applications_total": applications_total,
-            "applications_by_job": list(applications_by_job),
-            "last_7d_applications": [
-                {"date": r["day"], "count": r["count"]} for r in last_7d_applications
-            ],
+            "applications_total": sum(r["count"] for r in applications_by_job),
+            "applications_by_job": applications_by_job,
         }
+        return _with_series(data, window, bucket, points, "last_7d_applications")
+
+
+class RecruiterReviewMetricsView(APIView):
+    """
+    מדדי בדיקה למגייס: אחוזוני זמן-עד-בדיקה-ראשונה ומשפך לכל משרה (statsapi/reviews.py).
+    ?window=7d|30d|90d|365d (ברירת מחדל 30d). ב-cache עד שינוי במועמדות של המגייס (statsapi/signals.py).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+        if getattr(user, "role", None) != Roles.RECRUITER and not (user.is_staff or user.is_superuser):
+            return Response({"detail": "Recruiter only."}, status=status.HTTP_403_FORBIDDEN)
+        params = DailyWindowSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        window = params.validated_data["window"]
+        data = cached("reviews", user.pk, window, "day", lambda: review_metrics(user, window))
         return Response(data, status=status.HTTP_200_OK)
 
 
 class SeekerOverviewView(APIView):
     """
-    סטטיסטיקות למחפש עבודה: סה״כ הגשות, חלוקה לפי סטטוס, וטרנד 7 ימים.
+    סטטיסטיקות למחפש עבודה: סה״כ הגשות, חלוקה לפי סטטוס, וטרנד (series).
+    אותם פרמטרי window / bucket כמו אצל המגייס. מ-SeekerDailyStats (שורה ליום/סטטוס).
     """
     permission_classes = [IsAuthenticated]
 
@@ -73,33 +104,71 @@ class SeekerOverviewView(APIView):
         user = request.user
         if getattr(user, "role", None) != Roles.SEEKER and not (user.is_staff or user.is_superuser):
             return Response({"detail": "Seeker only."}, status=status.HTTP_403_FORBIDDEN)
+        window, bucket = _window(request)
+        data = cached("seeker", user.pk, window, bucket, lambda: self._compute(user, window, bucket))
+        return Response(data, status=status.HTTP_200_OK)
 
-        apps_qs = Application.objects.filter(applicant=user)
-
-        applications_total = apps_qs.count()
+    def _compute(self, user, window, bucket):
+        stats = SeekerDailyStats.objects.filter(seeker=user)
 
-        # חלוקה לפי סטטוס
-        by_status = (
-            apps_qs.values("status")
-                   .annotate(count=Count("id"))
-                   .order_by("-count")
+        # חלוקה לפי סטטוס (הסה״כ - סכום החלוקה, בלי שאילתה נוספת)
+        by_status = list(
+            stats.values("status")
+                 .annotate(count=Sum("count"))
+                 .filter(count__gt=0)
+                 .order_by("-count")
         )
 
-        # טרנד 7 ימים אחרונים (לפי created_at של Application)
-        since = _last_days(7)
-        last_7d_submissions = (
-            apps_qs.filter(created_at__gte=since)  # אם שם השדה שונה, עדכני בהתאם
-                   .annotate(day=TruncDate("created_at"))
-                   .values("day")
-                   .annotate(count=Count("id"))
-                   .order_by("day")
-        )
+        # טרנד לפי יום ההגשה
+        points = series(window, bucket, rollups=stats, applications=Application.objects.filter(applicant=user))
+        data = {
+            "applications_total": sum(r["count"] for r in by_status),
+            "by_status": by_status,  # [{"status":"PENDING","count":3}, ...]
+        }
+        return _with_series(data, window, bucket, points, "last_7d_submissions")
 
+
+class PlatformOverviewView(APIView):
+    """
+    סטטיסטיקות לכל הפלטפורמה (staff בלבד): משרות ומועמדויות ליום, שיעור קבלה, מועמדויות
+    למשרה ומגייסים מובילים. ?window=7d|30d|90d|365d (ברירת מחדל 30d).
+    רק מהאגרגציות של statsapi/platform_stats.py; refreshed_at - מתי רועננו (None - עוד לא).
+    שיעור הקבלה - מתוך המועמדויות שהוכרעו (accepted / (accepted + rejected)).
+    """
+    permission_classes = [IsAdminUser]
+    TOP_RECRUITERS = 10
+
+    def get(self, request):
+        params = DailyWindowSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        window = params.validated_data["window"]
+
+        snapshot = PlatformSnapshot.objects.filter(pk=1).first()
+        today = timezone.localdate(snapshot.refreshed_at) if snapshot else timezone.localdate()
+        days = [today - timedelta(days=d) for d in range(WINDOWS[window] - 1, -1, -1)]
+        rows = {
+            row["day"]: row
+            for row in PlatformDailyStats.objects.filter(day__gte=days[0], day__lte=today)
+                .values("day", "jobs_posted", "applications", "accepted", "rejected")
+        }
+        empty = {"jobs_posted": 0, "applications": 0, "accepted": 0, "rejected": 0}
+        daily = [{**empty, **rows.get(day, {}), "day": day} for day in days]
+
+        totals = {key: sum(row[key] for row in daily) for key in empty}
+        decided = totals["accepted"] + totals["rejected"]
+        totals["acceptance_rate"] = round(totals["accepted"] / decided, 4) if decided else None
+
+        top_recruiters = list(
+            PlatformRecruiterStats.objects.filter(applications__gt=0)
+                .values("recruiter_id", "recruiter__email", "jobs", "applications", "accepted")
+                .order_by("-applications")[:self.TOP_RECRUITERS]
+        )
         data = {
-            "applications_total": applications_total,
-            "by_status": list(by_status),  # [{"status":"PENDING","count":3}, ...]
-            "last_7d_submissions": [
-                {"date": r["day"], "count": r["count"]} for r in last_7d_submissions
-            ],
+            "refreshed_at": snapshot.refreshed_at if snapshot else None,
+            "window": window,
+            "totals": totals,
+            "daily": daily,
+            "all_time": snapshot.summary if snapshot else {},
+            "top_recruiters": top_recruiters,
         }
         return Response(data, status=status.HTTP_200_OK)
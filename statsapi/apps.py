@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class StatsapiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'statsapi'
+
+    def ready(self):
+        from . import signals  # noqa
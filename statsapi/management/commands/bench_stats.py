@@ -0,0 +1,88 @@
+# statsapi/management/commands/bench_stats.py
+import random
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from jobs.management.commands._bench import bench_recruiter, median_ms
+from jobs.models import Job
+from statsapi import rollups
+from statsapi.api import RecruiterOverviewView
+from statsapi.models import RecruiterDailyStats
+from statsapi.series import _cache_key
+
+STATUSES = ("pending", "accepted", "rejected", "withdrawn")
+
+
+class Command(BaseCommand):
+    help = (
+        "מודד latency של /api/stats/recruiter/overview/ למגייס גדול (ברירת מחדל: מיליון מועמדויות "
+        "על פני 365 ימים), בלי cache ועם cache. זורע ישירות את טבלאות ה-rollup שה-view קורא."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--applications", type=int, default=1_000_000)
+        parser.add_argument("--jobs", type=int, default=100)
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, applications, jobs, days, repeat, **options):
+        recruiter = bench_recruiter()
+        self._seed(recruiter, applications, jobs, days)
+        view = RecruiterOverviewView.as_view()
+        factory = APIRequestFactory(SERVER_NAME="localhost")
+
+        def call(params):
+            request = factory.get("/api/stats/recruiter/overview/", params)
+            force_authenticate(request, recruiter)
+            response = view(request)
+            assert response.status_code == 200, response.data
+            return response
+
+        def cold(params):
+            try:
+                cache.delete(_cache_key("recruiter", recruiter.pk, params["window"], params["bucket"]))
+            except Exception:  # Redis לא זמין - ממילא אין cache
+                pass
+            call(params)
+
+        rows = RecruiterDailyStats.objects.filter(recruiter=recruiter).count()
+        self.stdout.write(f"daily rollup rows: {rows} ({applications} applications, {jobs} jobs, {days} days)")
+        for window, bucket in [("7d", "day"), ("30d", "day"), ("365d", "day"), ("365d", "week")]:
+            params = {"window": window, "bucket": bucket}
+            self.stdout.write(
+                f"{window:>5}/{bucket:<5} cold: {median_ms(lambda: cold(params), repeat):7.1f} ms   "
+                f"cached: {median_ms(lambda: call(params), repeat):6.2f} ms"
+            )
+
+    def _seed(self, recruiter, applications, jobs, days):
+        existing = Job.objects.filter(posted_by=recruiter, title__startswith="Stats bench job").order_by("pk")
+        job_ids = list(existing.values_list("pk", flat=True)[:jobs])
+        if len(job_ids) < jobs:
+            Job.objects.bulk_create(
+                Job(posted_by=recruiter, status="open", title=f"Stats bench job {i}",
+                    description="Seeded row for benchmarks.")
+                for i in range(len(job_ids), jobs)
+            )
+            job_ids = list(existing.values_list("pk", flat=True)[:jobs])
+        RecruiterDailyStats.objects.filter(recruiter=recruiter).delete()
+
+        today = timezone.localdate()
+        rng = random.Random(0)
+        per_row = max(applications // (len(job_ids) * days * len(STATUSES)), 1)
+        batch = []
+        for job_id in job_ids:
+            for d in range(days):
+                for status in STATUSES:
+                    batch.append(RecruiterDailyStats(
+                        recruiter=recruiter, job_id=job_id, day=today - timedelta(days=d),
+                        status=status, count=per_row + rng.randint(-per_row // 2, per_row // 2),
+                    ))
+            if len(batch) >= 20_000:
+                RecruiterDailyStats.objects.bulk_create(batch)
+                batch = []
+        RecruiterDailyStats.objects.bulk_create(batch)
+        rollups.rebuild_recruiter_totals([recruiter.pk])
@@ -0,0 +1,39 @@
+# statsapi/management/commands/rebuild_stats_rollups.py
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from jobs.models import Job
+from statsapi import rollups
+
+
+def _id_batches(queryset, batch_size):
+    last_id = 0
+    while True:
+        ids = list(queryset.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return
+        last_id = ids[-1]
+        yield ids
+
+
+class Command(BaseCommand):
+    help = "בונה מחדש את טבלאות ה-rollup של statsapi מטבלת המועמדויות (backfill / תיקון סטיות), ב-batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--only", choices=["recruiters", "seekers"], help="רק אחת מהטבלאות")
+
+    def handle(self, *args, batch_size, only, **options):
+        if only != "seekers":
+            jobs = 0
+            for ids in _id_batches(Job.objects.all(), batch_size):
+                rollups.rebuild_jobs(ids)
+                jobs += len(ids)
+            self.stdout.write(f"recruiter rollups rebuilt for {jobs} job(s)")
+        if only != "recruiters":
+            users = 0
+            for ids in _id_batches(get_user_model().objects.all(), batch_size):
+                rollups.rebuild_seekers(ids)
+                users += len(ids)
+            self.stdout.write(f"seeker rollups rebuilt for {users} user(s)")
+        self.stdout.write(self.style.SUCCESS("done"))
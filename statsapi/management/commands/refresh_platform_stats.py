@@ -0,0 +1,20 @@
+# statsapi/management/commands/refresh_platform_stats.py
+from django.core.management.base import BaseCommand
+
+from statsapi import platform_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "מרענן את האגרגציות של /api/stats/platform/ (להריץ מ-cron מחוץ לשעות העומס). "
+        "קוראים ממשיכים לקבל את הגרסה הקודמת עד שהרענון מסתיים."
+    )
+
+    def handle(self, *args, **options):
+        snapshot = platform_stats.refresh()
+        summary = snapshot.summary
+        self.stdout.write(
+            f"{summary['jobs_total']} job(s), {summary['applications_total']} application(s) "
+            f"in {snapshot.duration_ms} ms"
+        )
+        self.stdout.write(self.style.SUCCESS(f"refreshed at {snapshot.refreshed_at.isoformat()}"))
@@ -0,0 +1,70 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    Application = apps.get_model('jobs', 'Application')
+    RecruiterDailyStats = apps.get_model('statsapi', 'RecruiterDailyStats')
+    SeekerDailyStats = apps.get_model('statsapi', 'SeekerDailyStats')
+    rows = Application.objects.annotate(day=TruncDate('created_at')).order_by()
+    RecruiterDailyStats.objects.bulk_create(
+        (
+            RecruiterDailyStats(recruiter_id=r['job__posted_by'], job_id=r['job'], day=r['day'],
+                                status=r['status'], count=r['total'])
+            for r in rows.values('job', 'job__posted_by', 'day', 'status').annotate(total=Count('id'))
+        ),
+        batch_size=1000,
+    )
+    SeekerDailyStats.objects.bulk_create(
+        (
+            SeekerDailyStats(seeker_id=r['applicant'], day=r['day'], status=r['status'], count=r['total'])
+            for r in rows.values('applicant', 'day', 'status').annotate(total=Count('id'))
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('jobs', '0006_application_sync'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecruiterDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='jobs.job')),
+                ('recruiter', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('recruiter', 'day', 'job', 'status'), name='stats_recruiter_daily_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SeekerDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('seeker', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('seeker', 'day', 'status'), name='stats_seeker_daily_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
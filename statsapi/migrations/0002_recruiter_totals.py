@@ -0,0 +1,60 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_totals(apps, schema_editor):
+    RecruiterDailyStats = apps.get_model('statsapi', 'RecruiterDailyStats')
+    RecruiterDailyTotals = apps.get_model('statsapi', 'RecruiterDailyTotals')
+    RecruiterJobTotals = apps.get_model('statsapi', 'RecruiterJobTotals')
+    daily = RecruiterDailyStats.objects.order_by()
+    RecruiterDailyTotals.objects.bulk_create(
+        (RecruiterDailyTotals(recruiter_id=r['recruiter'], day=r['day'], count=r['total'])
+         for r in daily.values('recruiter', 'day').annotate(total=Sum('count'))),
+        batch_size=1000,
+    )
+    RecruiterJobTotals.objects.bulk_create(
+        (RecruiterJobTotals(recruiter_id=r['recruiter'], job_id=r['job'], count=r['total'])
+         for r in daily.values('recruiter', 'job').annotate(total=Sum('count'))),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_application_sync'),
+        ('statsapi', '0001_daily_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecruiterDailyTotals',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+                ('recruiter', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('recruiter', 'day'), name='stats_recruiter_day_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RecruiterJobTotals',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='jobs.job')),
+                ('recruiter', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('recruiter', 'job'), name='stats_recruiter_job_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.2 on 2026-10-18 16:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statsapi', '0002_recruiter_totals'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('jobs_posted', models.IntegerField(default=0)),
+                ('applications', models.IntegerField(default=0)),
+                ('accepted', models.IntegerField(default=0)),
+                ('rejected', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PlatformSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('refreshed_at', models.DateTimeField()),
+                ('duration_ms', models.IntegerField(default=0)),
+                ('summary', models.JSONField(default=dict)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PlatformRecruiterStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jobs', models.IntegerField(default=0)),
+                ('applications', models.IntegerField(default=0)),
+                ('accepted', models.IntegerField(default=0)),
+                ('recruiter', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-applications'], name='stats_platform_top_idx')],
+            },
+        ),
+    ]
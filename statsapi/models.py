@@ -1,3 +1,102 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+class RecruiterDailyStats(models.Model):
+    """
+    מספר המועמדויות למשרה של מגייס, לפי יום ההגשה והסטטוס הנוכחי.
+    מתוחזק אינקרמנטלית (statsapi/signals.py); בנייה מחדש - rebuild_stats_rollups.
+    """
+    recruiter = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+", db_index=False)
+    job       = models.ForeignKey("jobs.Job", on_delete=models.CASCADE, related_name="+")
+    day       = models.DateField()
+    status    = models.CharField(max_length=20)
+    count     = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["recruiter", "day", "job", "status"], name="stats_recruiter_daily_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.recruiter_id} · job {self.job_id} · {self.day} · {self.status}: {self.count}"
+
+
+class RecruiterDailyTotals(models.Model):
+    """סה״כ מועמדויות למגייס ליום (כל המשרות והסטטוסים) - לסדרות הזמן; שורה ליום"""
+    recruiter = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+", db_index=False)
+    day       = models.DateField()
+    count     = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["recruiter", "day"], name="stats_recruiter_day_uniq")]
+
+    def __str__(self):
+        return f"{self.recruiter_id} · {self.day}: {self.count}"
+
+
+class RecruiterJobTotals(models.Model):
+    """סה״כ מועמדויות למשרה של מגייס (כל הימים והסטטוסים) - לסה״כ ולחלוקה לפי משרה"""
+    recruiter = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+", db_index=False)
+    job       = models.ForeignKey("jobs.Job", on_delete=models.CASCADE, related_name="+")
+    count     = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["recruiter", "job"], name="stats_recruiter_job_uniq")]
+
+    def __str__(self):
+        return f"{self.recruiter_id} · job {self.job_id}: {self.count}"
+
+
+class SeekerDailyStats(models.Model):
+    """מספר ההגשות של מחפש עבודה לפי יום ההגשה והסטטוס הנוכחי"""
+    seeker = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+", db_index=False)
+    day    = models.DateField()
+    status = models.CharField(max_length=20)
+    count  = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["seeker", "day", "status"], name="stats_seeker_daily_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.seeker_id} · {self.day} · {self.status}: {self.count}"
+
+
+# --- אגרגציות לכל הפלטפורמה (statsapi/platform_stats.py) - נבנות מחדש ע"י refresh_platform_stats ---
+
+class PlatformDailyStats(models.Model):
+    """משרות שפורסמו ומועמדויות שהוגשו ביום (לפי הסטטוס הנוכחי), לכל הפלטפורמה"""
+    day          = models.DateField(unique=True)
+    jobs_posted  = models.IntegerField(default=0)
+    applications = models.IntegerField(default=0)
+    accepted     = models.IntegerField(default=0)
+    rejected     = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.day}: {self.jobs_posted} jobs, {self.applications} applications"
+
+
+class PlatformRecruiterStats(models.Model):
+    """סה״כ לכל מגייס (ל"מגייסים מובילים")"""
+    recruiter    = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    jobs         = models.IntegerField(default=0)
+    applications = models.IntegerField(default=0)
+    accepted     = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["-applications"], name="stats_platform_top_idx")]
+
+    def __str__(self):
+        return f"{self.recruiter_id}: {self.applications} applications"
+
+
+class PlatformSnapshot(models.Model):
+    """שורה אחת (pk=1): מתי הטבלאות רועננו, וסיכומים קטנים שלא צריכים טבלה משלהם"""
+    refreshed_at = models.DateTimeField()
+    duration_ms  = models.IntegerField(default=0)
+    summary      = models.JSONField(default=dict)
+
+    def __str__(self):
+        return f"platform stats @ {self.refreshed_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,99 @@
+# statsapi/platform_stats.py
+"""
+אגרגציות לכל הפלטפורמה (/api/stats/platform/, staff בלבד).
+
+refresh() בונה מחדש את PlatformDailyStats / PlatformRecruiterStats / PlatformSnapshot
+(python manage.py refresh_platform_stats, מ-cron מחוץ לשעות העומס). ה-endpoint קורא רק
+מהן - אף פעם לא סורק את Job / Application בזמן בקשה.
+
+- המועמדויות נלקחות מה-rollups היומיים (RecruiterDailyStats / RecruiterJobTotals), לא
+  מטבלת המועמדויות; רק ספירת המשרות עוברת על Job (GROUP BY אחד ליום ואחד למגייס).
+- הכל בטרנזקציה אחת: קוראים רואים את הגרסה הקודמת עד ה-commit ואז את החדשה בשלמותה
+  (כמו REFRESH MATERIALIZED VIEW CONCURRENTLY, אבל גם על SQLite ובלי SQL ייעודי ל-PostgreSQL).
+"""
+import time
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from jobs.models import Job
+
+from .models import (
+    PlatformDailyStats, PlatformRecruiterStats, PlatformSnapshot, RecruiterDailyStats, RecruiterJobTotals,
+)
+
+# טווחי "מועמדויות למשרה" בהיסטוגרמה (כולל; None - בלי גבול עליון)
+HISTOGRAM = ((1, 4), (5, 19), (20, 99), (100, None))
+
+
+def _label(low, high):
+    return f"{low}+" if high is None else f"{low}-{high}"
+
+
+def _per_job_summary(jobs_total):
+    """ממוצע והיסטוגרמה של מועמדויות למשרה - שאילתה אחת על RecruiterJobTotals"""
+    totals = RecruiterJobTotals.objects.filter(count__gt=0)
+    ranges = {
+        _label(low, high): Count("id", filter=Q(count__gte=low) if high is None else Q(count__range=(low, high)))
+        for low, high in HISTOGRAM
+    }
+    row = totals.aggregate(applications=Sum("count"), with_applications=Count("id"), **ranges)
+    applications = row.pop("applications") or 0
+    histogram = [{"range": "0", "jobs": max(jobs_total - row.pop("with_applications"), 0)}]
+    histogram += [{"range": label, "jobs": jobs} for label, jobs in row.items()]
+    return {
+        "jobs_total": jobs_total,
+        "applications_total": applications,
+        "applications_per_job": {
+            "average": round(applications / jobs_total, 2) if jobs_total else 0,
+            "histogram": histogram,
+        },
+    }
+
+
+def refresh(now=None):
+    """בונה מחדש את כל טבלאות הפלטפורמה; מחזיר את ה-PlatformSnapshot החדש"""
+    started = time.monotonic()
+    applications = RecruiterDailyStats.objects.order_by()
+
+    days = defaultdict(dict)
+    for row in Job.objects.annotate(day=TruncDate("created_at")).values("day").annotate(total=Count("id")).order_by():
+        days[row["day"]]["jobs_posted"] = row["total"]
+    for row in applications.values("day", "status").annotate(total=Sum("count")):
+        day = days[row["day"]]
+        day["applications"] = day.get("applications", 0) + row["total"]
+        if row["status"] in ("accepted", "rejected"):
+            day[row["status"]] = row["total"]
+
+    recruiters = defaultdict(dict)
+    for row in Job.objects.values("posted_by").annotate(total=Count("id")).order_by():
+        recruiters[row["posted_by"]]["jobs"] = row["total"]
+    for row in applications.values("recruiter", "status").annotate(total=Sum("count")):
+        recruiter = recruiters[row["recruiter"]]
+        recruiter["applications"] = recruiter.get("applications", 0) + row["total"]
+        if row["status"] == "accepted":
+            recruiter["accepted"] = row["total"]
+
+    with transaction.atomic():
+        PlatformDailyStats.objects.all().delete()
+        PlatformDailyStats.objects.bulk_create(
+            (PlatformDailyStats(day=day, **counts) for day, counts in days.items()), batch_size=1000,
+        )
+        PlatformRecruiterStats.objects.all().delete()
+        PlatformRecruiterStats.objects.bulk_create(
+            (PlatformRecruiterStats(recruiter_id=pk, **counts) for pk, counts in recruiters.items()),
+            batch_size=1000,
+        )
+        summary = _per_job_summary(Job.objects.count())
+        snapshot, _ = PlatformSnapshot.objects.update_or_create(
+            pk=1,
+            defaults={
+                "refreshed_at": now or timezone.now(),
+                "duration_ms": int((time.monotonic() - started) * 1000),
+                "summary": summary,
+            },
+        )
+    return snapshot
@@ -0,0 +1,122 @@
+# statsapi/reviews.py
+"""
+מדדי בדיקה למגייס (/api/stats/recruiter/reviews/):
+
+- זמן עד בדיקה ראשונה (reviewed_at - created_at, בשניות) - p50 / p90 / p95, למועמדויות
+  שנבדקו בחלון. ב-PostgreSQL - percentile_cont בשאילתה אחת; ב-SQLite (אין percentile_cont) -
+  COUNT ואז שתי השורות השכנות לכל אחוזון (ORDER BY ... LIMIT 2 OFFSET k), עם אותה אינטרפולציה.
+  הסינון לפי (job, reviewed_at) - האינדקס jobs_app_job_reviewed_idx.
+- משפך לכל משרה (pending / accepted / rejected / withdrawn לפי הסטטוס הנוכחי, להגשות בחלון) -
+  מ-RecruiterDailyStats, לא מטבלת המועמדויות.
+"""
+import math
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Aggregate, Count, FloatField, Func, Sum
+from django.utils import timezone
+
+from jobs.models import Application
+
+from .models import RecruiterDailyStats
+from .series import WINDOWS
+
+PERCENTILES = (0.5, 0.9, 0.95)
+FUNNEL_STATUSES = ("pending", "accepted", "rejected", "withdrawn")
+
+
+class ReviewSeconds(Func):
+    """reviewed_at - created_at בשניות"""
+    arg_joiner = ") - julianday("
+    template = "((julianday(%(expressions)s)) * 86400.0)"
+    output_field = FloatField()
+
+    def __init__(self, **extra):
+        super().__init__("reviewed_at", "created_at", **extra)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, template="EXTRACT(EPOCH FROM (%(expressions)s))", arg_joiner=" - ",
+            **extra_context,
+        )
+
+
+class PercentileCont(Aggregate):
+    """percentile_cont(p) WITHIN GROUP (ORDER BY expression) - PostgreSQL בלבד"""
+    function = "percentile_cont"
+    template = "%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+    output_field = FloatField()
+
+    def __init__(self, expression, percentile, **extra):
+        super().__init__(expression, percentile=float(percentile), **extra)
+
+
+def _label(p):
+    return f"p{round(p * 100)}"
+
+
+def _percentiles_fallback(reviewed):
+    """אינטרפולציה לינארית כמו percentile_cont: COUNT ואז שתי שורות שכנות לכל אחוזון"""
+    count = reviewed.count()
+    ordered = reviewed.annotate(seconds=ReviewSeconds()).order_by("seconds").values_list("seconds", flat=True)
+    row = {"reviewed": count}
+    for p in PERCENTILES:
+        if not count:
+            row[_label(p)] = None
+            continue
+        position = p * (count - 1)
+        low = math.floor(position)
+        values = list(ordered[low:low + 2])
+        upper = values[-1]
+        row[_label(p)] = values[0] + (upper - values[0]) * (position - low)
+    return row
+
+
+def review_latency(applications):
+    """מספר המועמדויות שנבדקו ואחוזוני זמן-עד-בדיקה (שניות)"""
+    reviewed = applications.filter(reviewed_at__isnull=False).order_by()
+    if connection.vendor == "postgresql":
+        row = reviewed.aggregate(
+            reviewed=Count("id"), **{_label(p): PercentileCont(ReviewSeconds(), p) for p in PERCENTILES}
+        )
+    else:
+        row = _percentiles_fallback(reviewed)
+    count = row.pop("reviewed")
+    return {
+        "reviewed": count,
+        "seconds": {key: round(value, 1) if value is not None else None for key, value in row.items()},
+    }
+
+
+def funnel(rollups):
+    """rollups - שורות RecruiterDailyStats בחלון; מחזיר שורה לכל משרה, מהגדולה לקטנה"""
+    jobs = {}
+    for row in rollups.values("job_id", "job__title", "status").annotate(total=Sum("count")).order_by():
+        job = jobs.setdefault(row["job_id"], {
+            "job_id": row["job_id"], "job__title": row["job__title"], **dict.fromkeys(FUNNEL_STATUSES, 0),
+        })
+        job[row["status"]] = job.get(row["status"], 0) + row["total"]
+    result = []
+    for job in jobs.values():
+        job["submitted"] = sum(job[status] for status in FUNNEL_STATUSES)
+        if not job["submitted"]:
+            continue
+        reviewed = job["accepted"] + job["rejected"]
+        job["review_rate"] = round(reviewed / job["submitted"], 4)
+        job["acceptance_rate"] = round(job["accepted"] / reviewed, 4) if reviewed else None
+        result.append(job)
+    return sorted(result, key=lambda job: (-job["submitted"], job["job_id"]))
+
+
+def review_metrics(user, window, now=None):
+    now = now or timezone.now()
+    since = now - timedelta(days=WINDOWS[window])
+    applications = Application.objects.filter(job__posted_by=user, reviewed_at__gte=since)
+    rollups = RecruiterDailyStats.objects.filter(
+        recruiter=user, day__gt=timezone.localdate(now) - timedelta(days=WINDOWS[window]),
+    )
+    return {
+        "window": window,
+        "time_to_first_review": review_latency(applications),
+        "funnel": funnel(rollups),
+    }
@@ -0,0 +1,137 @@
+# statsapi/rollups.py
+"""
+טבלאות rollup לדשבורדים:
+
+- RecruiterDailyStats  (recruiter, day, job, status) - הטבלה המלאה; מקור לבנייה מחדש של הסיכומים
+- RecruiterDailyTotals (recruiter, day)              - סדרות זמן (statsapi/series.py)
+- RecruiterJobTotals   (recruiter, job)              - סה״כ וחלוקה לפי משרה
+- SeekerDailyStats     (seeker, day, status)         - דשבורד המועמד (מעט שורות למשתמש)
+
+move - עדכון אינקרמנטלי באותה טרנזקציה של השינוי במועמדות. כל טבלה מתעדכנת רק אם
+המפתח שלה השתנה (שינוי סטטוס לא נוגע בסיכומים). הוספה היא upsert אחד
+(INSERT ... ON CONFLICT DO UPDATE - PostgreSQL ו-SQLite); הפחתה היא UPDATE בלבד -
+שורה שלא קיימת (למשל באמצע cascade שכבר מחק את ה-rollup של המשרה) לא נוצרת מחדש.
+
+rebuild_jobs / rebuild_seekers - חישוב מחדש מטבלת המועמדויות עבור מפתחות נתונים
+(מסלולי bulk, והפקודה rebuild_stats_rollups).
+
+היום הוא יום ההגשה (created_at, באזור הזמן של האתר); הסטטוס - הסטטוס הנוכחי.
+"""
+from django.db import connection, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from jobs.models import Application, Job
+
+from .models import RecruiterDailyStats, RecruiterDailyTotals, RecruiterJobTotals, SeekerDailyStats
+
+# (טבלה, השדות מה-state שמרכיבים את המפתח שלה)
+TABLES = (
+    (RecruiterDailyStats, ("recruiter_id", "day", "job_id", "status")),
+    (RecruiterDailyTotals, ("recruiter_id", "day")),
+    (RecruiterJobTotals, ("recruiter_id", "job_id")),
+    (SeekerDailyStats, ("seeker_id", "day", "status")),
+)
+
+
+def _upsert(model, key, delta):
+    """INSERT ... ON CONFLICT (המפתח הייחודי) DO UPDATE SET count = count + excluded.count"""
+    qn = connection.ops.quote_name
+    [unique] = model._meta.constraints
+    fields = [model._meta.get_field(name) for name in unique.fields]
+    table, columns, count = qn(model._meta.db_table), ", ".join(qn(f.column) for f in fields), qn("count")
+    sql = (
+        f"INSERT INTO {table} ({columns}, {count}) VALUES ({', '.join(['%s'] * (len(fields) + 1))}) "
+        f"ON CONFLICT ({columns}) DO UPDATE SET {count} = {table}.{count} + excluded.{count}"
+    )
+    params = [f.get_db_prep_value(key[f.attname], connection) for f in fields]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*params, delta])
+
+
+def state(application, *, recruiter_id, job_id=None, status=None):
+    """המפתחות של מועמדות בכל הטבלאות (ברירת מחדל - המשרה והסטטוס הנוכחיים שלה)"""
+    return {
+        "recruiter_id": recruiter_id,
+        "job_id": job_id or application.job_id,
+        "seeker_id": application.applicant_id,
+        "day": timezone.localdate(application.created_at),
+        "status": status or application.status,
+    }
+
+
+def _key(state, fields):
+    if state is None or any(state[name] is None for name in fields):
+        return None
+    return {name: state[name] for name in fields}
+
+
+def move(old, new):
+    """מועמדות עברה מ-old ל-new (state, או None ליצירה / מחיקה)"""
+    for model, fields in TABLES:
+        old_key, new_key = _key(old, fields), _key(new, fields)
+        if old_key == new_key:
+            continue
+        if old_key is not None:
+            model.objects.filter(**old_key).update(count=F("count") - 1)
+        if new_key is not None:
+            _upsert(model, new_key, 1)
+
+
+def _grouped(applications, *keys):
+    return (
+        applications.annotate(day=TruncDate("created_at"))
+        .values(*keys, "day", "status")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+
+
+def rebuild_recruiter_totals(recruiter_ids):
+    """הסיכומים נגזרים מ-RecruiterDailyStats (לא מטבלת המועמדויות)"""
+    daily = RecruiterDailyStats.objects.filter(recruiter_id__in=recruiter_ids).order_by()
+    RecruiterDailyTotals.objects.filter(recruiter_id__in=recruiter_ids).delete()
+    RecruiterDailyTotals.objects.bulk_create(
+        RecruiterDailyTotals(recruiter_id=row["recruiter"], day=row["day"], count=row["total"])
+        for row in daily.values("recruiter", "day").annotate(total=Sum("count"))
+    )
+    RecruiterJobTotals.objects.filter(recruiter_id__in=recruiter_ids).delete()
+    RecruiterJobTotals.objects.bulk_create(
+        RecruiterJobTotals(recruiter_id=row["recruiter"], job_id=row["job"], count=row["total"])
+        for row in daily.values("recruiter", "job").annotate(total=Sum("count"))
+    )
+
+
+def rebuild_jobs(job_ids):
+    """
+    מחשב מחדש את ה-rollups של המשרות ואת הסיכומים של המגייסים שלהן (נועל את המשרות מול הגשות
+    במקביל). מחזיר את ה-ids של המגייסים שהושפעו.
+    """
+    job_ids = list(job_ids)
+    with transaction.atomic():
+        list(Job.objects.select_for_update().filter(pk__in=job_ids).values_list("pk", flat=True))
+        recruiter_ids = set(
+            RecruiterDailyStats.objects.filter(job_id__in=job_ids).values_list("recruiter_id", flat=True)
+        ) | set(Job.objects.filter(pk__in=job_ids).values_list("posted_by_id", flat=True))
+        RecruiterDailyStats.objects.filter(job_id__in=job_ids).delete()
+        RecruiterDailyStats.objects.bulk_create(
+            RecruiterDailyStats(
+                recruiter_id=row["job__posted_by"], job_id=row["job"], day=row["day"],
+                status=row["status"], count=row["total"],
+            )
+            for row in _grouped(Application.objects.filter(job_id__in=job_ids), "job", "job__posted_by")
+        )
+        rebuild_recruiter_totals(recruiter_ids)
+    return recruiter_ids
+
+
+def rebuild_seekers(seeker_ids):
+    """מחשב מחדש את SeekerDailyStats של המשתמשים"""
+    seeker_ids = list(seeker_ids)
+    with transaction.atomic():
+        SeekerDailyStats.objects.filter(seeker_id__in=seeker_ids).delete()
+        SeekerDailyStats.objects.bulk_create(
+            SeekerDailyStats(seeker_id=row["applicant"], day=row["day"], status=row["status"], count=row["total"])
+            for row in _grouped(Application.objects.filter(applicant_id__in=seeker_ids), "applicant")
+        )
@@ -0,0 +1,24 @@
+from rest_framework import serializers
+
+from .series import ALLOWED_BUCKETS, DEFAULT_BUCKET, WINDOWS
+
+
+class StatsWindowSerializer(serializers.Serializer):
+    """?window=24h|7d|30d|90d|365d&bucket=hour|day|week (bucket ברירת מחדל - לפי החלון)"""
+    window = serializers.ChoiceField(choices=list(WINDOWS), default="7d")
+    bucket = serializers.ChoiceField(choices=["hour", "day", "week"], required=False)
+
+    def validate(self, attrs):
+        window = attrs["window"]
+        attrs.setdefault("bucket", DEFAULT_BUCKET[window])
+        if attrs["bucket"] not in ALLOWED_BUCKETS[window]:
+            raise serializers.ValidationError(
+                {"bucket": [f"'{attrs['bucket']}' is not allowed for window {window}; "
+                            f"use one of: {', '.join(ALLOWED_BUCKETS[window])}."]}
+            )
+        return attrs
+
+
+class DailyWindowSerializer(serializers.Serializer):
+    """?window=7d|30d|90d|365d - למדדים שמחושבים ברזולוציה יומית (פלטפורמה, מדדי בדיקה)"""
+    window = serializers.ChoiceField(choices=[w for w in WINDOWS if w != "24h"], default="30d")
@@ -0,0 +1,116 @@
+# statsapi/series.py
+"""
+סדרות זמן לדשבורדים: חלון (24h / 7d / 30d / 90d / 365d) ו-bucket (hour / day / week).
+
+- day / week - שאילתה מקובצת אחת על טבלאות ה-rollup היומיות (statsapi/rollups.py);
+  העלות תלויה במספר הימים בחלון, לא במספר המועמדויות.
+- hour (רק 24h / 7d) - שאילתה מקובצת אחת על המועמדויות עצמן, מוגבלת לטווח החלון באינדקס.
+- הכל ב-TIME_ZONE; buckets בלי פעילות מושלמים כאן עם count=0 (הלקוח לא משלים פערים).
+- התשובה נשמרת ב-cache לכל (משתמש, חלון, bucket) עם TTL קצר (STATS_CACHE_TTLS);
+  invalidate מוחק את כל החלונות של משתמש מיד (למשל מדדי הבדיקה, בשינוי סטטוס).
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncHour, TruncWeek
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+WINDOWS = {"24h": 1, "7d": 7, "30d": 30, "90d": 90, "365d": 365}  # ימים
+ALLOWED_BUCKETS = {
+    "24h": ("hour",),
+    "7d": ("hour", "day"),
+    "30d": ("day", "week"),
+    "90d": ("day", "week"),
+    "365d": ("day", "week"),
+}
+DEFAULT_BUCKET = {"24h": "hour", "7d": "day", "30d": "day", "90d": "week", "365d": "week"}
+DEFAULT_CACHE_TTLS = {"hour": 30, "day": 120, "week": 600}  # שניות
+
+
+def bucket_starts(window, bucket, now=None):
+    """תחילת כל bucket בחלון, מהישן לחדש (hour - datetime מקומי, day/week - date)"""
+    now = timezone.localtime(now)
+    days = WINDOWS[window]
+    if bucket == "hour":
+        last = now.replace(minute=0, second=0, microsecond=0)
+        # חשבון ב-UTC - מעבר שעון קיץ/חורף לא מדלג על שעה ולא מכפיל אותה
+        return [timezone.localtime(last - timedelta(hours=h)) for h in range(days * 24 - 1, -1, -1)]
+    today = now.date()
+    first = today - timedelta(days=days - 1)
+    if bucket == "day":
+        return [first + timedelta(days=d) for d in range(days)]
+    first -= timedelta(days=first.weekday())  # יום שני, כמו TruncWeek
+    return [first + timedelta(weeks=w) for w in range((today - first).days // 7 + 1)]
+
+
+def series(window, bucket, *, rollups, applications, now=None):
+    """
+    rollups      - queryset של שורות rollup יומיות של המשתמש (day, count)
+    applications - queryset של המועמדויות שלו (ל-bucket של שעות)
+    מחזיר [{"date": תחילת ה-bucket, "count": n}, ...] כולל buckets ריקים.
+    """
+    starts = bucket_starts(window, bucket, now)
+    if bucket == "hour":
+        rows = (
+            applications.filter(created_at__gte=starts[0])
+            .annotate(bucket=TruncHour("created_at"))
+            .values("bucket")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+        counts = {row["bucket"]: row["total"] for row in rows}
+    else:
+        rows = rollups.filter(day__gte=starts[0])
+        if bucket == "week":
+            rows = rows.annotate(bucket=TruncWeek("day")).values("bucket")
+        else:
+            rows = rows.values(bucket=F("day"))
+        counts = {row["bucket"]: row["total"] for row in rows.annotate(total=Sum("count")).order_by()}
+    return [{"date": start, "count": counts.get(start, 0)} for start in starts]
+
+
+def _cache_key(scope, user_id, window, bucket):
+    return f"stats:{scope}:{user_id}:{window}:{bucket}"
+
+
+def cached(scope, user_id, window, bucket, compute):
+    """compute() - פעם אחת לכל TTL לכל (scope, משתמש, חלון, bucket); Redis לא זמין - מחשבים ישירות"""
+    key = _cache_key(scope, user_id, window, bucket)
+    try:
+        data = cache.get(key)
+    except Exception as exc:  # redis.ConnectionError, TimeoutError וכו'
+        logger.warning("stats cache unavailable: %s", exc)
+        return compute()
+    if data is None:
+        data = compute()
+        ttl = getattr(settings, "STATS_CACHE_TTLS", DEFAULT_CACHE_TTLS)[bucket]
+        try:
+            cache.set(key, data, ttl)
+        except Exception as exc:
+            logger.warning("stats cache unavailable: %s", exc)
+    return data
+
+
+def invalidate(scope, user_ids):
+    """מוחק את כל ה-(חלון, bucket) של המשתמשים ב-scope, אחרי ה-commit"""
+    keys = [
+        _cache_key(scope, user_id, window, bucket)
+        for user_id in set(user_ids) - {None}
+        for window, buckets in ALLOWED_BUCKETS.items()
+        for bucket in buckets
+    ]
+
+    def delete():
+        try:
+            cache.delete_many(keys)
+        except Exception as exc:
+            logger.warning("stats cache unavailable: %s", exc)
+
+    if keys:
+        transaction.on_commit(delete)
@@ -0,0 +1,50 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from jobs.models import Application, Job, applications_bulk_changed
+
+from . import rollups
+from .series import invalidate
+
+
+def _recruiter_id(application, job_id=None):
+    """מפרסם המשרה - מה-Job שכבר טעון אם אפשר, אחרת שאילתה אחת"""
+    job_id = job_id or application.job_id
+    if job_id == application.job_id and Application.job.is_cached(application):
+        return application.job.posted_by_id
+    return Job.objects.filter(pk=job_id).values_list("posted_by_id", flat=True).first()
+
+
+# rollups לדשבורדים (statsapi/rollups.py) - באותה טרנזקציה של השינוי.
+# מדדי הבדיקה (statsapi/reviews.py) של המגייסים המושפעים יוצאים מה-cache אחרי ה-commit.
+@receiver(post_save, sender=Application)
+def rollup_on_application_saved(sender, instance: Application, created, update_fields=None, **kwargs):
+    if created:
+        new = rollups.state(instance, recruiter_id=_recruiter_id(instance))
+        rollups.move(None, new)
+        invalidate("reviews", [new["recruiter_id"]])
+        return
+    changed = instance.changed_fields
+    if update_fields is not None:
+        changed &= set(update_fields)
+    if not {"status", "job"} & changed:
+        return
+    old_job_id = instance.previous("job")
+    old = rollups.state(instance, recruiter_id=_recruiter_id(instance, old_job_id), job_id=old_job_id,
+                        status=instance.previous("status"))
+    new = rollups.state(instance, recruiter_id=_recruiter_id(instance))
+    rollups.move(old, new)
+    invalidate("reviews", [old["recruiter_id"], new["recruiter_id"]])
+
+
+@receiver(post_delete, sender=Application)
+def rollup_on_application_deleted(sender, instance: Application, **kwargs):
+    old = rollups.state(instance, recruiter_id=_recruiter_id(instance))
+    rollups.move(old, None)
+    invalidate("reviews", [old["recruiter_id"]])
+
+
+@receiver(applications_bulk_changed)
+def rollup_on_bulk_change(sender, job_ids, applicant_ids, **kwargs):
+    invalidate("reviews", rollups.rebuild_jobs(job_ids))
+    rollups.rebuild_seekers(applicant_ids)
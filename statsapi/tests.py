@@ -1,3 +1,315 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts.models import Roles
+from jobs.models import Application, Job
+from .models import RecruiterDailyStats, RecruiterDailyTotals, RecruiterJobTotals, SeekerDailyStats
+from .series import bucket_starts, series
+
+User = get_user_model()
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class DailyRollupTests(APITestCase):
+    """ה-rollups מתוחזקים אינקרמנטלית ותואמים לספירה חיה מטבלת המועמדויות"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+        cls.other_recruiter = User.objects.create_user(email="hr2@example.com", password="x", role=Roles.RECRUITER)
+        cls.seekers = [
+            User.objects.create_user(email=f"js{i}@example.com", password="x", role=Roles.SEEKER) for i in range(4)
+        ]
+        cls.jobs = [
+            Job.objects.create(posted_by=recruiter, title=f"Job {i}", status="open",
+                               description="Build and maintain internal Django services.")
+            for i, recruiter in enumerate([cls.recruiter, cls.recruiter, cls.other_recruiter])
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def _rollups(self):
+        recruiter = {
+            (r.recruiter_id, r.job_id, r.day, r.status): r.count
+            for r in RecruiterDailyStats.objects.all() if r.count
+        }
+        daily = {(r.recruiter_id, r.day): r.count for r in RecruiterDailyTotals.objects.all() if r.count}
+        by_job = {(r.recruiter_id, r.job_id): r.count for r in RecruiterJobTotals.objects.all() if r.count}
+        seeker = {(r.seeker_id, r.day, r.status): r.count for r in SeekerDailyStats.objects.all() if r.count}
+        return recruiter, daily, by_job, seeker
+
+    def _live(self):
+        recruiter, daily, by_job, seeker = {}, {}, {}, {}
+        for app in Application.objects.select_related("job"):
+            day = timezone.localdate(app.created_at)
+            for counts, key in (
+                (recruiter, (app.job.posted_by_id, app.job_id, day, app.status)),
+                (daily, (app.job.posted_by_id, day)),
+                (by_job, (app.job.posted_by_id, app.job_id)),
+                (seeker, (app.applicant_id, day, app.status)),
+            ):
+                counts[key] = counts.get(key, 0) + 1
+        return recruiter, daily, by_job, seeker
+
+    def test_incremental_updates_match_live_counts(self):
+        a = Application.objects.apply(self.jobs[0], self.seekers[0])
+        b = Application.objects.create(job=self.jobs[0], applicant=self.seekers[1])
+        Application.objects.create(job=self.jobs[1], applicant=self.seekers[2])
+        self.assertEqual(self._rollups(), self._live())
+
+        a.status = "accepted"
+        a.save()
+        b.job = self.jobs[2]  # מעבר למשרה של מגייס אחר
+        b.save()
+        self.assertEqual(self._rollups(), self._live())
+
+        Application.objects.filter(job=self.jobs[1]).update(status="rejected")
+        Application.objects.bulk_create([Application(job=self.jobs[1], applicant=self.seekers[3])])
+        a.delete()
+        self.assertEqual(self._rollups(), self._live())
+
+        self.jobs[2].delete()  # cascade
+        self.assertEqual(self._rollups(), self._live())
+
+    def test_rebuild_command_matches_incremental(self):
+        for seeker, job in zip(self.seekers, self.jobs):
+            Application.objects.create(job=job, applicant=seeker)
+        expected = self._rollups()
+        RecruiterDailyStats.objects.update(count=99)
+        RecruiterJobTotals.objects.all().delete()
+        SeekerDailyStats.objects.all().delete()
+        call_command("rebuild_stats_rollups", "--batch-size", "1", stdout=StringIO())
+        self.assertEqual(self._rollups(), expected)
+
+    def test_overview_views_read_rollups(self):
+        old = Application.objects.create(job=self.jobs[0], applicant=self.seekers[0])
+        Application.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=30))
+        call_command("rebuild_stats_rollups", stdout=StringIO())
+        for seeker in self.seekers[1:3]:
+            Application.objects.create(job=self.jobs[1], applicant=seeker, status="accepted")
+
+        self.client.force_authenticate(self.recruiter)
+        # משרות, חלוקה לפי משרה, סדרת הזמן
+        with self.assertNumQueries(3):
+            res = self.client.get("/api/stats/recruiter/overview/")
+        self.assertEqual(res.data["jobs_total"], 2)
+        self.assertEqual(res.data["applications_total"], 3)
+        self.assertEqual(
+            [(r["job_id"], r["count"]) for r in res.data["applications_by_job"]],
+            [(self.jobs[1].pk, 2), (self.jobs[0].pk, 1)],
+        )
+        today = timezone.localdate()
+        self.assertEqual((res.data["window"], res.data["bucket"]), ("7d", "day"))
+        self.assertEqual(res.data["series"], [
+            {"date": today - timedelta(days=d), "count": 2 if d == 0 else 0} for d in range(6, -1, -1)
+        ])
+        self.assertEqual(res.data["last_7d_applications"], res.data["series"])
+
+        self.client.force_authenticate(self.seekers[0])
+        res = self.client.get("/api/stats/seeker/overview/", {"window": "30d"})
+        self.assertEqual(res.data["applications_total"], 1)
+        self.assertEqual(res.data["by_status"], [{"status": "pending", "count": 1}])
+        self.assertEqual(len(res.data["series"]), 30)
+        self.assertEqual(sum(point["count"] for point in res.data["series"]), 0)  # לפני 30 ימים - מחוץ לחלון
+        self.assertNotIn("last_7d_submissions", res.data)
+
+    def test_window_and_bucket_validation(self):
+        self.client.force_authenticate(self.recruiter)
+        for params in ({"window": "2y"}, {"window": "365d", "bucket": "hour"}, {"window": "24h", "bucket": "day"}):
+            res = self.client.get("/api/stats/recruiter/overview/", params)
+            self.assertEqual(res.status_code, 400, params)
+        res = self.client.get("/api/stats/recruiter/overview/", {"window": "90d"})
+        self.assertEqual(res.data["bucket"], "week")
+
+    def test_series_buckets_are_gap_filled(self):
+        now = timezone.now()
+        Application.objects.create(job=self.jobs[0], applicant=self.seekers[0])
+        late = Application.objects.create(job=self.jobs[1], applicant=self.seekers[1])
+        Application.objects.filter(pk=late.pk).update(created_at=now - timedelta(days=10))
+        call_command("rebuild_stats_rollups", stdout=StringIO())
+        kwargs = {
+            "rollups": RecruiterDailyTotals.objects.filter(recruiter=self.recruiter),
+            "applications": Application.objects.filter(job__posted_by=self.recruiter),
+            "now": now,
+        }
+
+        hours = series("24h", "hour", **kwargs)
+        self.assertEqual(len(hours), 24)
+        self.assertEqual([p["count"] for p in hours[-1:]], [1])
+        self.assertEqual(sum(p["count"] for p in hours), 1)
+
+        weeks = series("30d", "week", **kwargs)
+        self.assertEqual([p["date"] for p in weeks], bucket_starts("30d", "week", now))
+        self.assertTrue(all(p["date"].weekday() == 0 for p in weeks))
+        self.assertEqual(sum(p["count"] for p in weeks), 2)
+        self.assertEqual(weeks[-1]["count"], 1)
+
+    def test_overview_is_cached_per_window(self):
+        self.client.force_authenticate(self.recruiter)
+        self.client.get("/api/stats/recruiter/overview/")
+        Application.objects.create(job=self.jobs[0], applicant=self.seekers[0])
+        with self.assertNumQueries(0):
+            res = self.client.get("/api/stats/recruiter/overview/")
+        self.assertEqual(res.data["applications_total"], 0)  # עד תום ה-TTL
+        res = self.client.get("/api/stats/recruiter/overview/", {"window": "30d"})
+        self.assertEqual(res.data["applications_total"], 1)
+
+
+class PlatformStatsTests(APITestCase):
+    """/api/stats/platform/ - רק מהאגרגציות, ומתעדכן רק ברענון"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(email="staff@example.com", password="x", is_staff=True)
+        cls.recruiters = [
+            User.objects.create_user(email=f"hr{i}@example.com", password="x", role=Roles.RECRUITER) for i in range(2)
+        ]
+        cls.seekers = [
+            User.objects.create_user(email=f"js{i}@example.com", password="x", role=Roles.SEEKER) for i in range(3)
+        ]
+        cls.jobs = [
+            Job.objects.create(posted_by=recruiter, title=f"Job {i}", status="open",
+                               description="Build and maintain internal Django services.")
+            for i, recruiter in enumerate([cls.recruiters[0], cls.recruiters[0], cls.recruiters[1]])
+        ]
+        for seeker, status in zip(cls.seekers, ["accepted", "rejected", "pending"]):
+            Application.objects.create(job=cls.jobs[0], applicant=seeker, status=status)
+        Application.objects.create(job=cls.jobs[2], applicant=cls.seekers[0], status="accepted")
+
+    def test_staff_only(self):
+        self.client.force_authenticate(self.recruiters[0])
+        self.assertEqual(self.client.get("/api/stats/platform/").status_code, 403)
+        self.client.force_authenticate(self.staff)
+        res = self.client.get("/api/stats/platform/", {"window": "24h"})
+        self.assertEqual(res.status_code, 400)
+        res = self.client.get("/api/stats/platform/")
+        self.assertIsNone(res.data["refreshed_at"])  # עוד לא רועננו
+        self.assertEqual(len(res.data["daily"]), 30)
+
+    def test_served_from_aggregates(self):
+        out = StringIO()
+        call_command("refresh_platform_stats", stdout=out)
+        self.assertIn("3 job(s), 4 application(s)", out.getvalue())
+        Application.objects.create(job=self.jobs[1], applicant=self.seekers[1])  # אחרי הרענון
+
+        self.client.force_authenticate(self.staff)
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get("/api/stats/platform/", {"window": "7d"})
+        self.assertEqual(len(ctx.captured_queries), 3)
+        scans = [q["sql"] for q in ctx.captured_queries if 'FROM "jobs_' in q["sql"] or 'JOIN "jobs_' in q["sql"]]
+        self.assertEqual(scans, [])
+
+        self.assertIsNotNone(res.data["refreshed_at"])
+        self.assertEqual(len(res.data["daily"]), 7)
+        self.assertEqual(
+            res.data["totals"],
+            {"jobs_posted": 3, "applications": 4, "accepted": 2, "rejected": 1, "acceptance_rate": 0.6667},
+        )
+        self.assertEqual(
+            [(r["recruiter_id"], r["jobs"], r["applications"], r["accepted"]) for r in res.data["top_recruiters"]],
+            [(self.recruiters[0].pk, 2, 3, 1), (self.recruiters[1].pk, 1, 1, 1)],
+        )
+        per_job = res.data["all_time"]["applications_per_job"]
+        self.assertEqual(per_job["average"], 1.33)
+        self.assertEqual(
+            [(b["range"], b["jobs"]) for b in per_job["histogram"]],
+            [("0", 1), ("1-4", 2), ("5-19", 0), ("20-99", 0), ("100+", 0)],
+        )
+
+        call_command("refresh_platform_stats", stdout=StringIO())
+        res = self.client.get("/api/stats/platform/", {"window": "7d"})
+        self.assertEqual(res.data["totals"]["applications"], 5)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class ReviewMetricsTests(APITestCase):
+    """reviewed_at, אחוזוני זמן-עד-בדיקה, משפך, ו-cache שמתנקה בשינוי סטטוס"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = User.objects.create_user(email="hr@example.com", password="x", role=Roles.RECRUITER)
+        cls.seekers = [
+            User.objects.create_user(email=f"js{i}@example.com", password="x", role=Roles.SEEKER) for i in range(6)
+        ]
+        cls.jobs = [
+            Job.objects.create(posted_by=cls.recruiter, title=f"Job {i}", status="open",
+                               description="Build and maintain internal Django services.")
+            for i in range(2)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_reviewed_at_is_set_once(self):
+        app = Application.objects.create(job=self.jobs[0], applicant=self.seekers[0])
+        app.status = "withdrawn"
+        app.save(update_fields=["status"])
+        self.assertIsNone(app.reviewed_at)
+
+        app = Application.objects.create(job=self.jobs[0], applicant=self.seekers[1])
+        app.status = "accepted"
+        app.save(update_fields=["status"])
+        app.refresh_from_db()
+        reviewed_at = app.reviewed_at
+        self.assertIsNotNone(reviewed_at)
+        app.status = "rejected"
+        app.save()
+        app.refresh_from_db()
+        self.assertEqual(app.reviewed_at, reviewed_at)
+
+        bulk = Application.objects.create(job=self.jobs[1], applicant=self.seekers[2])
+        Application.objects.filter(job=self.jobs[1]).update(status="rejected")
+        bulk.refresh_from_db()
+        self.assertIsNotNone(bulk.reviewed_at)
+        Application.objects.filter(job__in=self.jobs).update(status="accepted")
+        app.refresh_from_db()
+        self.assertEqual(app.reviewed_at, reviewed_at)
+
+    def test_percentiles_and_funnel(self):
+        now = timezone.now()
+        for seeker, hours in zip(self.seekers, [1, 2, 3, 4, 10]):
+            app = Application.objects.create(job=self.jobs[0], applicant=seeker, status="accepted")
+            Application.objects.filter(pk=app.pk).update(
+                created_at=now - timedelta(hours=hours + 1), reviewed_at=now - timedelta(hours=1),
+            )
+        Application.objects.create(job=self.jobs[1], applicant=self.seekers[5])
+        Application.objects.filter(job=self.jobs[0], applicant=self.seekers[4]).update(status="rejected")
+
+        self.client.force_authenticate(self.recruiter)
+        res = self.client.get("/api/stats/recruiter/reviews/", {"window": "7d"})
+        self.assertEqual(res.status_code, 200)
+        latency = res.data["time_to_first_review"]
+        self.assertEqual(latency["reviewed"], 5)
+        # percentile_cont: p90 = 4h + 0.6 * (10h - 4h)
+        self.assertEqual(latency["seconds"], {"p50": 10800.0, "p90": 27360.0, "p95": 31680.0})
+        self.assertEqual(
+            [(j["job_id"], j["submitted"], j["pending"], j["accepted"], j["rejected"], j["acceptance_rate"])
+             for j in res.data["funnel"]],
+            [(self.jobs[0].pk, 5, 0, 4, 1, 0.8), (self.jobs[1].pk, 1, 1, 0, 0, None)],
+        )
+
+    def test_cached_until_status_change(self):
+        app = Application.objects.create(job=self.jobs[0], applicant=self.seekers[0])
+        self.client.force_authenticate(self.recruiter)
+        res = self.client.get("/api/stats/recruiter/reviews/")
+        self.assertEqual(res.data["time_to_first_review"]["reviewed"], 0)
+        with self.assertNumQueries(0):
+            self.client.get("/api/stats/recruiter/reviews/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            app.status = "accepted"
+            app.save()
+        res = self.client.get("/api/stats/recruiter/reviews/")
+        self.assertEqual(res.data["time_to_first_review"]["reviewed"], 1)
+        self.assertEqual(res.data["funnel"][0]["accepted"], 1)
@@ -1,7 +1,9 @@
 from django.urls import path
-from .api import RecruiterOverviewView, SeekerOverviewView
+from .api import PlatformOverviewView, RecruiterOverviewView, RecruiterReviewMetricsView, SeekerOverviewView
 
 urlpatterns = [
     path("stats/recruiter/overview/", RecruiterOverviewView.as_view(), name="stats-recruiter-overview"),
+    path("stats/recruiter/reviews/", RecruiterReviewMetricsView.as_view(), name="stats-recruiter-reviews"),
     path("stats/seeker/overview/", SeekerOverviewView.as_view(), name="stats-seeker-overview"),
+    path("stats/platform/", PlatformOverviewView.as_view(), name="stats-platform"),
 ]